@@ -0,0 +1,276 @@
+# backend/admission.py
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from starlette.responses import JSONResponse
+
+from backend.config import settings
+
+# ----------------------------
+# Route groups
+# ----------------------------
+# Listed in priority order: when a slot frees up, waiting public reads go
+# first, then admin requests, then public writes (review submissions, login).
+READ = "public_read"
+ADMIN = "admin"
+PUBLIC_WRITE = "public_write"
+
+PUBLIC_WRITES = {
+    ("POST", f"{settings.API_V1_STR}/reviews"),
+    ("POST", f"{settings.API_V1_STR}/auth/login"),
+}
+
+
+def route_group(method: str, path: str) -> Optional[str]:
+    """Admission group of a request, or None when it is never held back.
+
+    Only the API is admitted: /health and /metrics must answer while the
+    API is overloaded, and CORS preflights carry no work.
+    """
+    if method == "OPTIONS" or not path.startswith(settings.API_V1_STR):
+        return None
+    if method in ("GET", "HEAD"):
+        return READ
+    if (method, path.rstrip("/")) in PUBLIC_WRITES:
+        return PUBLIC_WRITE
+    return ADMIN
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+# ----------------------------
+# Concurrency limits
+# ----------------------------
+class Group:
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        # Moving average of how long an admitted request holds its slot
+        self.service_seconds = 0.0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def expected_wait(self) -> float:
+        """Rough queue time for a request joining the back of the queue now"""
+        return (len(self.waiters) + 1) / max(self.limit, 1) * self.service_seconds
+
+
+class AdmissionController:
+    """Per-group concurrency limits under one shared capacity.
+
+    A request runs at once when its group and the worker as a whole have a
+    free slot and nobody of equal or higher priority is waiting. Otherwise
+    it waits in its group's queue, up to ``max_wait``; when the queue is
+    full, or the wait it is likely to see already exceeds that budget, it is
+    turned away immediately instead.
+    """
+
+    def __init__(self, capacity: int, groups: List[Group]):
+        self.capacity = capacity
+        self.groups: Dict[str, Group] = {group.name: group for group in groups}
+        self._order = [group.name for group in groups]
+        self.active = 0
+
+    def _has_room(self, group: Group) -> bool:
+        return group.active < group.limit and self.active < self.capacity
+
+    def _waiting_ahead(self, name: str) -> bool:
+        """Whether a queued request should get the next free slot first"""
+        for other in self._order:
+            group = self.groups[other]
+            if other == name:
+                return bool(group.waiters)
+            # A higher-priority group stuck on its own limit does not block us
+            if group.waiters and group.active < group.limit:
+                return True
+        return False
+
+    def _admit(self, group: Group) -> None:
+        group.active += 1
+        group.admitted += 1
+        self.active += 1
+
+    def _dispatch(self) -> None:
+        for name in self._order:
+            group = self.groups[name]
+            while group.waiters and self._has_room(group):
+                waiter = group.waiters.popleft()
+                if not waiter.done():
+                    self._admit(group)
+                    waiter.set_result(None)
+
+    async def acquire(self, name: str) -> None:
+        group = self.groups[name]
+        if self._has_room(group) and not self._waiting_ahead(name):
+            self._admit(group)
+            return
+        if len(group.waiters) >= group.max_queue or group.expected_wait() > group.max_wait:
+            group.rejected += 1
+            raise Rejected(503, "Server busy, retry shortly", max(group.expected_wait(), 1.0))
+
+        waiter = asyncio.get_running_loop().create_future()
+        group.waiters.append(waiter)
+        group.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), group.max_wait)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Admitted just as the budget ran out; take the slot
+                return
+            waiter.cancel()
+            group.waiters.remove(waiter)
+            group.timed_out += 1
+            raise Rejected(503, "Server busy, retry shortly", max(group.max_wait, 1.0))
+        except asyncio.CancelledError:
+            # The client went away while queued
+            if waiter.done() and not waiter.cancelled():
+                self.release(name, 0.0)
+            else:
+                waiter.cancel()
+                group.waiters.remove(waiter)
+            raise
+
+    def release(self, name: str, held: float) -> None:
+        group = self.groups[name]
+        group.active -= 1
+        self.active -= 1
+        group.service_seconds = held if not group.service_seconds else 0.9 * group.service_seconds + 0.1 * held
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "active": self.active,
+            "groups": {
+                name: {
+                    "active": group.active,
+                    "waiting": len(group.waiters),
+                    "limit": group.limit,
+                    "max_queue": group.max_queue,
+                    "max_wait_ms": round(group.max_wait * 1000, 1),
+                    "service_ms": round(group.service_seconds * 1000, 2),
+                    "admitted": group.admitted,
+                    "queued": group.queued,
+                    "rejected": group.rejected,
+                    "timed_out": group.timed_out,
+                }
+                for name, group in self.groups.items()
+            },
+        }
+
+
+# ----------------------------
+# Per-client rate limit
+# ----------------------------
+class TokenBuckets:
+    """A token bucket per client, ``rate`` tokens a second up to ``burst``.
+
+    At most ``max_clients`` buckets are kept; the least recently seen
+    client is forgotten first, which only ever lets it start fresh.
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self.limited = 0
+
+    def take(self, client: str) -> float:
+        """0 when allowed, otherwise seconds until the next token"""
+        now = time.monotonic()
+        tokens, stamp = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - stamp) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+            self.limited += 1
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "burst": self.burst,
+            "clients": len(self._buckets),
+            "limited": self.limited,
+        }
+
+
+admission = AdmissionController(
+    settings.ADMISSION_MAX_CONCURRENCY,
+    [
+        Group(READ, settings.ADMISSION_READ_LIMIT, settings.ADMISSION_READ_QUEUE,
+              settings.ADMISSION_READ_MAX_WAIT_MS / 1000),
+        Group(ADMIN, settings.ADMISSION_ADMIN_LIMIT, settings.ADMISSION_ADMIN_QUEUE,
+              settings.ADMISSION_ADMIN_MAX_WAIT_MS / 1000),
+        Group(PUBLIC_WRITE, settings.ADMISSION_PUBLIC_WRITE_LIMIT, settings.ADMISSION_PUBLIC_WRITE_QUEUE,
+              settings.ADMISSION_PUBLIC_WRITE_MAX_WAIT_MS / 1000),
+    ],
+)
+public_write_buckets = TokenBuckets(
+    settings.PUBLIC_WRITE_RATE_PER_MINUTE / 60, settings.PUBLIC_WRITE_BURST
+)
+
+
+# ----------------------------
+# Middleware
+# ----------------------------
+def _reject(rejected: Rejected) -> JSONResponse:
+    return JSONResponse(
+        {"detail": rejected.detail},
+        status_code=rejected.status_code,
+        headers={"Retry-After": str(math.ceil(rejected.retry_after))},
+    )
+
+
+class AdmissionMiddleware:
+    """Holds back or turns away API requests according to ``admission``"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_CONTROL:
+            await self.app(scope, receive, send)
+            return
+        group = route_group(scope["method"], scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        if group == PUBLIC_WRITE:
+            client = scope["client"][0] if scope.get("client") else "-"
+            wait = public_write_buckets.take(client)
+            if wait:
+                await _reject(Rejected(429, "Too many submissions, slow down", wait))(scope, receive, send)
+                return
+
+        try:
+            await admission.acquire(group)
+        except Rejected as rejected:
+            await _reject(rejected)(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release(group, time.perf_counter() - started)
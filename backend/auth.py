@@ -1,16 +1,15 @@
 ﻿#auth.py
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from .config import settings
-from backend.database import db  # ✅ MongoDB
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from backend.database import get_db  # ✅ MongoDB
+from backend.hashing import password_hasher, pwd_context
 
 
+# Blocking versions, for scripts such as bootstrap_admin.py
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -19,6 +18,15 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+# Request handlers must use these: bcrypt runs on the hashing pool
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_hasher.verify(plain, hashed)
+
+
 def create_access_token(subject: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -27,33 +35,37 @@ def create_access_token(subject: str) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-def decode_token(token: str) -> str:
+def decode_token_claims(token: str) -> Dict[str, Any]:
+    """Verify the token and return its claims; ``sub`` is guaranteed present"""
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        sub: str = payload.get("sub")
-        if sub is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token (no subject)",
-            )
-        return sub
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token (no subject)",
+        )
+    return payload
+
+
+def decode_token(token: str) -> str:
+    return decode_token_claims(token)["sub"]
 
 
 # ✅ MongoDB versions
 async def get_admin_by_username(username: str):
-    return await db.admins.find_one({"username": username})
+    return await get_db().admins.find_one({"username": username})
 
 
 async def authenticate_admin(username: str, password: str):
     user = await get_admin_by_username(username)
-    if user and verify_password(password, user["password_hash"]):
+    if user and await verify_password_async(password, user["password_hash"]):
         return user
     return None
 
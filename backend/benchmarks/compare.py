@@ -0,0 +1,76 @@
+# backend/benchmarks/compare.py
+"""Compare two runs of backend.benchmarks.load and flag regressions.
+
+    python -m backend.benchmarks.compare baseline.json candidate.json
+        [--tolerance 0.10] [--min-requests 50]
+
+A regression is a p95 or p99 latency more than --tolerance above the
+baseline for any operation with enough requests in both runs, or overall
+throughput more than --tolerance below it. Per-operation throughput follows
+the random request mix and is not compared. Any regression exits with
+status 1, so the command can gate CI.
+"""
+import argparse
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# metric -> True when larger is worse
+METRICS = {"p95_ms": True, "p99_ms": True, "throughput_rps": False}
+
+
+def _change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if not before or after is None:
+        return None
+    return (after - before) / before
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], tolerance: float,
+            min_requests: int) -> Tuple[List[Tuple[str, str, float, float, float]], List[str]]:
+    """Rows of (operation, metric, before, after, change) and the regressions among them"""
+    rows = []
+    regressions = []
+    sections = {**baseline["operations"], "all": baseline["summary"]}
+    for name, before in sections.items():
+        after = candidate["summary"] if name == "all" else candidate["operations"].get(name)
+        if after is None or min(before["requests"], after["requests"]) < min_requests:
+            continue
+        for metric, larger_is_worse in METRICS.items():
+            if metric == "throughput_rps" and name != "all":
+                continue
+            change = _change(before[metric], after[metric])
+            if change is None:
+                continue
+            rows.append((name, metric, before[metric], after[metric], change))
+            if (change > tolerance) if larger_is_worse else (change < -tolerance):
+                regressions.append(f"{name} {metric}: {before[metric]} -> {after[metric]} ({change:+.1%})")
+    return rows, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative change")
+    parser.add_argument("--min-requests", type=int, default=50, help="skip operations with fewer samples")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    rows, regressions = compare(baseline, candidate, args.tolerance, args.min_requests)
+    print(f"{'operation':<20} {'metric':<15} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for name, metric, before, after, change in rows:
+        print(f"{name:<20} {metric:<15} {before:>10.2f} {after:>10.2f} {change:>+8.1%}")
+
+    if regressions:
+        print("❌ Regressions beyond {:.0%}:".format(args.tolerance))
+        for line in regressions:
+            print("  " + line)
+        raise SystemExit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+# backend/benchmarks/load.py
+"""Drive a mixed workload against the API and record latency percentiles.
+
+    python -m backend.benchmarks.load [--url http://localhost:8000]
+        [--workload mixed|read|write] [--concurrency 16] [--duration 30]
+        [--warmup 3] [--out bench.json]
+
+Without --url the app is started in-process (lifespan included) and called
+through httpx's ASGI transport, against settings.MONGO_URI; --mongomock
+swaps in an in-memory stand-in seeded by backend.benchmarks.seed, which is
+enough to compare code paths but not to judge database behaviour.
+
+Admin routes use a token minted for BENCH_ADMIN with the local SECRET_KEY,
+so a remote server must share it (or pass --token). Runs are written as
+JSON; compare two with backend.benchmarks.compare.
+
+All bench traffic comes from one client address, so the per-client limit
+on public writes (PUBLIC_WRITE_RATE_PER_MINUTE, shared by review posts and
+logins) would turn nearly every review_create into a 429. In-process runs
+therefore switch admission control off unless --admission is given; start
+a server for --url runs with ADMISSION_CONTROL=false, or a write budget
+above the workload's. Responses shed by admission (429/503) are counted as
+"rejected", a subset of "errors".
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from backend.auth import create_access_token
+from backend.benchmarks.seed import BENCH_ADMIN, seed
+
+API = "/api/v1"
+
+
+# ----------------------------
+# Operations
+# ----------------------------
+class Context:
+    """Sample ids and credentials shared by the workers"""
+
+    def __init__(self, token: str, rng: random.Random):
+        self.auth = {"Authorization": f"Bearer {token}"}
+        self.rng = rng
+        self.review_ids: List[str] = []
+        self.portfolio_ids: List[str] = []
+        self.review_cursor: Optional[str] = None
+
+    async def load_samples(self, client: httpx.AsyncClient) -> None:
+        reviews = await client.get(f"{API}/reviews/", params={"limit": 100})
+        reviews.raise_for_status()
+        self.review_ids = [r["_id"] for r in reviews.json()]
+        self.review_cursor = reviews.headers.get("X-Next-Cursor")
+        portfolio = await client.get(f"{API}/portfolio/", params={"limit": 100, "count": "none"})
+        portfolio.raise_for_status()
+        self.portfolio_ids = [p["_id"] for p in portfolio.json()["items"]]
+        if not self.review_ids or not self.portfolio_ids:
+            raise SystemExit("No reviews or portfolio items to read: seed the database first")
+
+
+Operation = Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]
+
+
+def _offset(ctx: Context) -> int:
+    # A handful of distinct pages, so the response cache sees hits and misses
+    return ctx.rng.randrange(20) * 12
+
+
+async def reviews_list(c, ctx):
+    return await c.get(f"{API}/reviews/", params={"published": "true", "limit": 12, "offset": _offset(ctx)})
+
+
+async def reviews_next_page(c, ctx):
+    return await c.get(f"{API}/reviews/", params={"limit": 50, "cursor": ctx.review_cursor})
+
+
+async def review_get(c, ctx):
+    return await c.get(f"{API}/reviews/{ctx.rng.choice(ctx.review_ids)}")
+
+
+async def reviews_stats(c, ctx):
+    return await c.get(f"{API}/reviews/stats")
+
+
+async def portfolio_list(c, ctx):
+    return await c.get(f"{API}/portfolio/", params={"is_active": "true", "limit": 12, "offset": _offset(ctx)})
+
+
+async def portfolio_featured(c, ctx):
+    return await c.get(f"{API}/portfolio/", params={"is_active": "true", "is_featured": "true", "limit": 6})
+
+
+async def portfolio_get(c, ctx):
+    return await c.get(f"{API}/portfolio/{ctx.rng.choice(ctx.portfolio_ids)}")
+
+
+async def projects_list(c, ctx):
+    return await c.get(f"{API}/projects/", params={"limit": 100})
+
+
+async def projects_ndjson(c, ctx):
+    return await c.get(f"{API}/projects/", params={"format": "ndjson", "limit": 1000})
+
+
+async def review_create(c, ctx):
+    return await c.post(f"{API}/reviews/", json={
+        "name": "Bench", "rating": ctx.rng.choice([3, 4, 4.5, 5]), "comment": "Load test review",
+    })
+
+
+async def review_update(c, ctx):
+    return await c.put(
+        f"{API}/reviews/{ctx.rng.choice(ctx.review_ids)}",
+        json={"published": ctx.rng.random() < 0.9}, headers=ctx.auth,
+    )
+
+
+async def portfolio_create(c, ctx):
+    return await c.post(f"{API}/portfolio/", data={
+        "title": "Bench item", "description": "Load test item", "category": "renovation",
+    }, headers=ctx.auth)
+
+
+async def portfolio_update(c, ctx):
+    return await c.put(
+        f"{API}/portfolio/{ctx.rng.choice(ctx.portfolio_ids)}",
+        data={"is_featured": str(ctx.rng.random() < 0.1).lower()}, headers=ctx.auth,
+    )
+
+
+READS: Dict[str, Tuple[Operation, int]] = {
+    "reviews_list": (reviews_list, 20),
+    "reviews_next_page": (reviews_next_page, 5),
+    "review_get": (review_get, 10),
+    "reviews_stats": (reviews_stats, 5),
+    "portfolio_list": (portfolio_list, 25),
+    "portfolio_featured": (portfolio_featured, 10),
+    "portfolio_get": (portfolio_get, 10),
+    "projects_list": (projects_list, 4),
+    "projects_ndjson": (projects_ndjson, 1),
+}
+# Nothing is deleted, so the data set only grows by what a run creates
+WRITES: Dict[str, Tuple[Operation, int]] = {
+    "review_create": (review_create, 6),
+    "review_update": (review_update, 2),
+    "portfolio_create": (portfolio_create, 1),
+    "portfolio_update": (portfolio_update, 1),
+}
+WORKLOADS: Dict[str, Dict[str, Tuple[Operation, int]]] = {
+    "read": READS,
+    "write": WRITES,
+    # About 9 reads per write
+    "mixed": {**READS, **WRITES},
+}
+
+
+# ----------------------------
+# Driver
+# ----------------------------
+# Statuses backend.admission answers with when it sheds a request
+SHED_STATUSES = (429, 503)
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, rejected: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rejected": rejected,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "mean_ms": ms(sum(ordered) / len(ordered)) if ordered else None,
+        "p50_ms": ms(percentile(ordered, 0.50)),
+        "p95_ms": ms(percentile(ordered, 0.95)),
+        "p99_ms": ms(percentile(ordered, 0.99)),
+        "max_ms": ms(ordered[-1]) if ordered else None,
+    }
+
+
+async def _worker(client, ctx, ops, weights, deadline, record) -> None:
+    names = list(ops)
+    while time.perf_counter() < deadline:
+        name = ctx.rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            status = (await ops[name](client, ctx)).status_code
+        except httpx.HTTPError:
+            status = None
+        record(name, time.perf_counter() - started, status)
+
+
+async def run(client: httpx.AsyncClient, ctx: Context, workload: str,
+              concurrency: int, duration: float, warmup: float) -> Dict[str, Any]:
+    ops = {name: op for name, (op, _weight) in WORKLOADS[workload].items()}
+    weights = [weight for _op, weight in WORKLOADS[workload].values()]
+    await ctx.load_samples(client)
+
+    latencies: Dict[str, List[float]] = {name: [] for name in ops}
+    errors: Dict[str, int] = {name: 0 for name in ops}
+    rejected: Dict[str, int] = {name: 0 for name in ops}
+    measuring = {"on": False}
+
+    def record(name: str, seconds: float, status: Optional[int]) -> None:
+        if measuring["on"]:
+            latencies[name].append(seconds)
+            errors[name] += status is None or status >= 400
+            rejected[name] += status in SHED_STATUSES
+
+    start = time.perf_counter()
+    deadline = start + warmup + duration
+    workers = [
+        asyncio.create_task(_worker(client, ctx, ops, weights, deadline, record))
+        for _ in range(concurrency)
+    ]
+    await asyncio.sleep(warmup)
+    measuring["on"] = True
+    measured_from = time.perf_counter()
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - measured_from
+
+    everything = [value for values in latencies.values() for value in values]
+    return {
+        "summary": summarize(everything, sum(errors.values()), sum(rejected.values()), elapsed),
+        "operations": {name: summarize(latencies[name], errors[name], rejected[name], elapsed) for name in ops},
+    }
+
+
+@asynccontextmanager
+async def _in_process_client(mongomock: bool, reviews: int, portfolio: int,
+                             admission: bool = False) -> AsyncIterator[httpx.AsyncClient]:
+    from backend import database
+    from backend.config import settings
+
+    if mongomock:
+        from mongomock_motor import AsyncMongoMockClient
+
+        database._client = AsyncMongoMockClient()
+        await seed(database.get_db(), reviews=reviews, portfolio=portfolio, projects=1000,
+                   progress=lambda _line: None)
+
+    from backend.main import app
+
+    # Every request comes from the one ASGI client address; see the module docstring
+    admission_control = settings.ADMISSION_CONTROL
+    settings.ADMISSION_CONTROL = admission
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                yield client
+    finally:
+        settings.ADMISSION_CONTROL = admission_control
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    started_at = datetime.now(timezone.utc).isoformat()
+    ctx = Context(args.token or create_access_token(BENCH_ADMIN), random.Random(args.seed))
+    if args.url:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        client_cm = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30)
+    else:
+        client_cm = _in_process_client(args.mongomock, args.seed_reviews, args.seed_portfolio, args.admission)
+
+    async with client_cm as client:
+        result = await run(client, ctx, args.workload, args.concurrency, args.duration, args.warmup)
+
+    return {
+        "meta": {
+            "started_at": started_at,
+            "target": args.url or ("in-process (mongomock)" if args.mongomock else "in-process"),
+            "workload": args.workload,
+            "concurrency": args.concurrency,
+            "admission": None if args.url else args.admission,
+            "duration_s": args.duration,
+            "commit": _commit(),
+            "python": platform.python_version(),
+        },
+        **result,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server; in-process when omitted")
+    parser.add_argument("--mongomock", action="store_true", help="in-process against an in-memory stand-in")
+    parser.add_argument("--admission", action="store_true",
+                        help="keep admission control and rate limits on for an in-process run")
+    parser.add_argument("--seed-reviews", type=int, default=20_000, help="reviews seeded with --mongomock")
+    parser.add_argument("--seed-portfolio", type=int, default=2_000, help="portfolio items seeded with --mongomock")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the request mix")
+    parser.add_argument("--token", help="admin bearer token (default: minted for BENCH_ADMIN)")
+    parser.add_argument("--out", default="bench.json")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'operation':<20} {'requests':>9} {'errors':>7} {'shed':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in [*report["operations"].items(), ("all", report["summary"])]:
+        print(f"{name:<20} {row['requests']:>9} {row['errors']:>7} {row['rejected']:>6} {row['throughput_rps'] or 0:>9.1f} "
+              f"{row['p50_ms'] or 0:>9.2f} {row['p95_ms'] or 0:>9.2f} {row['p99_ms'] or 0:>9.2f}")
+    print(f"✅ Written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# backend/benchmarks/seed.py
+"""Fill a database with realistic volumes for the load benchmark.
+
+    python -m backend.benchmarks.seed [--reviews 1000000] [--portfolio 50000]
+                                      [--projects 1000] [--seed 42] [--drop]
+
+Documents are generated deterministically from --seed, so two runs against
+empty databases hold the same data. Indexes and the stats documents are
+built afterwards, and the BENCH_ADMIN account used by backend.benchmarks.load
+for admin routes is created. Writes go to settings.MONGO_URI / MONGO_DB:
+point them at a scratch database.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List
+
+from backend.auth import hash_password
+from backend.coherence import admin_changed
+from backend.indexes import ensure_indexes
+from backend.stats import rebuild_stats
+
+BENCH_ADMIN = "bench-admin"
+BENCH_PASSWORD = "bench-password"
+
+BATCH_SIZE = 5000
+EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+SPAN_SECONDS = 3 * 365 * 24 * 3600
+
+FIRST_NAMES = ["Amina", "Brian", "Cheruiyot", "Diana", "Evans", "Faith", "George", "Halima",
+               "Ian", "Joy", "Kevin", "Lucy", "Mercy", "Njeri", "Otieno", "Peter", "Wanjiru"]
+CATEGORIES = ["plumbing", "electrical", "renovation", "painting", "roofing", "carpentry", "tiling"]
+TAGS = ["kitchen", "bathroom", "outdoor", "commercial", "residential", "emergency", "lighting",
+        "flooring", "waterproofing", "cabinets", "wiring", "leak", "extension", "garden"]
+WORDS = ["quick", "tidy", "friendly", "professional", "on", "time", "great", "work", "replaced",
+         "fixed", "new", "the", "and", "with", "clean", "finish", "would", "hire", "again",
+         "team", "excellent", "price", "fair", "job", "sink", "roof", "wall", "pipes"]
+# Most reviews are good, a few are not; half stars are common
+RATINGS = [1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5]
+RATING_WEIGHTS = [2, 1, 2, 2, 5, 6, 20, 25, 37]
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return " ".join(words).capitalize() + "."
+
+
+def _created_at(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS), microseconds=rng.randrange(1000) * 1000)
+
+
+def review_docs(rng: random.Random, n: int) -> Iterator[Dict[str, Any]]:
+    for _ in range(n):
+        yield {
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(FIRST_NAMES)[0]}.",
+            "rating": rng.choices(RATINGS, RATING_WEIGHTS)[0],
+            "comment": " ".join(_sentence(rng, 4, 14) for _ in range(rng.randint(1, 3))),
+            "published": rng.random() < 0.9,
+            "created_at": _created_at(rng),
+        }
+
+
+def portfolio_docs(rng: random.Random, n: int) -> Iterator[Dict[str, Any]]:
+    for i in range(n):
+        category = rng.choice(CATEGORIES)
+        yield {
+            "title": f"{category.capitalize()} job #{i}: {_sentence(rng, 2, 5)[:-1]}",
+            "description": " ".join(_sentence(rng, 8, 20) for _ in range(rng.randint(1, 4))),
+            "category": category,
+            "tags": rng.sample(TAGS, rng.randint(1, 4)),
+            "image_url": f"http://localhost:5000/uploads/{rng.getrandbits(256):064x}.jpg" if rng.random() < 0.8 else None,
+            "link": None,
+            "is_featured": rng.random() < 0.1,
+            "is_active": rng.random() < 0.85,
+            "created_at": _created_at(rng),
+        }
+
+
+def project_docs(rng: random.Random, n: int) -> Iterator[Dict[str, Any]]:
+    for i in range(n):
+        yield {
+            "name": f"Project {i}",
+            "description": _sentence(rng, 6, 18),
+            "client": f"{rng.choice(FIRST_NAMES)} Ltd",
+            "budget": rng.randrange(10_000, 5_000_000),
+        }
+
+
+async def _insert(collection, docs: Iterator[Dict[str, Any]], total: int, progress: Callable[[str], None]) -> None:
+    batch: List[Dict[str, Any]] = []
+    done = 0
+    started = time.perf_counter()
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) == BATCH_SIZE:
+            await collection.insert_many(batch, ordered=False)
+            done += len(batch)
+            batch = []
+            progress(f"  {collection.name}: {done}/{total} ({done / (time.perf_counter() - started):.0f} docs/s)")
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+
+
+async def seed(db, reviews: int, portfolio: int, projects: int, seed: int = 42,
+               drop: bool = False, progress: Callable[[str], None] = print) -> None:
+    rng = random.Random(seed)
+    if drop:
+        for name in ("reviews", "portfolio", "projects", "stats"):
+            await db[name].drop()
+
+    await _insert(db.reviews, review_docs(rng, reviews), reviews, progress)
+    await _insert(db.portfolio, portfolio_docs(rng, portfolio), portfolio, progress)
+    await _insert(db.projects, project_docs(rng, projects), projects, progress)
+
+    progress("  indexes and stats")
+    await ensure_indexes(db)
+    await rebuild_stats(db)
+    await db.admins.update_one(
+        {"username": BENCH_ADMIN},
+        {"$setOnInsert": {"username": BENCH_ADMIN, "password_hash": hash_password(BENCH_PASSWORD)}},
+        upsert=True,
+    )
+    await admin_changed(db, BENCH_ADMIN)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--portfolio", type=int, default=50_000)
+    parser.add_argument("--projects", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the generated data")
+    parser.add_argument("--drop", action="store_true", help="drop the collections first")
+    args = parser.parse_args()
+
+    from backend.database import get_db
+
+    started = time.perf_counter()
+    asyncio.run(seed(get_db(), args.reviews, args.portfolio, args.projects, args.seed, args.drop))
+    print(f"✅ Seeded in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# backend/benchmarks/serialization.py
+"""Compare the model-based and the direct serialization of listing pages.
+
+    python -m backend.benchmarks.serialization [--items 100] [--rounds 200]
+
+The "models" path is what list endpoints used to do: build a PortfolioOut /
+ReviewSchema per document, then let FastAPI validate and dump it again for
+response_model. The "direct" path is backend.serialization. Both must
+produce identical bytes, which is checked before timing.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from backend.routers.portfolio import _doc_to_portfolio_out
+from backend.routers.reviews import _doc_to_review_out
+from backend.schemas import PortfolioOut, ReviewSchema
+from backend.serialization import dumps, portfolio_doc_to_json, review_doc_to_json
+
+
+def portfolio_docs(n: int) -> List[Dict[str, Any]]:
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Kitchen remodel #{i}",
+            "description": "Full renovation with new cabinets, tiling and lighting. " * 3,
+            "image_url": f"http://localhost:5000/uploads/{i:064x}.jpg",
+            "image_variants": {"320": f"http://localhost:5000/uploads/{i:064x}_w320.webp"},
+            "link": None,
+            "tags": ["kitchen", "tiling", "lighting"],
+            "category": "renovation",
+            "is_featured": i % 5 == 0,
+            "is_active": True,
+            "created_at": base + timedelta(minutes=i, milliseconds=i),
+        }
+        for i in range(n)
+    ]
+
+
+def review_docs(n: int) -> List[Dict[str, Any]]:
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Customer {i}",
+            "rating": 4 if i % 2 else 4.5,
+            "comment": "Quick, tidy and friendly. Would hire again. " * 2,
+            "published": True,
+            "created_at": base + timedelta(minutes=i, milliseconds=i),
+        }
+        for i in range(n)
+    ]
+
+
+def _response_bytes(content: Any) -> bytes:
+    # What JSONResponse.render does with the response_model output
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _models_path(to_model: Callable, model: type) -> Callable[[List[Dict[str, Any]]], bytes]:
+    adapter = TypeAdapter(List[model])
+
+    def run(docs: List[Dict[str, Any]]) -> bytes:
+        items = [to_model(doc) for doc in docs]
+        validated = adapter.validate_python(jsonable_encoder(items))   # response_model check
+        return _response_bytes(adapter.dump_python(validated, mode="json", by_alias=True))
+    return run
+
+
+def _direct_path(to_json: Callable) -> Callable[[List[Dict[str, Any]]], bytes]:
+    def run(docs: List[Dict[str, Any]]) -> bytes:
+        return dumps([to_json(doc) for doc in docs])
+    return run
+
+
+def _time(fn: Callable, docs: List[Dict[str, Any]], rounds: int) -> float:
+    fn(docs)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(docs)
+    return (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100, help="documents per page")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    cases = [
+        ("portfolio", portfolio_docs(args.items),
+         _models_path(_doc_to_portfolio_out, PortfolioOut), _direct_path(portfolio_doc_to_json)),
+        ("reviews", review_docs(args.items),
+         _models_path(_doc_to_review_out, ReviewSchema), _direct_path(review_doc_to_json)),
+    ]
+    print(f"{'listing':<10} {'models ms':>10} {'direct ms':>10} {'speedup':>8}")
+    for name, docs, models, direct in cases:
+        if models(docs) != direct(docs):
+            raise SystemExit(f"{name}: direct serialization differs from the model output")
+        slow = _time(models, docs, args.rounds)
+        fast = _time(direct, docs, args.rounds)
+        print(f"{name:<10} {slow * 1000:>10.3f} {fast * 1000:>10.3f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
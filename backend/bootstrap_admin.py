@@ -1,10 +1,12 @@
 # backend/bootstrap_admin.py
 import asyncio
 from backend.auth import hash_password
-from backend.database import db
+from backend.coherence import admin_changed
+from backend.database import get_db
 from backend.config import settings
 
 async def create_admin():
+    db = get_db()
     existing = await db.admins.find_one({"username": settings.BOOTSTRAP_ADMIN_USERNAME})
     if existing:
         print("✅ Admin already exists:", existing["username"])
@@ -13,6 +15,7 @@ async def create_admin():
         "username": settings.BOOTSTRAP_ADMIN_USERNAME,
         "password_hash": hash_password(settings.BOOTSTRAP_ADMIN_PASSWORD),
     })
+    await admin_changed(db, settings.BOOTSTRAP_ADMIN_USERNAME)
     print("✅ Admin created:", settings.BOOTSTRAP_ADMIN_USERNAME)
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+# backend/bulk.py
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Per-item outcomes reported by the bulk endpoints
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+DELETED = "deleted"
+CREATED = "created"
+NOT_FOUND = "not_found"
+INVALID_ID = "invalid_id"
+ERROR = "error"
+SKIPPED = "skipped"  # ordered batch stopped at an earlier failure
+
+Change = Tuple[Optional[Mapping[str, Any]], Optional[Mapping[str, Any]]]
+
+
+def _summary(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    summary: Dict[str, int] = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return summary
+
+
+def _write_errors(e: BulkWriteError) -> Dict[int, str]:
+    return {err["index"]: err.get("errmsg", "write failed") for err in e.details.get("writeErrors", [])}
+
+
+async def _bulk_write(collection, ops: List[Any], ordered: bool) -> Tuple[Dict[int, str], Optional[int]]:
+    """Run ``ops`` in one bulk_write.
+
+    Returns the failed op indexes with their messages, plus the index from
+    which an ordered batch stopped executing (None if it ran to the end).
+    """
+    if not ops:
+        return {}, None
+    try:
+        await collection.bulk_write(ops, ordered=ordered)
+        return {}, None
+    except BulkWriteError as e:
+        errors = _write_errors(e)
+        stopped = min(errors) + 1 if ordered and errors else None
+        return errors, stopped
+
+
+async def bulk_modify(
+    collection,
+    ids: List[str],
+    updates: Optional[Dict[str, Any]],
+    ordered: bool,
+) -> Tuple[Dict[str, Any], List[Change]]:
+    """Apply ``$set: updates`` (or a delete when ``updates`` is None) to ``ids``.
+
+    One find fetches the current documents, so not-found ids and stats
+    deltas are known up front, then a single bulk_write does the work.
+    Returns the response body and the (before, after) pairs that were
+    written, for stats and cache invalidation.
+    """
+    results: List[Dict[str, Any]] = [{"id": item_id, "status": None} for item_id in ids]
+    valid = {item_id: ObjectId(item_id) for item_id in ids if ObjectId.is_valid(item_id)}
+    current = {
+        str(doc["_id"]): doc
+        async for doc in collection.find({"_id": {"$in": list(set(valid.values()))}})
+    }
+
+    ops: List[Any] = []
+    op_results: List[int] = []   # op index -> position in results
+    stop_at: Optional[int] = None
+    for position, item_id in enumerate(ids):
+        if item_id not in valid:
+            results[position]["status"] = INVALID_ID
+            if ordered:
+                stop_at = position
+                break
+            continue
+        if item_id not in current:
+            results[position]["status"] = NOT_FOUND
+            continue
+        if updates is None:
+            ops.append(DeleteOne({"_id": valid[item_id]}))
+        else:
+            ops.append(UpdateOne({"_id": valid[item_id]}, {"$set": updates}))
+        op_results.append(position)
+
+    errors, stopped = await _bulk_write(collection, ops, ordered)
+
+    changes: List[Change] = []
+    seen = set()
+    for op_index, position in enumerate(op_results):
+        result = results[position]
+        item_id = result["id"]
+        if stopped is not None and op_index >= stopped:
+            result["status"] = SKIPPED
+        elif op_index in errors:
+            result["status"] = ERROR
+            result["error"] = errors[op_index]
+        elif item_id in seen:
+            # Repeated id: the earlier op already did the work
+            result["status"] = UNCHANGED if updates is not None else NOT_FOUND
+        else:
+            seen.add(item_id)
+            before = current[item_id]
+            if updates is None:
+                result["status"] = DELETED
+                changes.append((before, None))
+            elif all(before.get(k) == v for k, v in updates.items() if k != "updated_at"):
+                result["status"] = UNCHANGED
+            else:
+                result["status"] = UPDATED
+                changes.append((before, {**before, **updates}))
+
+    if stop_at is not None:
+        for result in results[stop_at + 1:]:
+            result["status"] = SKIPPED
+    for result in results:
+        if result["status"] is None:
+            result["status"] = SKIPPED
+
+    return {"ordered": ordered, "summary": _summary(results), "results": results}, changes
+
+
+async def bulk_insert(
+    collection,
+    docs: List[Dict[str, Any]],
+    ordered: bool,
+    render: Callable[[Dict[str, Any]], Any],
+) -> Tuple[Dict[str, Any], List[Change]]:
+    """insert_many through bulk_write with per-document results.
+
+    ``_id`` is assigned client side, so results can name every document,
+    including those that failed. ``render`` shapes a created document.
+    """
+    for doc in docs:
+        doc.setdefault("_id", ObjectId())
+    errors, stopped = await _bulk_write(collection, [InsertOne(doc) for doc in docs], ordered)
+
+    results: List[Dict[str, Any]] = []
+    changes: List[Change] = []
+    for index, doc in enumerate(docs):
+        result: Dict[str, Any] = {"id": str(doc["_id"])}
+        if stopped is not None and index >= stopped:
+            result["status"] = SKIPPED
+        elif index in errors:
+            result["status"] = ERROR
+            result["error"] = errors[index]
+        else:
+            result["status"] = CREATED
+            result["item"] = render(doc)
+            changes.append((None, doc))
+        results.append(result)
+
+    return {"ordered": ordered, "summary": _summary(results), "results": results}, changes
@@ -0,0 +1,278 @@
+# backend/cache.py
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Set, Union
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from backend.config import settings
+from backend.serialization import dumps
+
+
+# ----------------------------
+# Bounded LRU + TTL cache
+# ----------------------------
+class TTLCache:
+    """LRU mapping with a per-entry time to live and tag based invalidation.
+
+    Everything runs on the event loop without awaiting, so no locking is
+    needed. Tags let writers drop every entry derived from a piece of data
+    (e.g. all portfolio listings) without knowing the exact keys.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any, tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value, _tags = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (), ttl: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        tags = tuple(tags)
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl is None else ttl)
+        self._entries[key] = (expires_at, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        if key in self._entries:
+            self._remove(key)
+            self.invalidations += 1
+
+    def invalidate_tags(self, *tags: str) -> None:
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self.invalidate(key)
+
+    def invalidate_tag_prefix(self, prefix: str) -> None:
+        """Invalidate every tag starting with ``prefix``"""
+        self.invalidate_tags(*[tag for tag in self._tags if tag.startswith(prefix)])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _expires_at, _value, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+# ----------------------------
+# Serialized response cache
+# ----------------------------
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    last_modified: Optional[datetime] = None
+    etag: str = ""
+
+    def __post_init__(self):
+        if not self.etag:
+            # Strong validator: identical bytes <=> identical ETag, on every worker
+            self.etag = '"%s"' % hashlib.sha256(self.body).hexdigest()[:32]
+
+    def validators(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def not_modified(self, request: Request) -> bool:
+        """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            # GET uses the weak comparison, so a W/ prefix added by a proxy still matches
+            tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+            return self.etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def to_response(self, request: Request) -> Response:
+        if self.not_modified(request):
+            return Response(status_code=304, headers=self.validators())
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={**self.headers, **self.validators()},
+        )
+
+
+response_cache = TTLCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+# Last write seen per collection; a delete leaves no timestamp on the
+# remaining documents, so listings also consult this for Last-Modified
+collection_modified: Dict[str, datetime] = {}
+
+# Called with the collection name after every local write, e.g. to tell
+# other workers (backend.coherence); not called for invalidate_collection
+write_listeners: List[Callable[[str], None]] = []
+
+
+def list_tag(collection: str) -> str:
+    """Tag shared by every cached listing of ``collection``"""
+    return f"{collection}:list"
+
+
+def item_tag(collection: str, item_id: Any) -> str:
+    """Tag for cached responses that embed the document ``item_id``"""
+    return f"{collection}:{item_id}"
+
+
+def request_cache_key(request: Request) -> str:
+    """Route path plus query parameters in a canonical order"""
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def render_json(payload: Any) -> bytes:
+    """Serialize like FastAPI's JSONResponse would after response_model filtering"""
+    return dumps(payload)
+
+
+def last_modified_of(docs: Iterable[Mapping[str, Any]]) -> Optional[datetime]:
+    """Latest updated_at/created_at among ``docs`` as an aware UTC datetime"""
+    latest: Optional[datetime] = None
+    for doc in docs:
+        stamp = doc.get("updated_at") or doc.get("created_at")
+        if not isinstance(stamp, datetime):
+            continue
+        # Mongo hands back naive datetimes that are already UTC
+        if stamp.tzinfo is None:
+            stamp = stamp.replace(tzinfo=timezone.utc)
+        if latest is None or stamp > latest:
+            latest = stamp
+    return latest
+
+
+def cached_response(request: Request, key: str) -> Optional[Response]:
+    """Serve a cache hit, as a 304 when the client's validators still match.
+
+    A 304 costs neither a database round trip nor serialization.
+    """
+    entry = response_cache.get(key)
+    return entry.to_response(request) if entry is not None else None
+
+
+def cache_response(
+    request: Request,
+    key: str,
+    payload: Any,
+    tags: Iterable[str],
+    headers: Optional[Dict[str, str]] = None,
+    docs: Optional[List[Mapping[str, Any]]] = None,
+    collection: Union[str, Iterable[str], None] = None,
+) -> Response:
+    """Serialize ``payload``, store it under ``key`` and answer ``request``.
+
+    ``docs`` are the raw documents behind the payload, used for Last-Modified.
+    Listings pass their ``collection`` (or several) so deletions also move
+    Last-Modified.
+    """
+    stamps = list(docs or [])
+    for name in [collection] if isinstance(collection, str) else collection or []:
+        if name in collection_modified:
+            stamps.append({"updated_at": collection_modified[name]})
+    entry = CachedResponse(
+        body=render_json(payload),
+        headers=dict(headers or {}),
+        last_modified=last_modified_of(stamps),
+    )
+    response_cache.set(key, entry, tags=tags)
+    return entry.to_response(request)
+
+
+def invalidate_items(collection: str, item_ids: Iterable[Any] = ()) -> None:
+    """Drop cached listings of ``collection`` and the responses of ``item_ids``"""
+    collection_modified[collection] = datetime.now(timezone.utc)
+    tags = [list_tag(collection)]
+    tags.extend(item_tag(collection, item_id) for item_id in item_ids)
+    response_cache.invalidate_tags(*tags)
+    for listener in write_listeners:
+        listener(collection)
+
+
+def invalidate_item(collection: str, item_id: Any = None) -> None:
+    """Drop cached listings of ``collection`` and, if given, one document's responses"""
+    invalidate_items(collection, [] if item_id is None else [item_id])
+
+
+def invalidate_collection(collection: str, modified_at: Optional[datetime] = None) -> None:
+    """Drop every cached response derived from ``collection``.
+
+    Used when another process wrote to it and the affected ids are unknown.
+    """
+    if modified_at is not None:
+        if modified_at.tzinfo is None:
+            modified_at = modified_at.replace(tzinfo=timezone.utc)
+        if collection not in collection_modified or modified_at > collection_modified[collection]:
+            collection_modified[collection] = modified_at
+    response_cache.invalidate_tag_prefix(f"{collection}:")
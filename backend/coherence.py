@@ -0,0 +1,220 @@
+# backend/coherence.py
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from backend.cache import invalidate_collection, write_listeners
+from backend.config import settings
+from backend.deps import admin_principal_cache, invalidate_admin
+from backend.facets import portfolio_facets
+from backend.search import portfolio_search
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Cross-worker invalidation
+# ----------------------------
+# Every worker keeps caches in memory (responses, admin principals, the
+# search index, facet counts). After a write, the worker bumps a version
+# document per collection:
+#   {_id: "portfolio", version: 42, updated_at: ..., by: "host:pid"}
+# and every worker drops its state for a collection when it sees a version
+# it did not publish itself. Versions arrive through a change stream on
+# replica sets and by polling the (tiny) collection otherwise.
+VERSIONS = "cache_versions"
+RETRY_SECONDS = 5.0
+
+Handler = Callable[[Optional[datetime]], None]
+
+
+class InvalidationBus:
+    def __init__(self, poll_seconds: float, mode: str = "auto"):
+        self.poll_seconds = poll_seconds
+        self.mode = mode
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.transport: Optional[str] = None  # "change_stream" or "poll" once running
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._seen: Dict[str, int] = {}
+        self._own: Dict[str, Set[int]] = {}
+        self._dirty: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.published = 0
+        self.applied = 0
+        self.errors = 0
+        self.last_sync: Optional[float] = None
+
+    def subscribe(self, collection: str, handler: Handler) -> None:
+        """``handler(updated_at)`` runs when another worker wrote to ``collection``"""
+        self._handlers.setdefault(collection, []).append(handler)
+
+    # ----- publishing -----
+    def notify(self, collection: str) -> None:
+        """Mark ``collection`` written; the publisher task bumps its version.
+
+        Cheap and synchronous so write paths do not wait on it. Consecutive
+        writes are coalesced into one bump.
+        """
+        if self._wakeup is None:
+            return
+        self._dirty.add(collection)
+        self._wakeup.set()
+
+    async def publish(self, db, collection: str) -> int:
+        doc = await db[VERSIONS].find_one_and_update(
+            {"_id": collection},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc), "by": self.worker_id}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self._own.setdefault(collection, set()).add(doc["version"])
+        self.published += 1
+        return doc["version"]
+
+    async def _flush(self, db) -> None:
+        dirty, self._dirty = self._dirty, set()
+        for collection in dirty:
+            try:
+                await self.publish(db, collection)
+            except PyMongoError as e:
+                self.errors += 1
+                self._dirty.add(collection)
+                logger.error("Could not publish %s invalidation: %s", collection, e)
+
+    async def _publisher(self, db) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._flush(db)
+            if self._dirty:
+                await asyncio.sleep(RETRY_SECONDS)
+                self._wakeup.set()
+
+    # ----- receiving -----
+    def _observe(self, doc: Mapping[str, Any]) -> None:
+        collection, version = doc["_id"], int(doc.get("version", 0))
+        seen = self._seen.get(collection, 0)
+        if version <= seen:
+            return
+        own = self._own.get(collection, set())
+        foreign = any(v not in own for v in range(seen + 1, version + 1))
+        self._seen[collection] = version
+        self._own[collection] = {v for v in own if v > version}
+        if not foreign:
+            return
+        self.applied += 1
+        for handler in self._handlers.get(collection, ()):
+            try:
+                handler(doc.get("updated_at"))
+            except Exception:
+                logger.exception("Invalidation handler for %s failed", collection)
+
+    async def _sync(self, db) -> None:
+        async for doc in db[VERSIONS].find({}):
+            self._observe(doc)
+        self.last_sync = time.time()
+
+    async def _poll(self, db) -> None:
+        self.transport = "poll"
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self._sync(db)
+            except PyMongoError as e:
+                self.errors += 1
+                logger.warning("Invalidation poll failed: %s", e)
+
+    async def _watch(self, db) -> None:
+        while True:
+            try:
+                async with db[VERSIONS].watch(full_document="updateLookup") as stream:
+                    self.transport = "change_stream"
+                    # Anything written before the stream opened
+                    await self._sync(db)
+                    async for change in stream:
+                        if change.get("fullDocument"):
+                            self._observe(change["fullDocument"])
+                            self.last_sync = time.time()
+            except Exception as e:
+                # Any failure, including drivers or stand-ins without watch(),
+                # must not silently end this task
+                if self.transport != "change_stream" and self.mode == "auto":
+                    # Standalone server (or a stand-in): no change streams
+                    logger.info("Change streams unavailable (%s); polling every %ss", e, self.poll_seconds)
+                    await self._poll(db)
+                    return
+                self.errors += 1
+                logger.warning("Invalidation change stream interrupted: %s", e)
+                self.transport = None
+                await asyncio.sleep(RETRY_SECONDS)
+
+    # ----- lifecycle -----
+    async def start(self, db) -> None:
+        """Lifespan hook: start listening from the current versions"""
+        if self.mode == "off" or self._tasks:
+            return
+        try:
+            async for doc in db[VERSIONS].find({}):
+                self._seen[doc["_id"]] = int(doc.get("version", 0))
+        except PyMongoError as e:
+            logger.error("Could not read cache versions: %s", e)
+        self._wakeup = asyncio.Event()
+        listener = self._poll if self.mode == "poll" else self._watch
+        self._tasks = [asyncio.create_task(self._publisher(db)), asyncio.create_task(listener(db))]
+
+    async def stop(self, db) -> None:
+        """Lifespan hook: publish what is still pending, then stop"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._dirty:
+            await self._flush(db)
+        self._wakeup = None
+        self.transport = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker": self.worker_id,
+            "transport": self.transport,
+            "poll_seconds": self.poll_seconds,
+            "versions": dict(self._seen),
+            "pending": sorted(self._dirty),
+            "published": self.published,
+            "applied": self.applied,
+            "errors": self.errors,
+            "last_sync": self.last_sync,
+        }
+
+
+invalidation_bus = InvalidationBus(settings.INVALIDATION_POLL_SECONDS, settings.INVALIDATION_MODE)
+write_listeners.append(invalidation_bus.notify)
+
+
+def _portfolio_changed(updated_at: Optional[datetime]) -> None:
+    invalidate_collection("portfolio", updated_at)
+    portfolio_search.reset()
+    portfolio_facets.reset()
+
+
+invalidation_bus.subscribe("portfolio", _portfolio_changed)
+invalidation_bus.subscribe("reviews", lambda updated_at: invalidate_collection("reviews", updated_at))
+invalidation_bus.subscribe("admins", lambda _updated_at: admin_principal_cache.clear())
+
+
+async def admin_changed(db, username: str) -> None:
+    """Call after writing an admin document, from the app or a script.
+
+    Drops this process's cached principals for ``username`` and bumps the
+    "admins" version at once (scripts run no bus), so every worker clears
+    its principal cache on its next sync.
+    """
+    invalidate_admin(username)
+    await invalidation_bus.publish(db, "admins")
@@ -17,12 +17,98 @@ class Settings(BaseModel):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
 
+    # bcrypt runs on its own bounded thread pool; beyond MAX_PENDING logins get a 503
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+
     # Database (MongoDB)
     MONGO_URI: str = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     MONGO_DB: str = os.getenv("MONGO_DB", "wefixit")
+    # One client per worker; pool and timeout tuning (0 = driver default)
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000"))
+    MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "20000"))
+    MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "")  # e.g. "zstd,snappy,zlib"
+    MONGO_READ_PREFERENCE: str = os.getenv("MONGO_READ_PREFERENCE", "primary")
+    # Create missing indexes from backend/indexes.py at startup
+    ENSURE_INDEXES: bool = os.getenv("ENSURE_INDEXES", "true").lower() == "true"
 
     # Optional: SQLite fallback (if you ever want hybrid or testing db)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./wefixit.db")
+    # Where public GETs read reviews and portfolio items: "mongo", or "sqlite" for
+    # a local snapshot in DATABASE_URL (see backend/repository.py), re-synced when
+    # a collection's cache version moves and at least every READ_SNAPSHOT_SYNC_SECONDS
+    # without versions; 0 leaves syncing to `python -m backend.repository sync`
+    READ_BACKEND: str = os.getenv("READ_BACKEND", "mongo")
+    READ_SNAPSHOT_SYNC_SECONDS: float = float(os.getenv("READ_SNAPSHOT_SYNC_SECONDS", "5"))
+
+    # Response cache for public GET endpoints
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+
+    # Cross-worker invalidation through versions in the cache_versions collection:
+    # "auto" (change stream on replica sets, polling otherwise), "poll", "change_stream" or "off"
+    INVALIDATION_MODE: str = os.getenv("INVALIDATION_MODE", "auto")
+    INVALIDATION_POLL_SECONDS: float = float(os.getenv("INVALIDATION_POLL_SECONDS", "1.0"))
+
+    # Verified admin tokens and their admin documents
+    ADMIN_CACHE_MAX_ENTRIES: int = int(os.getenv("ADMIN_CACHE_MAX_ENTRIES", "256"))
+    ADMIN_CACHE_TTL_SECONDS: float = float(os.getenv("ADMIN_CACHE_TTL_SECONDS", "60"))
+
+    # Optional write-behind for public review submissions: answer at once and
+    # insert in insert_many batches of up to REVIEW_BATCH_SIZE, or whatever
+    # arrived within REVIEW_BATCH_MAX_DELAY_MS. Beyond REVIEW_QUEUE_MAX_PENDING
+    # waiting reviews, submissions get a 503. Reviews that cannot be written
+    # at shutdown are spilled to REVIEW_QUEUE_SPILL_PATH and inserted on start;
+    # workers may share the file, each replay claims it by renaming it first.
+    REVIEW_WRITE_BEHIND: bool = os.getenv("REVIEW_WRITE_BEHIND", "false").lower() == "true"
+    REVIEW_BATCH_SIZE: int = int(os.getenv("REVIEW_BATCH_SIZE", "100"))
+    REVIEW_BATCH_MAX_DELAY_MS: float = float(os.getenv("REVIEW_BATCH_MAX_DELAY_MS", "50"))
+    REVIEW_QUEUE_MAX_PENDING: int = int(os.getenv("REVIEW_QUEUE_MAX_PENDING", "10000"))
+    REVIEW_QUEUE_SPILL_PATH: str = os.getenv("REVIEW_QUEUE_SPILL_PATH", "review_queue.spill.jsonl")
+
+    # Admission control (backend/admission.py): at most ADMISSION_MAX_CONCURRENCY
+    # API requests run at once per worker, within per-group limits. Requests
+    # wait in their group's queue up to its budget, then get a 503 with
+    # Retry-After; waiting public reads go first, review submissions and
+    # logins last.
+    ADMISSION_CONTROL: bool = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64"))
+    ADMISSION_READ_LIMIT: int = int(os.getenv("ADMISSION_READ_LIMIT", "64"))
+    ADMISSION_READ_QUEUE: int = int(os.getenv("ADMISSION_READ_QUEUE", "256"))
+    ADMISSION_READ_MAX_WAIT_MS: float = float(os.getenv("ADMISSION_READ_MAX_WAIT_MS", "1000"))
+    ADMISSION_ADMIN_LIMIT: int = int(os.getenv("ADMISSION_ADMIN_LIMIT", "16"))
+    ADMISSION_ADMIN_QUEUE: int = int(os.getenv("ADMISSION_ADMIN_QUEUE", "64"))
+    ADMISSION_ADMIN_MAX_WAIT_MS: float = float(os.getenv("ADMISSION_ADMIN_MAX_WAIT_MS", "5000"))
+    ADMISSION_PUBLIC_WRITE_LIMIT: int = int(os.getenv("ADMISSION_PUBLIC_WRITE_LIMIT", "8"))
+    ADMISSION_PUBLIC_WRITE_QUEUE: int = int(os.getenv("ADMISSION_PUBLIC_WRITE_QUEUE", "32"))
+    ADMISSION_PUBLIC_WRITE_MAX_WAIT_MS: float = float(os.getenv("ADMISSION_PUBLIC_WRITE_MAX_WAIT_MS", "2000"))
+    # Per-client token bucket on review submissions and logins (429 when empty)
+    PUBLIC_WRITE_RATE_PER_MINUTE: float = float(os.getenv("PUBLIC_WRITE_RATE_PER_MINUTE", "10"))
+    PUBLIC_WRITE_BURST: float = float(os.getenv("PUBLIC_WRITE_BURST", "5"))
+
+    # Largest batch accepted by the bulk and import endpoints
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+    # Portfolio search: "auto" uses the Mongo text index when it exists and the
+    # in-memory index otherwise (and for prefix queries); "text" or "memory" forces one
+    SEARCH_ENGINE: str = os.getenv("SEARCH_ENGINE", "auto")
+
+    # Uploaded images
+    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
+    # Origin that upload URLs point at; set to the CDN in front of /uploads
+    ASSET_BASE_URL: str = os.getenv("ASSET_BASE_URL", "http://localhost:5000")
+    ASSET_MAX_AGE_SECONDS: int = int(os.getenv("ASSET_MAX_AGE_SECONDS", str(365 * 24 * 3600)))
+    UPLOAD_MAX_BYTES: int = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    # Responsive WebP copies generated in a process pool after each upload
+    IMAGE_VARIANT_WIDTHS: List[int] = [
+        int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",") if w.strip()
+    ]
+    IMAGE_VARIANT_QUALITY: int = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", "2"))
 
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -1,11 +1,142 @@
 # backend/database.py
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
 from .config import settings
+from .metrics import command_metrics
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters for /health, fed by pymongo's CMAP events"""
+
+    def __init__(self):
+        self.connections_open = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_wait_seconds = 0.0
+        self.max_checkout_wait_seconds = 0.0
+        self.pools_cleared = 0
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
+    def pool_cleared(self, event):
+        self.pools_cleared += 1
+
+    def connection_created(self, event):
+        self.connections_open += 1
+
+    def connection_closed(self, event):
+        self.connections_open -= 1
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+        self.checkouts += 1
+        # duration (seconds spent waiting for a connection) exists on pymongo >= 4.7
+        waited = getattr(event, "duration", 0.0) or 0.0
+        self.checkout_wait_seconds += waited
+        self.max_checkout_wait_seconds = max(self.max_checkout_wait_seconds, waited)
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+            "connections_open": self.connections_open,
+            "checked_out": self.checked_out,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "avg_checkout_wait_ms": round(self.checkout_wait_seconds / self.checkouts * 1000, 3) if self.checkouts else None,
+            "max_checkout_wait_ms": round(self.max_checkout_wait_seconds * 1000, 3),
+            "pools_cleared": self.pools_cleared,
+        }
+
+
+pool_stats = PoolStats()
+
+HEALTH_PING_TIMEOUT_SECONDS = 2.0
+
+_client: Optional[AsyncIOMotorClient] = None
+
+
+def client_options() -> Dict[str, Any]:
+    """Pool, timeout, compression and read preference options from Settings"""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "readPreference": settings.MONGO_READ_PREFERENCE,
+        "event_listeners": [pool_stats, command_metrics],
+    }
+    # 0 keeps the driver default (no limit) for these
+    if settings.MONGO_MAX_IDLE_TIME_MS:
+        options["maxIdleTimeMS"] = settings.MONGO_MAX_IDLE_TIME_MS
+    if settings.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = settings.MONGO_SOCKET_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return options
+
+
+def connect() -> AsyncIOMotorClient:
+    """Create the process-wide client; called from the app lifespan.
+
+    Motor only opens sockets on first use, so this is cheap. Scripts that
+    run without the app get the client lazily through get_db().
+    """
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(settings.MONGO_URI, **client_options())
+    return _client
+
+
+def close() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    return connect()
+
+
+def get_db() -> AsyncIOMotorDatabase:
+    return get_client()[settings.MONGO_DB]
+
 
-# Local connection without TLS
-client = AsyncIOMotorClient(settings.MONGO_URI)
+async def health() -> Dict[str, Any]:
+    """Ping latency and pool statistics of the shared client"""
+    started = time.perf_counter()
+    try:
+        # Answer within a load balancer's probe timeout even if no server is selectable
+        await asyncio.wait_for(get_client().admin.command("ping"), timeout=HEALTH_PING_TIMEOUT_SECONDS)
+        mongo: Dict[str, Any] = {"ok": True, "ping_ms": round((time.perf_counter() - started) * 1000, 3)}
+    except asyncio.TimeoutError:
+        mongo = {"ok": False, "error": f"ping timed out after {HEALTH_PING_TIMEOUT_SECONDS}s"}
+    except PyMongoError as e:
+        mongo = {"ok": False, "error": str(e)}
+    return {"status": "ok" if mongo["ok"] else "unavailable", "mongo": mongo, "pool": pool_stats.snapshot()}
 
-db = client[settings.MONGO_DB]
 
-def get_db():
-    return db
+def __getattr__(name: str):
+    # Backwards compatibility for `from backend.database import db, client`
+    if name == "db":
+        return get_db()
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
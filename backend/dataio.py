@@ -0,0 +1,282 @@
+# backend/dataio.py
+"""Stream content collections to and from files.
+
+    python -m backend.dataio export [--dir backup] [--format ndjson|bson]
+                                    [--collections reviews portfolio projects]
+                                    [--batch-size 2000] [--resume]
+    python -m backend.dataio import [--dir backup] [--format ndjson|bson]
+                                    [--collections ...] [--chunk-size 1000]
+                                    [--mode insert|upsert] [--drop] [--resume]
+
+One file per collection, <dir>/<collection>.ndjson (MongoDB Extended JSON,
+one document a line) or <dir>/<collection>.bson (concatenated BSON, as
+written by mongodump). Documents are streamed in fixed-size batches both
+ways, so memory use does not grow with the collection.
+
+Exports run in _id order. With --resume, an export keeps what an
+interrupted run wrote and continues after its last complete document. An
+import records the byte offset of every finished chunk in
+<file>.checkpoint and continues from there. Re-importing a chunk is
+harmless in either mode: inserts skip _ids that already exist and upserts
+replace them.
+
+After an import the stats documents are rebuilt and running workers are
+told to drop their caches for the imported collections.
+"""
+import argparse
+import asyncio
+import os
+import struct
+import time
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from bson import json_util
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+
+COLLECTIONS = ("reviews", "portfolio", "projects")
+FORMATS = ("ndjson", "bson")
+DUPLICATE_KEY = 11000
+PROGRESS_SECONDS = 1.0
+
+# Documents stay raw BSON between the server and .bson files
+RAW = CodecOptions(document_class=RawBSONDocument)
+
+Progress = Callable[[str], None]
+
+
+def data_path(directory: str, collection: str, fmt: str) -> str:
+    return os.path.join(directory, f"{collection}.{fmt}")
+
+
+class _Meter:
+    """Prints ``collection: done/total (rate)`` at most once a second"""
+
+    def __init__(self, collection: str, total: Optional[int], progress: Progress, done: int = 0):
+        self.collection = collection
+        self.total = total
+        self.progress = progress
+        self.done = done
+        self._start_done = done
+        self._started = time.perf_counter()
+        self._last = 0.0
+
+    def add(self, n: int, final: bool = False) -> None:
+        self.done += n
+        now = time.perf_counter()
+        if not final and now - self._last < PROGRESS_SECONDS:
+            return
+        self._last = now
+        rate = (self.done - self._start_done) / max(now - self._started, 1e-9)
+        of = f"/{self.total} ({self.done / self.total:.1%})" if self.total else ""
+        self.progress(f"  {self.collection}: {self.done}{of}, {rate:.0f} docs/s")
+
+
+# ----------------------------
+# Reading files
+# ----------------------------
+def _read_ndjson(f: BinaryIO) -> Iterator[Tuple[Any, int]]:
+    """(document, offset just past it) for every complete line"""
+    offset = f.tell()
+    for line in f:
+        if not line.endswith(b"\n"):
+            return  # cut off by an interrupted export
+        offset += len(line)
+        if line.strip():
+            yield json_util.loads(line), offset
+
+
+def _read_bson(f: BinaryIO) -> Iterator[Tuple[Any, int]]:
+    offset = f.tell()
+    while True:
+        header = f.read(4)
+        if len(header) < 4:
+            return
+        (length,) = struct.unpack("<i", header)
+        body = f.read(length - 4)
+        if len(body) < length - 4:
+            return
+        offset += length
+        yield RawBSONDocument(header + body), offset
+
+
+READERS = {"ndjson": _read_ndjson, "bson": _read_bson}
+
+
+def _last_complete(path: str, fmt: str) -> Tuple[int, Any, int]:
+    """(documents, last _id, end offset) of the complete records in ``path``"""
+    count, last_id, end = 0, None, 0
+    with open(path, "rb") as f:
+        for doc, offset in READERS[fmt](f):
+            count, last_id, end = count + 1, doc["_id"], offset
+    return count, last_id, end
+
+
+# ----------------------------
+# Export
+# ----------------------------
+async def export_collection(db, collection: str, path: str, fmt: str = "ndjson", batch_size: int = 2000,
+                            resume: bool = False, progress: Progress = print) -> int:
+    """Write ``collection`` to ``path``; returns the documents written by this run"""
+    q: dict = {}
+    done = 0
+    mode = "wb"
+    if resume and os.path.exists(path):
+        done, last_id, end = _last_complete(path, fmt)
+        with open(path, "r+b") as f:
+            f.truncate(end)
+        if last_id is not None:
+            q = {"_id": {"$gt": last_id}}
+            progress(f"  {collection}: resuming after {done} documents")
+        mode = "ab"
+
+    source = db[collection].with_options(codec_options=RAW) if fmt == "bson" else db[collection]
+    meter = _Meter(collection, await db[collection].estimated_document_count(), progress, done)
+    written = 0
+    with open(path, mode) as f:
+        cursor = source.find(q).sort("_id", 1).batch_size(batch_size)
+        async for doc in cursor:
+            if fmt == "bson":
+                f.write(doc.raw)
+            else:
+                f.write(json_util.dumps(doc).encode("utf-8") + b"\n")
+            written += 1
+            meter.add(1)
+        f.flush()
+        os.fsync(f.fileno())
+    meter.add(0, final=True)
+    return written
+
+
+# ----------------------------
+# Import
+# ----------------------------
+def _checkpoint_path(path: str) -> str:
+    return f"{path}.checkpoint"
+
+
+def _read_checkpoint(path: str) -> Tuple[int, int]:
+    """(byte offset, documents) already imported from ``path``"""
+    try:
+        with open(_checkpoint_path(path)) as f:
+            offset, count = f.read().split()
+            return int(offset), int(count)
+    except (FileNotFoundError, ValueError):
+        return 0, 0
+
+
+def _write_checkpoint(path: str, offset: int, count: int) -> None:
+    tmp = _checkpoint_path(path) + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(f"{offset} {count}\n")
+    os.replace(tmp, _checkpoint_path(path))
+
+
+async def _write_chunk(collection, docs: List[Any], mode: str) -> int:
+    """Insert or upsert one chunk; returns documents skipped as already present"""
+    try:
+        if mode == "upsert":
+            await collection.bulk_write([ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs],
+                                        ordered=False)
+        else:
+            await collection.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != DUPLICATE_KEY for err in errors):
+            raise
+        return len(errors)
+    return 0
+
+
+async def import_collection(db, collection: str, path: str, fmt: str = "ndjson", chunk_size: int = 1000,
+                            mode: str = "insert", resume: bool = False, progress: Progress = print) -> Tuple[int, int]:
+    """Load ``path`` into ``collection``; returns (documents written, skipped as present)"""
+    offset, done = _read_checkpoint(path) if resume else (0, 0)
+    if offset:
+        progress(f"  {collection}: resuming after {done} documents")
+    target = db[collection].with_options(codec_options=RAW) if fmt == "bson" else db[collection]
+    meter = _Meter(collection, None, progress, done)
+    written = skipped = 0
+    chunk: List[Any] = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for doc, end in READERS[fmt](f):
+            chunk.append(doc)
+            if len(chunk) == chunk_size:
+                skipped += await _write_chunk(target, chunk, mode)
+                written += len(chunk)
+                _write_checkpoint(path, end, done + written)
+                meter.add(len(chunk))
+                chunk = []
+        if chunk:
+            skipped += await _write_chunk(target, chunk, mode)
+            written += len(chunk)
+            meter.add(len(chunk))
+    meter.add(0, final=True)
+    if os.path.exists(_checkpoint_path(path)):
+        os.remove(_checkpoint_path(path))
+    return written - skipped, skipped
+
+
+async def finish_import(db, collections: List[str], rebuild_indexes: bool = False) -> None:
+    """Recount stats and have running workers drop their caches"""
+    from backend.coherence import invalidation_bus
+    from backend.indexes import ensure_indexes
+    from backend.stats import rebuild_stats
+
+    if rebuild_indexes:
+        await ensure_indexes(db)
+    await rebuild_stats(db)
+    for collection in collections:
+        await invalidation_bus.publish(db, collection)
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+async def run(db, args: argparse.Namespace) -> None:
+    os.makedirs(args.dir, exist_ok=True)
+    for collection in args.collections:
+        path = data_path(args.dir, collection, args.format)
+        started = time.perf_counter()
+        if args.command == "export":
+            n = await export_collection(db, collection, path, args.format, args.batch_size, args.resume)
+            print(f"✅ {collection}: {n} documents -> {path} in {time.perf_counter() - started:.1f}s")
+            continue
+        if not os.path.exists(path):
+            print(f"⚠️  {collection}: no {path}, skipped")
+            continue
+        if args.drop and not (args.resume and os.path.exists(_checkpoint_path(path))):
+            await db[collection].drop()
+        written, skipped = await import_collection(
+            db, collection, path, args.format, args.chunk_size, args.mode, args.resume
+        )
+        print(f"✅ {collection}: {written} documents <- {path} ({skipped} already present) "
+              f"in {time.perf_counter() - started:.1f}s")
+    if args.command == "import":
+        await finish_import(db, args.collections, rebuild_indexes=args.drop)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("--dir", default="backup", help="directory holding one file per collection")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--collections", nargs="+", choices=COLLECTIONS, default=list(COLLECTIONS))
+    parser.add_argument("--batch-size", type=int, default=2000, help="export cursor batch size")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="documents per import write")
+    parser.add_argument("--mode", choices=("insert", "upsert"), default="insert",
+                        help="insert skips existing _ids, upsert replaces them")
+    parser.add_argument("--drop", action="store_true", help="drop each collection before importing it")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted export or import")
+    args = parser.parse_args()
+
+    from backend.database import get_db
+
+    asyncio.run(run(get_db(), args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,55 @@
 ﻿from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from .auth import decode_token, get_admin_by_username
+import hashlib
+import time
+
+from .auth import decode_token_claims, get_admin_by_username
+from .cache import TTLCache
 from .config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Verified token -> admin document. Entries never outlive the token's exp.
+# Code that writes an admin document calls backend.coherence.admin_changed;
+# edits made straight in MongoDB are only bounded by ADMIN_CACHE_TTL_SECONDS.
+admin_principal_cache = TTLCache(
+    max_entries=settings.ADMIN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ADMIN_CACHE_TTL_SECONDS,
+)
+
+
+def admin_tag(username: str) -> str:
+    return f"admins:{username}"
+
+
+def invalidate_admin(username: str) -> None:
+    """Forget cached principals of ``username`` after its document changes"""
+    admin_principal_cache.invalidate_tags(admin_tag(username))
+
+
 async def get_current_admin(token: str = Depends(oauth2_scheme)):
-    """Validate JWT and return the admin document from MongoDB"""
-    username = decode_token(token)
+    """Validate JWT and return the admin document from MongoDB.
+
+    A token seen recently is served from admin_principal_cache, so the
+    common case costs neither a signature check nor a database round trip.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    admin = admin_principal_cache.get(key)
+    if admin is not None:
+        return admin
+
+    claims = decode_token_claims(token)
+    username = claims["sub"]
     admin = await get_admin_by_username(username)   # ✅ async Mongo call
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Admin not found"
         )
+
+    ttl = settings.ADMIN_CACHE_TTL_SECONDS
+    if claims.get("exp") is not None:
+        ttl = min(ttl, float(claims["exp"]) - time.time())
+    if ttl > 0:
+        admin_principal_cache.set(key, admin, tags=[admin_tag(username)], ttl=ttl)
     return admin
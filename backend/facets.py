@@ -0,0 +1,145 @@
+# backend/facets.py
+import asyncio
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from backend.stats import flag, flag_expr, flags_key
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Layout
+# ----------------------------
+# {flags_key: {"tags": {tag: n}, "categories": {category: n}}}
+# Counts are split by the is_active/is_featured combination, like the
+# portfolio stats document, so any flag scope is a sum of at most four.
+Counts = Dict[str, Dict[str, Dict[str, int]]]
+FACETS = ("tags", "categories")
+
+
+def _flags(doc: Mapping[str, Any]) -> str:
+    return flags_key(flag(doc, "is_active"), flag(doc, "is_featured"))
+
+
+def _values(doc: Mapping[str, Any]) -> Dict[str, List[str]]:
+    category = doc.get("category")
+    return {
+        "tags": sorted({tag for tag in doc.get("tags") or [] if tag}),
+        "categories": [category] if category else [],
+    }
+
+
+def _bump(counts: Counts, doc: Mapping[str, Any], sign: int) -> None:
+    bucket = counts.setdefault(_flags(doc), {facet: {} for facet in FACETS})
+    for facet, values in _values(doc).items():
+        for value in values:
+            n = bucket[facet].get(value, 0) + sign
+            if n > 0:
+                bucket[facet][value] = n
+            else:
+                bucket[facet].pop(value, None)
+
+
+async def compute_facets(db) -> Counts:
+    """Tag and category counts per flag combination, from two aggregations"""
+    flags = {"active": flag_expr("is_active"), "featured": flag_expr("is_featured")}
+    counts: Counts = {}
+    pipelines = {
+        "tags": [
+            {"$match": {"tags.0": {"$exists": True}}},
+            # An item counts once per tag, however often it lists it
+            {"$addFields": {"tags": {"$setUnion": ["$tags", []]}}},
+            {"$unwind": "$tags"},
+            {"$group": {"_id": {**flags, "value": "$tags"}, "count": {"$sum": 1}}},
+        ],
+        "categories": [
+            {"$match": {"category": {"$nin": [None, ""]}}},
+            {"$group": {"_id": {**flags, "value": "$category"}, "count": {"$sum": 1}}},
+        ],
+    }
+    for facet, pipeline in pipelines.items():
+        async for row in db.portfolio.aggregate(pipeline):
+            key = flags_key(row["_id"]["active"], row["_id"]["featured"])
+            bucket = counts.setdefault(key, {f: {} for f in FACETS})
+            value = row["_id"]["value"]
+            if value:
+                bucket[facet][value] = bucket[facet].get(value, 0) + row["count"]
+    return counts
+
+
+class FacetCache:
+    """Per-process facet counts: aggregated once, then kept current by writes.
+
+    Routers report every created, updated or deleted item through ``apply``
+    and the counts move by the difference. Writes seen while the first
+    aggregation runs are replayed once it finishes.
+    """
+
+    def __init__(self):
+        self.counts: Optional[Counts] = None
+        self._building: Optional[asyncio.Future] = None
+        self._pending: List[Tuple[Optional[Mapping[str, Any]], Optional[Mapping[str, Any]]]] = []
+        # Bumped by reset(), so a build that started before it is not kept
+        self._generation = 0
+
+    async def get(self, db) -> Counts:
+        if self.counts is not None:
+            return self.counts
+        if self._building is None:
+            self._building = asyncio.ensure_future(self._build(db))
+        try:
+            return await asyncio.shield(self._building)
+        finally:
+            if self._building is not None and self._building.done():
+                self._building = None
+
+    async def _build(self, db) -> Counts:
+        generation = self._generation
+        counts = await compute_facets(db)
+        for before, after in self._pending:
+            self._apply(counts, before, after)
+        self._pending = []
+        if generation == self._generation:
+            self.counts = counts
+        return counts
+
+    @staticmethod
+    def _apply(counts: Counts, before, after) -> None:
+        if before is not None:
+            _bump(counts, before, -1)
+        if after is not None:
+            _bump(counts, after, 1)
+
+    def apply(self, before: Optional[Mapping[str, Any]] = None, after: Optional[Mapping[str, Any]] = None) -> None:
+        if self.counts is not None:
+            self._apply(self.counts, before, after)
+        elif self._building is not None:
+            self._pending.append((before, after))
+
+    def reset(self) -> None:
+        """Drop the counts; the next request aggregates again"""
+        self._generation += 1
+        self.counts = None
+
+    async def facets(self, db, q: Mapping[str, bool]) -> Dict[str, List[Dict[str, Any]]]:
+        """Counts for the is_active/is_featured scope in ``q``, largest first"""
+        counts = await self.get(db)
+        merged: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        for active in (True, False):
+            for featured in (True, False):
+                if q.get("is_active", active) != active or q.get("is_featured", featured) != featured:
+                    continue
+                bucket = counts.get(flags_key(active, featured), {})
+                for facet in FACETS:
+                    for value, n in bucket.get(facet, {}).items():
+                        merged[facet][value] = merged[facet].get(value, 0) + n
+        return {
+            facet: [
+                {"value": value, "count": n}
+                for value, n in sorted(values.items(), key=lambda item: (-item[1], item[0]))
+            ]
+            for facet, values in merged.items()
+        }
+
+
+portfolio_facets = FacetCache()
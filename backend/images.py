@@ -0,0 +1,86 @@
+# backend/images.py
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Process pool for image work, created on first use.
+
+    Workers are spawned rather than forked so they never inherit the
+    event loop or the Mongo client's background threads.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+def variant_name(filename: str, width: int) -> str:
+    return f"{os.path.splitext(filename)[0]}_w{width}.webp"
+
+
+def build_variants(directory: str, filename: str, widths: Sequence[int]) -> Dict[str, str]:
+    """Write downscaled WebP copies of ``filename``; runs inside the pool.
+
+    Returns ``{width: variant filename}``. Widths at or above the original
+    width are skipped, since upscaling only makes files bigger. Source files
+    are content-addressed, so an existing variant is already up to date.
+    """
+    from PIL import Image, ImageOps
+
+    variants: Dict[str, str] = {}
+    with Image.open(os.path.join(directory, filename)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for width in sorted(widths):
+            if width >= image.width:
+                continue
+            name = variant_name(filename, width)
+            path = os.path.join(directory, name)
+            if not os.path.exists(path):
+                resized = image.copy()
+                resized.thumbnail((width, image.height), Image.LANCZOS)
+                tmp_path = path + ".part"
+                resized.save(tmp_path, format="WEBP", quality=settings.IMAGE_VARIANT_QUALITY, method=4)
+                os.replace(tmp_path, path)
+            variants[str(width)] = name
+    return variants
+
+
+async def generate_variants(filename: str) -> Dict[str, str]:
+    """Build the responsive variants of an uploaded image off the event loop.
+
+    Files Pillow cannot decode (SVG, for instance) simply get no variants.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            get_pool(), build_variants,
+            settings.UPLOAD_DIR, filename, settings.IMAGE_VARIANT_WIDTHS,
+        )
+    except ImportError:
+        logger.warning("Pillow is not installed; skipping image variants for %s", filename)
+    except Exception as e:
+        logger.info("No image variants for %s: %s", filename, e)
+    return {}
@@ -0,0 +1,154 @@
+# backend/indexes.py
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import PyMongoError
+
+from backend.search import SEARCH_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+# Options that change index behaviour and therefore count as drift
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+# ----------------------------
+# Registry
+# ----------------------------
+# Every index the application relies on, per collection. Each one is named
+# so drift can be matched by name. Listing indexes end in (created_at, _id)
+# to serve the keyset sort in backend.pagination without an in-memory sort.
+# Time-bounded collections declare expireAfterSeconds on a date field.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "portfolio": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="portfolio_recent"),
+        IndexModel(
+            [("is_active", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="portfolio_active_recent",
+        ),
+        IndexModel(
+            [("is_featured", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="portfolio_featured_recent",
+        ),
+        IndexModel(
+            [
+                ("is_active", ASCENDING),
+                ("is_featured", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING),
+            ],
+            name="portfolio_active_featured_recent",
+        ),
+        # tag= / category= filters of the listing; tags is multikey
+        IndexModel(
+            [("tags", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="portfolio_tag_recent",
+        ),
+        IndexModel(
+            [("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="portfolio_category_recent",
+        ),
+        # Latest write, for the read snapshot's incremental sync (backend.repository)
+        IndexModel([("updated_at", DESCENDING)], name="portfolio_updated"),
+        # GET /portfolio/search; weights shared with the in-memory fallback
+        IndexModel(
+            [(field, TEXT) for field in SEARCH_WEIGHTS],
+            name="portfolio_text",
+            weights=SEARCH_WEIGHTS,
+        ),
+    ],
+    "reviews": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="reviews_recent"),
+        IndexModel(
+            [("published", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="reviews_published_recent",
+        ),
+        IndexModel([("updated_at", DESCENDING)], name="reviews_updated"),
+    ],
+    "admins": [
+        IndexModel([("username", ASCENDING)], name="admins_username_unique", unique=True),
+    ],
+}
+
+
+# ----------------------------
+# Drift detection
+# ----------------------------
+def _normalize(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a declared or live index description to the fields we compare"""
+    key = spec["key"]
+    if isinstance(key, dict):
+        key = list(key.items())
+    normalized: Dict[str, Any] = {}
+    text_fields = [k for k, v in key if v == TEXT and k != "_fts"]
+    if text_fields or any(k == "_fts" for k, _ in key):
+        # Live text indexes report their fields as _fts/_ftsx plus weights
+        weights = {field: 1 for field in text_fields}
+        weights.update(spec.get("weights") or {})
+        normalized["weights"] = {k: int(v) for k, v in sorted(weights.items())}
+        key = [(k, v) for k, v in key if v != TEXT and k not in ("_fts", "_ftsx")]
+    normalized["key"] = [(k, int(v) if isinstance(v, (int, float)) else v) for k, v in key]
+    for option in _COMPARED_OPTIONS:
+        if spec.get(option) not in (None, False):
+            normalized[option] = spec[option]
+    return normalized
+
+
+async def index_drift(db, registry: Dict[str, List[IndexModel]] = INDEXES) -> Dict[str, Dict[str, List[str]]]:
+    """Compare declared indexes with the live ones, per collection.
+
+    Returns ``{collection: {"missing": [...], "changed": [...], "undeclared": [...]}}``
+    containing only collections that have drifted.
+    """
+    report: Dict[str, Dict[str, List[str]]] = {}
+    for collection, models in registry.items():
+        live = await db[collection].index_information()
+        live.pop("_id_", None)
+        declared = {m.document["name"]: _normalize(m.document) for m in models}
+
+        missing = [name for name in declared if name not in live]
+        changed = [
+            name for name, spec in declared.items()
+            if name in live and _normalize(live[name]) != spec
+        ]
+        undeclared = [name for name in live if name not in declared]
+        if missing or changed or undeclared:
+            report[collection] = {"missing": missing, "changed": changed, "undeclared": undeclared}
+    return report
+
+
+async def ensure_indexes(db, registry: Dict[str, List[IndexModel]] = INDEXES) -> Dict[str, Dict[str, List[str]]]:
+    """Create missing indexes and log anything that still differs.
+
+    Changed or undeclared indexes are only reported, never dropped: rebuilding
+    an index on a large collection is an operational decision.
+    """
+    drift = await index_drift(db, registry)
+    for collection, entry in drift.items():
+        to_create = [m for m in registry[collection] if m.document["name"] in entry["missing"]]
+        if to_create:
+            await db[collection].create_indexes(to_create)
+            logger.info("Created indexes on %s: %s", collection, ", ".join(entry["missing"]))
+
+    drift = await index_drift(db, registry)
+    for collection, entry in drift.items():
+        if entry["changed"]:
+            logger.warning("Index definition drift on %s: %s", collection, ", ".join(entry["changed"]))
+        if entry["undeclared"]:
+            logger.warning("Undeclared indexes on %s: %s", collection, ", ".join(entry["undeclared"]))
+    return drift
+
+
+async def apply_indexes_on_startup(db) -> None:
+    """Lifespan hook: never block startup on an unreachable database"""
+    try:
+        await ensure_indexes(db)
+    except PyMongoError as e:
+        logger.error("Could not apply index registry: %s", e)
+
+
+if __name__ == "__main__":
+    from backend.database import get_db
+
+    print(asyncio.run(ensure_indexes(get_db())) or "✅ Indexes match the registry")
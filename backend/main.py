@@ -1,20 +1,90 @@
 ﻿# main.py
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 
 from backend.config import settings
-from backend.routers import reviews, portfolio, auth as auth_router, projects
+from backend import database
+from backend.admission import AdmissionMiddleware, admission, public_write_buckets
+from backend.cache import response_cache
+from backend.coherence import invalidation_bus
+from backend.deps import admin_principal_cache
+from backend.database import get_db
+from backend.hashing import password_hasher
+from backend.images import shutdown_pool
+from backend.indexes import apply_indexes_on_startup
+from backend.metrics import MetricsMiddleware, gauges, registry
+from backend.repository import read_snapshot
+from backend.startup import phase_timings, timed, timed_step
+from backend.stats import ensure_stats, stats_repair
+from backend.uploads import UploadFiles, UploadSizeLimitMiddleware
+from backend.routers import reviews, portfolio, auth as auth_router, projects, system, home
+
+logger = logging.getLogger(__name__)
+
+
+def _component_metrics():
+    # Counters the components already keep, exported as gauges at scrape time
+    yield from gauges("response_cache", "Response cache counters", response_cache.stats())
+    yield from gauges("admin_cache", "Admin principal cache counters", admin_principal_cache.stats())
+    yield from gauges("password_hasher", "bcrypt worker pool counters", password_hasher.stats())
+    yield from gauges("review_queue", "Review write-behind queue counters", reviews.review_queue.stats())
+    groups = admission.stats()["groups"]
+    for field in ("active", "waiting", "rejected", "timed_out"):
+        yield from gauges(f"admission_{field}", f"Admission control: {field.replace('_', ' ')} per route group",
+                          {name: group[field] for name, group in groups.items()}, label="group")
+    yield from gauges("public_write_rate_limit", "Per-client public write token buckets", public_write_buckets.stats())
+    yield from gauges("stats_repair", "Failed stats updates and the rebuilds they scheduled", stats_repair)
+    yield from gauges("mongo_pool", "MongoDB connection pool counters", database.pool_stats.snapshot())
+
+
+registry.add_collector(_component_metrics)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with timed("lifespan"):
+        database.connect()
+        # Independent of each other, so they share the wait for the database
+        steps = [timed_step("ensure_stats", ensure_stats(get_db()))]
+        if settings.ENSURE_INDEXES:
+            steps.append(timed_step("ensure_indexes", apply_indexes_on_startup(get_db())))
+        await asyncio.gather(*steps)
+        await timed_step("invalidation_bus", invalidation_bus.start(get_db()))
+        if settings.REVIEW_WRITE_BEHIND:
+            await timed_step("review_queue", reviews.review_queue.start(get_db()))
+        if read_snapshot is not None:
+            await timed_step("read_snapshot", read_snapshot.start(get_db(), settings.READ_SNAPSHOT_SYNC_SECONDS))
+    logger.info("Startup phases (ms): %s", phase_timings)
+    yield
+    # Before the bus stops, so the last batch's invalidation is published
+    await reviews.review_queue.stop(get_db())
+    await invalidation_bus.stop(get_db())
+    if read_snapshot is not None:
+        await read_snapshot.stop()
+    shutdown_pool()
+    password_hasher.shutdown()
+    database.close()
 
-# Ensure uploads folder exists
-os.makedirs("uploads", exist_ok=True)
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.PROJECT_NAME, version="1.0.0")
+    app = FastAPI(title=settings.PROJECT_NAME, version="1.0.0", lifespan=lifespan)
 
-    # Serve static files
-    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+    # StaticFiles checks the directory when it is mounted
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+    # Serve uploads with long-lived cache headers (see backend.uploads.UploadFiles)
+    app.mount("/uploads", UploadFiles(directory=settings.UPLOAD_DIR), name="uploads")
+
+    # Turn away oversized uploads before the multipart body is spooled
+    app.add_middleware(UploadSizeLimitMiddleware)
+
+    # Limit concurrent API work per route group and shed what would wait too
+    # long; inside CORS so rejections still carry the CORS headers
+    app.add_middleware(AdmissionMiddleware)
 
     # CORS configuration
     origins = ["http://localhost:8080"]  # React dev server
@@ -24,20 +94,36 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
     )
 
+    # Outermost, so latency includes every other middleware
+    app.add_middleware(MetricsMiddleware)
+
     # API routers
     app.include_router(auth_router.router, prefix="/api/v1/auth", tags=["auth"])
     app.include_router(reviews.router, prefix="/api/v1/reviews", tags=["reviews"])
     app.include_router(portfolio.router, prefix="/api/v1/portfolio", tags=["portfolio"])
     app.include_router(projects.router, prefix="/api/v1/projects", tags=["projects"])
+    app.include_router(home.router, prefix="/api/v1/home", tags=["home"])
+    app.include_router(system.router, prefix="/api/v1", tags=["system"])
 
     # Root endpoint
     @app.get("/")
     async def root():
         return {"status": "ok", "name": settings.PROJECT_NAME}
 
+    @app.get("/health")
+    async def health():
+        report = await database.health()
+        return JSONResponse(report, status_code=200 if report["mongo"]["ok"] else 503)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
     return app
 
 # Initialize app
-app = create_app()
+with timed("create_app"):
+    app = create_app()
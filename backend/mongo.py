@@ -1,6 +1,11 @@
 # app/mongo.py
-from motor.motor_asyncio import AsyncIOMotorClient
-from .config import settings
+# Kept for old imports: the one client per worker lives in backend.database
+from .database import get_client, get_db
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client[settings.MONGO_DB]
+
+def __getattr__(name: str):
+    if name == "db":
+        return get_db()
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,58 @@
+# backend/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+# Listings are ordered newest first; _id breaks ties between equal timestamps
+SORT_ORDER: List[Tuple[str, int]] = [("created_at", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Build an opaque cursor pointing just after ``doc`` in SORT_ORDER"""
+    created_at = doc.get("created_at")
+    payload = {
+        "t": created_at.isoformat() if isinstance(created_at, datetime) else None,
+        "i": str(doc["_id"]),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload["t"]) if payload["t"] else None
+        return created_at, ObjectId(payload["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def seek_query(q: Dict[str, Any], cursor: str) -> Dict[str, Any]:
+    """Extend the filter ``q`` so it only matches documents after ``cursor``"""
+    created_at, last_id = decode_cursor(cursor)
+    if created_at is None:
+        after: Dict[str, Any] = {"created_at": None, "_id": {"$lt": last_id}}
+    else:
+        after = {
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": last_id}},
+                # Missing/null created_at sorts last in newest-first order
+                {"created_at": None},
+            ]
+        }
+    if not q:
+        return after
+    return {"$and": [q, after]}
+
+
+def next_cursor(docs: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """Cursor for the following page, or None when this page is the last"""
+    if len(docs) < limit:
+        return None
+    return encode_cursor(docs[-1])
@@ -0,0 +1,586 @@
+# backend/repository.py
+"""Read access for the public GET routes, from MongoDB or a SQLite snapshot.
+
+    python -m backend.repository sync [--path wefixit.db]
+
+Routers read reviews and portfolio items through ``get_read_repository``.
+With READ_BACKEND=mongo (the default) that is MongoReadRepository, the
+queries the routers always ran. With READ_BACKEND=sqlite it is
+SQLiteReadRepository: published reviews and active portfolio items are
+served from a local SQLite file (DATABASE_URL). A background task copies
+the changes over from MongoDB whenever a collection's cache version moves
+(see backend/coherence.py), or, when versions are not published, whenever
+a cheap fingerprint of the collection changes between two checks
+READ_SNAPSHOT_SYNC_SECONDS apart. Requests the snapshot cannot answer
+(unpublished or inactive documents, ids it does not hold) go to MongoDB
+as before.
+
+The command above rebuilds the snapshot once, for workers that run with
+READ_SNAPSHOT_SYNC_SECONDS=0 and a cron job instead.
+"""
+import argparse
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import bson
+from bson import ObjectId
+from fastapi import Depends
+from pymongo.errors import PyMongoError
+
+from backend.cache import invalidate_collection
+from backend.config import settings
+from backend.database import get_db
+from backend.pagination import SORT_ORDER, decode_cursor, seek_query
+from backend.stats import flag, flag_query, portfolio_total
+
+logger = logging.getLogger(__name__)
+
+Doc = Dict[str, Any]
+
+
+# ----------------------------
+# MongoDB
+# ----------------------------
+class MongoReadRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def _find(self, collection: str, q: Dict[str, Any], cursor: Optional[str],
+                    limit: int, offset: int, projection: Optional[Dict[str, Any]]) -> List[Doc]:
+        q = flag_query(q)
+        if cursor:
+            # Keyset mode: seek past the last seen (created_at, _id) instead of skipping
+            found = self.db[collection].find(seek_query(q, cursor), projection).sort(SORT_ORDER).limit(limit)
+        else:
+            found = self.db[collection].find(q, projection).sort(SORT_ORDER).skip(offset).limit(limit)
+        return await found.to_list(length=limit)
+
+    async def find_reviews(self, q: Dict[str, Any], cursor: Optional[str], limit: int, offset: int,
+                           projection: Optional[Dict[str, Any]] = None) -> List[Doc]:
+        return await self._find("reviews", q, cursor, limit, offset, projection)
+
+    async def get_review(self, review_id: ObjectId) -> Optional[Doc]:
+        return await self.db.reviews.find_one({"_id": review_id})
+
+    async def find_portfolio(self, q: Dict[str, Any], cursor: Optional[str], limit: int, offset: int,
+                             projection: Optional[Dict[str, Any]] = None) -> List[Doc]:
+        return await self._find("portfolio", q, cursor, limit, offset, projection)
+
+    async def count_portfolio(self, q: Dict[str, Any], estimated: bool = False) -> int:
+        if estimated and not q:
+            # Collection metadata, no scan; can be off after an unclean shutdown
+            return await self.db.portfolio.estimated_document_count()
+        # From the materialized stats where the filter allows
+        return await portfolio_total(self.db, q)
+
+    async def get_portfolio_item(self, item_id: ObjectId) -> Optional[Doc]:
+        return await self.db.portfolio.find_one({"_id": item_id})
+
+
+# ----------------------------
+# SQLite snapshot
+# ----------------------------
+# Each table holds the whole document as BSON, so rows decode to exactly
+# what Motor returns, plus the columns the listings filter and sort on.
+# created_at is a fixed-width UTC string ('' when missing, which sorts last
+# in newest-first order like null does in MongoDB); ids are ObjectId hex,
+# which sorts like the ObjectIds themselves.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot_reviews (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    doc BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_snapshot_reviews_recent ON snapshot_reviews (created_at DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS snapshot_portfolio (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    is_featured INTEGER NOT NULL,
+    category TEXT,
+    doc BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_snapshot_portfolio_recent ON snapshot_portfolio (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_snapshot_portfolio_featured ON snapshot_portfolio (is_featured, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_snapshot_portfolio_category ON snapshot_portfolio (category, created_at DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS snapshot_portfolio_tags (
+    tag TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    PRIMARY KEY (tag, item_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_snapshot_portfolio_tags_item ON snapshot_portfolio_tags (item_id);
+
+CREATE TABLE IF NOT EXISTS snapshot_meta (
+    collection TEXT PRIMARY KEY,
+    version INTEGER,
+    documents INTEGER NOT NULL,
+    synced_at TEXT NOT NULL,
+    watermark TEXT,
+    fingerprint TEXT
+);
+"""
+# Added to snapshot_meta after the first release; _open adds them to older files
+META_COLUMNS = ("watermark", "fingerprint")
+
+# What each snapshot holds: exactly the scopes SQLiteReadRepository answers
+# from it, matched like MongoReadRepository matches them (see flag_query)
+SNAPSHOT_SCOPES: Dict[str, Dict[str, Any]] = {
+    "reviews": {"published": True},
+    "portfolio": {"is_active": True},
+}
+SNAPSHOT_FILTERS = {collection: flag_query(q) for collection, q in SNAPSHOT_SCOPES.items()}
+SYNC_BATCH_SIZE = 2000
+# An incremental sync re-reads documents stamped this long before the
+# watermark, for writes that committed after a later-stamped one
+SYNC_OVERLAP = timedelta(seconds=30)
+STAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def sqlite_path(url: str) -> str:
+    if not url.startswith("sqlite:///"):
+        raise ValueError(f"READ_BACKEND=sqlite needs a sqlite:/// DATABASE_URL, got {url!r}")
+    return url[len("sqlite:///"):]
+
+
+def _stamp(value: Any) -> str:
+    if not isinstance(value, datetime):
+        return ""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime(STAMP_FORMAT)
+
+
+def _changed_at(doc: Doc) -> str:
+    """When ``doc`` was last written, as a _stamp string"""
+    return _stamp(doc.get("updated_at") or doc.get("created_at"))
+
+
+def _matches(doc: Doc, collection: str) -> bool:
+    """Whether ``doc`` belongs in the snapshot, i.e. matches SNAPSHOT_FILTERS"""
+    return all(flag(doc, field) is value for field, value in SNAPSHOT_SCOPES[collection].items())
+
+
+async def _batches(found) -> AsyncIterator[List[Doc]]:
+    batch: List[Doc] = []
+    async for doc in found.batch_size(SYNC_BATCH_SIZE):
+        batch.append(doc)
+        if len(batch) == SYNC_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _review_row(doc: Doc) -> Tuple[Any, ...]:
+    return (str(doc["_id"]), _stamp(doc.get("created_at")), bson.encode(doc))
+
+
+def _portfolio_row(doc: Doc) -> Tuple[Any, ...]:
+    return (str(doc["_id"]), _stamp(doc.get("created_at")), int(flag(doc, "is_featured")),
+            doc.get("category"), bson.encode(doc))
+
+
+class ReadSnapshot:
+    """The SQLite file, its connections and the sync loop.
+
+    Queries run on a small thread pool, each thread with its own read
+    connection. In WAL mode they keep reading the previous snapshot while a
+    sync changes a table in one transaction.
+    """
+
+    def __init__(self, path: str, workers: int = 4):
+        self.path = path
+        self.workers = workers
+        self.ready: Set[str] = set()
+        self.versions: Dict[str, Optional[int]] = {}
+        # Latest write copied over and the fingerprint at the last sync, per collection
+        self.watermarks: Dict[str, str] = {}
+        self.fingerprints: Dict[str, Optional[str]] = {}
+        self.syncs = 0
+        self.rebuilds = 0
+        self.updates = 0
+        self.errors = 0
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _connect(self, isolation_level: Optional[str] = "") -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=isolation_level)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sqlite")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _query(self, sql: str, params: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        return self._conn().execute(sql, params).fetchall()
+
+    async def query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        return await self.run(self._query, sql, params)
+
+    def _open(self) -> None:
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(snapshot_meta)")}
+        for column in META_COLUMNS:
+            if column not in columns:
+                conn.execute(f"ALTER TABLE snapshot_meta ADD COLUMN {column} TEXT")
+        query = "SELECT collection, version, watermark, fingerprint FROM snapshot_meta"
+        for collection, version, watermark, fingerprint in conn.execute(query):
+            self.ready.add(collection)
+            self.versions[collection] = version
+            self.watermarks[collection] = watermark or ""
+            self.fingerprints[collection] = fingerprint
+
+    async def open(self) -> None:
+        await self.run(self._open)
+
+    # ----- sync -----
+    async def _fingerprint(self, db, collection: str) -> str:
+        """Matching documents plus the latest write and insert; any write the
+        application makes moves at least one of them. Each is an index lookup."""
+        found = db[collection]
+        parts = [str(await found.count_documents(SNAPSHOT_FILTERS[collection]))]
+        for field in ("updated_at", "created_at"):
+            latest = await found.find({}, {field: 1}).sort(field, -1).limit(1).to_list(length=1)
+            parts.append(_stamp(latest[0].get(field)) if latest else "")
+        return "/".join(parts)
+
+    async def _write(self, collection: str, version: Optional[int], fingerprint: Optional[str],
+                     apply: Callable[[sqlite3.Connection], Awaitable[Tuple[int, str]]]) -> Tuple[int, int]:
+        """Run ``apply`` and record the sync in one transaction; readers see the
+        old rows until it commits. Returns (rows changed, rows in the table)."""
+        # Autocommit mode, so the transaction is exactly BEGIN ... COMMIT below
+        conn = await self.run(self._connect, None)
+        try:
+            await self.run(conn.execute, "BEGIN IMMEDIATE")
+            changes, watermark = await apply(conn)
+            documents = await self.run(self._write_meta, conn, collection, version, watermark, fingerprint)
+            await self.run(conn.execute, "COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                await self.run(conn.execute, "ROLLBACK")
+            raise
+        finally:
+            await self.run(conn.close)
+        self.ready.add(collection)
+        self.versions[collection] = version
+        self.watermarks[collection] = watermark
+        self.fingerprints[collection] = fingerprint
+        self.syncs += 1
+        if changes:
+            # Responses cached from the previous snapshot are stale now
+            invalidate_collection(collection)
+        return changes, documents
+
+    async def sync_collection(self, db, collection: str, version: Optional[int] = None,
+                              fingerprint: Optional[str] = None) -> int:
+        """Rebuild one table from MongoDB; returns the documents it now holds"""
+        async def rebuild(conn: sqlite3.Connection) -> Tuple[int, str]:
+            removed = await self.run(self._clear, conn, collection)
+            count, watermark = 0, ""
+            async for batch in _batches(db[collection].find(SNAPSHOT_FILTERS[collection])):
+                await self.run(self._insert, conn, collection, batch)
+                count += len(batch)
+                watermark = max([watermark, *map(_changed_at, batch)])
+            return removed + count, watermark
+
+        _changes, documents = await self._write(collection, version, fingerprint, rebuild)
+        self.rebuilds += 1
+        return documents
+
+    async def update_collection(self, db, collection: str, version: Optional[int] = None,
+                                fingerprint: Optional[str] = None) -> int:
+        """Apply what changed in MongoDB since the last sync; returns the rows
+        written or removed, including those re-read within SYNC_OVERLAP.
+
+        Documents stamped after the watermark are upserted, or dropped when
+        they no longer match. A pass over the matching ids then removes
+        deleted documents and adds any that match without a newer stamp
+        (e.g. restored from a backup).
+        """
+        found = db[collection]
+        since = self.watermarks.get(collection) or ""
+
+        async def apply_batch(conn: sqlite3.Connection, batch: List[Doc]) -> int:
+            keep = [doc for doc in batch if _matches(doc, collection)]
+            drop = [str(doc["_id"]) for doc in batch if not _matches(doc, collection)]
+            await self.run(self._insert, conn, collection, keep)
+            return len(keep) + await self.run(self._delete, conn, collection, drop)
+
+        async def update(conn: sqlite3.Connection) -> Tuple[int, str]:
+            q: Dict[str, Any] = {}
+            if since:
+                start = datetime.strptime(since, STAMP_FORMAT) - SYNC_OVERLAP
+                q = {"$or": [{"updated_at": {"$gte": start}}, {"created_at": {"$gte": start}}]}
+            changes, watermark = 0, since
+            async for batch in _batches(found.find(q)):
+                changes += await apply_batch(conn, batch)
+                watermark = max([watermark, *map(_changed_at, batch)])
+
+            live = {str(doc["_id"]): doc["_id"]
+                    async for doc in found.find(SNAPSHOT_FILTERS[collection], {"_id": 1}).batch_size(SYNC_BATCH_SIZE)}
+            held = set(await self.run(self._ids, conn, collection))
+            changes += await self.run(self._delete, conn, collection, sorted(held - live.keys()))
+            missing = [live[key] for key in live.keys() - held]
+            for i in range(0, len(missing), SYNC_BATCH_SIZE):
+                batch = await found.find({"_id": {"$in": missing[i:i + SYNC_BATCH_SIZE]}}).to_list(length=None)
+                changes += await apply_batch(conn, batch)
+                watermark = max([watermark, *map(_changed_at, batch)])
+            return changes, watermark
+
+        changes, _documents = await self._write(collection, version, fingerprint, update)
+        self.updates += 1
+        return changes
+
+    @staticmethod
+    def _clear(conn: sqlite3.Connection, collection: str) -> int:
+        removed = conn.execute(f"DELETE FROM snapshot_{collection}").rowcount
+        if collection == "portfolio":
+            conn.execute("DELETE FROM snapshot_portfolio_tags")
+        return removed
+
+    @staticmethod
+    def _ids(conn: sqlite3.Connection, collection: str) -> List[str]:
+        return [row[0] for row in conn.execute(f"SELECT id FROM snapshot_{collection}")]
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, collection: str, docs: List[Doc]) -> None:
+        """Insert ``docs``, replacing the rows (and tags) of ids already held"""
+        if not docs:
+            return
+        if collection == "reviews":
+            conn.executemany("INSERT OR REPLACE INTO snapshot_reviews VALUES (?, ?, ?)", [_review_row(d) for d in docs])
+            return
+        conn.executemany("DELETE FROM snapshot_portfolio_tags WHERE item_id = ?", [(str(d["_id"]),) for d in docs])
+        conn.executemany(
+            "INSERT OR REPLACE INTO snapshot_portfolio VALUES (?, ?, ?, ?, ?)", [_portfolio_row(d) for d in docs]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO snapshot_portfolio_tags VALUES (?, ?)",
+            [(tag, str(d["_id"])) for d in docs for tag in d.get("tags") or [] if isinstance(tag, str)],
+        )
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, collection: str, ids: List[str]) -> int:
+        """Remove the rows of ``ids``; returns how many were held"""
+        if not ids:
+            return 0
+        removed = conn.executemany(f"DELETE FROM snapshot_{collection} WHERE id = ?", [(i,) for i in ids]).rowcount
+        if collection == "portfolio":
+            conn.executemany("DELETE FROM snapshot_portfolio_tags WHERE item_id = ?", [(i,) for i in ids])
+        return removed
+
+    @staticmethod
+    def _write_meta(conn: sqlite3.Connection, collection: str, version: Optional[int],
+                    watermark: str, fingerprint: Optional[str]) -> int:
+        documents = conn.execute(f"SELECT COUNT(*) FROM snapshot_{collection}").fetchone()[0]
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshot_meta "
+            "(collection, version, documents, synced_at, watermark, fingerprint) VALUES (?, ?, ?, ?, ?, ?)",
+            (collection, version, documents, _stamp(datetime.now(timezone.utc)), watermark, fingerprint),
+        )
+        return documents
+
+    async def sync(self, db, force: bool = False) -> Dict[str, int]:
+        """Bring the collections that changed since the last sync up to date.
+
+        Tables are rebuilt on the first sync and when ``force`` is set, and
+        updated incrementally after that.
+        """
+        from backend.coherence import VERSIONS
+
+        versions = {doc["_id"]: doc.get("version") async for doc in db[VERSIONS].find({"_id": {"$in": list(SNAPSHOT_FILTERS)}})}
+        synced = {}
+        for collection in SNAPSHOT_FILTERS:
+            version = versions.get(collection)
+            # Without a published version (INVALIDATION_MODE=off, or nothing
+            # written yet) changes are spotted by the fingerprint instead
+            fingerprint = await self._fingerprint(db, collection) if version is None else None
+            if force or collection not in self.ready:
+                synced[collection] = await self.sync_collection(db, collection, version, fingerprint)
+            elif version is not None and version != self.versions.get(collection):
+                synced[collection] = await self.update_collection(db, collection, version)
+            elif version is None and fingerprint != self.fingerprints.get(collection):
+                synced[collection] = await self.update_collection(db, collection, None, fingerprint)
+        return synced
+
+    async def _sync_loop(self, db, interval: float) -> None:
+        while True:
+            try:
+                synced = await self.sync(db)
+                if synced:
+                    logger.info("Synced read snapshot: %s", synced)
+            except (PyMongoError, sqlite3.Error) as e:
+                self.errors += 1
+                logger.error("Read snapshot sync failed: %s", e)
+            await asyncio.sleep(interval)
+
+    # ----- lifecycle -----
+    async def start(self, db, interval: float) -> None:
+        """Lifespan hook: open the file and, with an interval, keep it synced"""
+        await self.open()
+        if interval > 0:
+            self._task = asyncio.create_task(self._sync_loop(db, interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "ready": sorted(self.ready),
+            "versions": dict(self.versions),
+            "watermarks": dict(self.watermarks),
+            "syncs": self.syncs,
+            "rebuilds": self.rebuilds,
+            "updates": self.updates,
+            "errors": self.errors,
+        }
+
+
+def _seek(cursor: str) -> Tuple[str, List[Any]]:
+    created_at, last_id = decode_cursor(cursor)
+    stamp = _stamp(created_at)
+    return "(created_at < ? OR (created_at = ? AND id < ?))", [stamp, stamp, str(last_id)]
+
+
+class SQLiteReadRepository:
+    """Answers from the snapshot when it holds every matching document,
+    otherwise asks ``fallback``. Snapshot rows are whole documents, so
+    projections only apply on the fallback path."""
+
+    def __init__(self, snapshot: ReadSnapshot, fallback: MongoReadRepository):
+        self.snapshot = snapshot
+        self.fallback = fallback
+
+    async def _rows(self, table: str, where: List[str], params: List[Any], cursor: Optional[str],
+                    limit: int, offset: int) -> List[Doc]:
+        if cursor:
+            clause, seek_params = _seek(cursor)
+            where, params, offset = where + [clause], params + seek_params, 0
+        sql = f"SELECT doc FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+        rows = await self.snapshot.query(sql, tuple(params + [limit, offset]))
+        return [bson.decode(row[0]) for row in rows]
+
+    def _portfolio_where(self, q: Dict[str, Any]) -> Optional[Tuple[List[str], List[Any]]]:
+        if q.get("is_active") is not True or "portfolio" not in self.snapshot.ready:
+            return None
+        where: List[str] = []
+        params: List[Any] = []
+        for key, value in q.items():
+            if key == "is_active":
+                continue
+            if key == "is_featured":
+                where.append("is_featured = ?")
+                params.append(int(value))
+            elif key == "category":
+                where.append("category = ?")
+                params.append(value)
+            elif key == "tags":
+                where.append("id IN (SELECT item_id FROM snapshot_portfolio_tags WHERE tag = ?)")
+                params.append(value)
+            else:
+                return None
+        return where, params
+
+    async def find_reviews(self, q: Dict[str, Any], cursor: Optional[str], limit: int, offset: int,
+                           projection: Optional[Dict[str, Any]] = None) -> List[Doc]:
+        if q != {"published": True} or "reviews" not in self.snapshot.ready:
+            return await self.fallback.find_reviews(q, cursor, limit, offset, projection)
+        return await self._rows("snapshot_reviews", [], [], cursor, limit, offset)
+
+    async def get_review(self, review_id: ObjectId) -> Optional[Doc]:
+        if "reviews" in self.snapshot.ready:
+            rows = await self.snapshot.query("SELECT doc FROM snapshot_reviews WHERE id = ?", (str(review_id),))
+            if rows:
+                return bson.decode(rows[0][0])
+        # Unpublished, or newer than the snapshot
+        return await self.fallback.get_review(review_id)
+
+    async def find_portfolio(self, q: Dict[str, Any], cursor: Optional[str], limit: int, offset: int,
+                             projection: Optional[Dict[str, Any]] = None) -> List[Doc]:
+        scope = self._portfolio_where(q)
+        if scope is None:
+            return await self.fallback.find_portfolio(q, cursor, limit, offset, projection)
+        return await self._rows("snapshot_portfolio", *scope, cursor, limit, offset)
+
+    async def count_portfolio(self, q: Dict[str, Any], estimated: bool = False) -> int:
+        scope = self._portfolio_where(q)
+        if scope is None:
+            return await self.fallback.count_portfolio(q, estimated)
+        where, params = scope
+        sql = "SELECT COUNT(*) FROM snapshot_portfolio"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = await self.snapshot.query(sql, tuple(params))
+        return rows[0][0]
+
+    async def get_portfolio_item(self, item_id: ObjectId) -> Optional[Doc]:
+        if "portfolio" in self.snapshot.ready:
+            rows = await self.snapshot.query("SELECT doc FROM snapshot_portfolio WHERE id = ?", (str(item_id),))
+            if rows:
+                return bson.decode(rows[0][0])
+        return await self.fallback.get_portfolio_item(item_id)
+
+
+read_snapshot = ReadSnapshot(sqlite_path(settings.DATABASE_URL)) if settings.READ_BACKEND == "sqlite" else None
+
+
+def get_read_repository(db=Depends(get_db)):
+    """Dependency: the repository public GET routes read through"""
+    mongo = MongoReadRepository(db)
+    if read_snapshot is None:
+        return mongo
+    return SQLiteReadRepository(read_snapshot, mongo)
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+async def _sync_once(path: str) -> Dict[str, int]:
+    snapshot = ReadSnapshot(path)
+    await snapshot.open()
+    try:
+        return await snapshot.sync(get_db(), force=True)
+    finally:
+        await snapshot.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync the SQLite read snapshot from MongoDB")
+    parser.add_argument("command", choices=("sync",))
+    parser.add_argument("--path", default=None, help="SQLite file (default: from DATABASE_URL)")
+    args = parser.parse_args()
+
+    synced = asyncio.run(_sync_once(args.path or sqlite_path(settings.DATABASE_URL)))
+    for collection, count in synced.items():
+        print(f"✅ {collection}: {count} documents")
+
+
+if __name__ == "__main__":
+    main()
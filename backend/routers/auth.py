@@ -1,17 +1,14 @@
 ﻿from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 from pydantic import BaseModel
 from backend.config import settings
+from backend.auth import hash_password_async, verify_password_async
 
 router = APIRouter(tags=["auth"])
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -31,30 +28,31 @@ class UserInDB(User):
     hashed_password: str
 
 # Fake user database (replace with real database in production)
-fake_users_db = {
-    "admin": {
-        "username": "admin",
-        "hashed_password": pwd_context.hash("admin123"),  # Change this password!
-        "disabled": False,
-    }
-}
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
+_fake_users_db: Optional[Dict[str, Dict[str, Any]]] = None
+
+async def get_fake_users_db() -> Dict[str, Dict[str, Any]]:
+    """Built on first use: a bcrypt round at import slowed every worker start"""
+    global _fake_users_db
+    if _fake_users_db is None:
+        _fake_users_db = {
+            "admin": {
+                "username": "admin",
+                "hashed_password": await hash_password_async("admin123"),  # Change this password!
+                "disabled": False,
+            }
+        }
+    return _fake_users_db
 
 def get_user(db, username: str):
     if username in db:
         user_dict = db[username]
         return UserInDB(**user_dict)
 
-def authenticate_user(fake_db, username: str, password: str):
+async def authenticate_user(fake_db, username: str, password: str):
     user = get_user(fake_db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     return user
 
@@ -83,7 +81,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
         
-    user = get_user(fake_users_db, username=token_data.username)
+    user = get_user(await get_fake_users_db(), username=token_data.username)
     if user is None:
         raise credentials_exception
     return user
@@ -104,7 +102,7 @@ async def get_current_admin(current_user: User = Depends(get_current_active_user
 
 @router.post("/login", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = authenticate_user(fake_users_db, form_data.username, form_data.password)
+    user = await authenticate_user(await get_fake_users_db(), form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,64 @@
+# backend/routers/home.py
+import asyncio
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from backend.cache import cache_response, cached_response, list_tag, request_cache_key
+from backend.database import get_db
+from backend.repository import get_read_repository
+from backend.serialization import (
+    PORTFOLIO_PROJECTION, PROJECT_PROJECTION, REVIEW_PROJECTION,
+    portfolio_doc_to_json, project_doc_to_json, review_doc_to_json
+)
+from backend.stats import review_stats
+
+router = APIRouter(tags=["home"])
+
+COLLECTIONS = ("portfolio", "reviews", "projects")
+# updated_at as well, for Last-Modified
+FEATURED_FIELDS = {**PORTFOLIO_PROJECTION, "updated_at": 1}
+REVIEW_FIELDS = {**REVIEW_PROJECTION, "updated_at": 1}
+
+
+@router.get("/")
+async def home(
+    request: Request,
+    featured: int = Query(6, ge=1, le=24, description="Featured portfolio items"),
+    reviews: int = Query(6, ge=1, le=24, description="Latest published reviews"),
+    projects: int = Query(6, ge=1, le=24),
+    repo=Depends(get_read_repository),
+    db=Depends(get_db)
+):
+    """Everything the landing page shows, in one response.
+
+    The queries run concurrently and the whole payload is cached as one
+    entry, dropped whenever portfolio, reviews or projects change.
+    """
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
+
+    featured_q = {"is_active": True, "is_featured": True}
+    featured_docs, review_docs, project_docs, reviews_summary, portfolio_items = await asyncio.gather(
+        repo.find_portfolio(featured_q, None, featured, 0, FEATURED_FIELDS),
+        repo.find_reviews({"published": True}, None, reviews, 0, REVIEW_FIELDS),
+        db.projects.find({}, PROJECT_PROJECTION).sort("_id", 1).limit(projects).to_list(length=projects),
+        review_stats(db),
+        repo.count_portfolio({"is_active": True}),
+    )
+
+    payload = {
+        "featured": [portfolio_doc_to_json(doc) for doc in featured_docs],
+        "reviews": [review_doc_to_json(doc) for doc in review_docs],
+        "projects": [project_doc_to_json(doc) for doc in project_docs],
+        "stats": {
+            "reviews": reviews_summary["published"],
+            "portfolio_items": portfolio_items,
+        },
+    }
+    return cache_response(
+        request, key, payload,
+        tags=[list_tag(collection) for collection in COLLECTIONS],
+        docs=featured_docs + review_docs, collection=COLLECTIONS,
+    )
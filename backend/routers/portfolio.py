@@ -1,23 +1,41 @@
 ﻿# backend/routers/portfolio.py
 from fastapi import (
-    APIRouter, HTTPException, Query,
-    Depends, Form, File, UploadFile
+    APIRouter, HTTPException, Query, BackgroundTasks,
+    Depends, Form, File, UploadFile, Request
 )
 from bson import ObjectId
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-import os
+from typing import Any, Dict, Optional
+from pymongo import ReturnDocument
 
+from backend.bulk import bulk_insert, bulk_modify
+from backend.cache import (
+    cache_response, cached_response, invalidate_item, invalidate_items,
+    item_tag, list_tag, request_cache_key
+)
 from backend.database import get_db
-from backend.schemas import PortfolioOut
+from backend.facets import portfolio_facets
+from backend.pagination import next_cursor
+from backend.repository import get_read_repository
+from backend.search import portfolio_search, search_portfolio
+from backend.serialization import portfolio_doc_to_json
+from backend.schemas import PortfolioBulkAction, PortfolioImport, PortfolioOut
+from backend.stats import (
+    PORTFOLIO_ID, apply_increments, flag, portfolio_change,
+    record_portfolio_change
+)
 from backend.deps import get_current_admin
+from backend.images import generate_variants
+from backend.uploads import asset_url, save_upload
 
 router = APIRouter(tags=["portfolio"])
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-BASE_URL = "http://localhost:5000"  # Change when deploying
+_BULK_UPDATES: Dict[str, Dict[str, Any]] = {
+    "activate": {"is_active": True},
+    "deactivate": {"is_active": False},
+    "feature": {"is_featured": True},
+    "unfeature": {"is_featured": False},
+}
 
 # ----------------------------
 # Helpers
@@ -30,57 +48,164 @@ def _doc_to_portfolio_out(doc: Dict[str, Any]) -> PortfolioOut:
         image=doc.get("image_url"),
         link=doc.get("link"),
         tags=doc.get("tags", []),
-        is_featured=bool(doc.get("is_featured", False)),
-        is_active=bool(doc.get("is_active", True)),
+        is_featured=flag(doc, "is_featured"),
+        is_active=flag(doc, "is_active"),
         created_at=doc.get("created_at", datetime.now(timezone.utc)),
+        image_variants=doc.get("image_variants", {}),
+    )
+
+
+def _track_change(before: Optional[Dict[str, Any]] = None, after: Optional[Dict[str, Any]] = None) -> None:
+    """Keep this process's search index and facet counts in step with a write"""
+    portfolio_search.apply(before, after)
+    portfolio_facets.apply(before, after)
+
+
+async def _attach_variants(db, item_id: ObjectId, image_url: str, filename: str) -> None:
+    """Background task: store variant URLs once the process pool has built them"""
+    variants = await generate_variants(filename)
+    if not variants:
+        return
+    urls = {width: asset_url(name) for width, name in variants.items()}
+    # Only if the item still shows this image; a newer upload wins
+    result = await db.portfolio.update_one(
+        {"_id": item_id, "image_url": image_url},
+        {"$set": {"image_variants": urls, "updated_at": datetime.now(timezone.utc)}},
     )
+    if result.modified_count:
+        invalidate_item("portfolio", str(item_id))
 
 # ----------------------------
 # Routes
 # ----------------------------
 @router.get("/", response_model=dict)
 async def list_portfolio(
+    request: Request,
     is_active: Optional[bool] = None,
     is_featured: Optional[bool] = None,
+    tag: Optional[str] = Query(None, description="Only items carrying this tag"),
+    category: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$"),
+    repo=Depends(get_read_repository)
+):
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
+
+    q: Dict[str, Any] = {}
+    if is_active is not None:
+        q["is_active"] = is_active
+    if is_featured is not None:
+        q["is_featured"] = is_featured
+    if tag is not None:
+        q["tags"] = tag
+    if category is not None:
+        q["category"] = category
+
+    # Totals come from the materialized stats; "estimated" reads the collection
+    # metadata instead when nothing is filtered
+    total: Optional[int] = None
+    if count != "none":
+        total = await repo.count_portfolio(q, estimated=count == "estimated")
+
+    docs = await repo.find_portfolio(q, cursor, limit, offset)
+    items = [portfolio_doc_to_json(doc) for doc in docs]
+
+    payload = {
+        "total": total,
+        "limit": limit,
+        "offset": None if cursor else offset,
+        "next_cursor": next_cursor(docs, limit),
+        "items": items,
+    }
+    return cache_response(request, key, payload, tags=[list_tag("portfolio")], docs=docs, collection="portfolio")
+
+
+@router.get("/facets", response_model=dict)
+async def portfolio_facet_counts(
+    request: Request,
+    is_active: Optional[bool] = None,
+    is_featured: Optional[bool] = None,
     db=Depends(get_db)
 ):
+    """Number of items per tag and per category, for filter sidebars"""
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
+
     q: Dict[str, Any] = {}
     if is_active is not None:
         q["is_active"] = is_active
     if is_featured is not None:
         q["is_featured"] = is_featured
 
-    total = await db.portfolio.count_documents(q)
-    cursor = db.portfolio.find(q).sort("created_at", -1).skip(offset).limit(limit)
+    payload = await portfolio_facets.facets(db, q)
+    return cache_response(request, key, payload, tags=[list_tag("portfolio")], collection="portfolio")
+
 
-    items: List[PortfolioOut] = []
-    async for doc in cursor:
-        items.append(_doc_to_portfolio_out(doc))
+@router.get("/search", response_model=dict)
+async def search_portfolio_items(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    prefix: bool = Query(False, description="Match words starting with each query term"),
+    is_active: Optional[bool] = None,
+    is_featured: Optional[bool] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db=Depends(get_db)
+):
+    """Rank items by relevance across title, tags, category and description"""
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
 
-    return {
+    filters: Dict[str, Any] = {}
+    if is_active is not None:
+        filters["is_active"] = is_active
+    if is_featured is not None:
+        filters["is_featured"] = is_featured
+
+    engine, total, matches = await search_portfolio(db, q, filters, prefix, limit, offset)
+    payload = {
+        "query": q,
+        "engine": engine,
         "total": total,
         "limit": limit,
         "offset": offset,
-        "items": items,
+        "items": [{**portfolio_doc_to_json(doc), "score": score} for doc, score in matches],
     }
+    return cache_response(request, key, payload, tags=[list_tag("portfolio")], collection="portfolio")
 
 
 @router.get("/{item_id}", response_model=PortfolioOut)
-async def get_portfolio_item(item_id: str, db=Depends(get_db)):
+async def get_portfolio_item(item_id: str, request: Request, repo=Depends(get_read_repository)):
     if not ObjectId.is_valid(item_id):
         raise HTTPException(status_code=404, detail="Item not found")
 
-    doc = await db.portfolio.find_one({"_id": ObjectId(item_id)})
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
+
+    doc = await repo.get_portfolio_item(ObjectId(item_id))
     if not doc:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    return _doc_to_portfolio_out(doc)
+    return cache_response(
+        request, key, portfolio_doc_to_json(doc),
+        tags=[item_tag("portfolio", item_id)], docs=[doc],
+    )
 
 
 @router.post("/", response_model=PortfolioOut)
 async def create_portfolio_item(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: Optional[str] = Form(None),
     category: Optional[str] = Form(None),
@@ -101,19 +226,67 @@ async def create_portfolio_item(
         "created_at": datetime.now(timezone.utc),
     }
 
+    filename = None
     if image:
       try:
-        file_path = os.path.join(UPLOAD_DIR, image.filename)
-        with open(file_path, "wb") as f:
-            f.write(await image.read())
-        data["image_url"] = f"{BASE_URL}/uploads/{image.filename}"
+        filename = await save_upload(image)
+        data["image_url"] = asset_url(filename)
+      except HTTPException:
+        raise
       except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save image: {str(e)}")
 
+    result = await db.portfolio.insert_one(data)
+    data["_id"] = result.inserted_id
+    await record_portfolio_change(db, after=data)
+    _track_change(after=data)
+    invalidate_item("portfolio")
+    if filename:
+        background_tasks.add_task(_attach_variants, db, data["_id"], data["image_url"], filename)
+    return _doc_to_portfolio_out(data)
+
+
+@router.post("/bulk", response_model=dict)
+async def bulk_portfolio_action(
+    body: PortfolioBulkAction,
+    _admin=Depends(get_current_admin),
+    db=Depends(get_db)
+):
+    """Activate, deactivate, feature, unfeature or delete many items in one bulk_write"""
+    updates = None
+    if body.action != "delete":
+        updates = {**_BULK_UPDATES[body.action], "updated_at": datetime.now(timezone.utc)}
+
+    outcome, changes = await bulk_modify(db.portfolio, body.ids, updates, body.ordered)
+    await apply_increments(db, PORTFOLIO_ID, *(portfolio_change(b, a) for b, a in changes))
+    for before, after in changes:
+        _track_change(before, after)
+    invalidate_items("portfolio", [str(before["_id"]) for before, _ in changes])
+    return outcome
+
+
+@router.post("/import", response_model=dict)
+async def import_portfolio(
+    body: PortfolioImport,
+    _admin=Depends(get_current_admin),
+    db=Depends(get_db)
+):
+    """Create many items (without image uploads) in one bulk_write"""
+    now = datetime.now(timezone.utc)
+    docs = [{**item.model_dump(), "created_at": now} for item in body.items]
+
+    outcome, changes = await bulk_insert(db.portfolio, docs, body.ordered, _doc_to_portfolio_out)
+    await apply_increments(db, PORTFOLIO_ID, *(portfolio_change(b, a) for b, a in changes))
+    for before, after in changes:
+        _track_change(before, after)
+    invalidate_items("portfolio")
+    return outcome
+
 
 @router.put("/{item_id}", response_model=PortfolioOut)
 async def update_portfolio_item(
     item_id: str,
+    background_tasks: BackgroundTasks,
     title: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     category: Optional[str] = Form(None),
@@ -141,18 +314,34 @@ async def update_portfolio_item(
     if is_active is not None:
         updates["is_active"] = is_active
 
+    filename = None
     if image:
-        file_path = os.path.join(UPLOAD_DIR, image.filename)
-        with open(file_path, "wb") as f:
-            f.write(await image.read())
-        updates["image_url"] = f"{BASE_URL}/uploads/{image.filename}"
-
-    if updates:
-        result = await db.portfolio.update_one({"_id": ObjectId(item_id)}, {"$set": updates})
-        if result.matched_count == 0:
+        filename = await save_upload(image)
+        updates["image_url"] = asset_url(filename)
+        updates["image_variants"] = {}
+
+    if not updates:
+        doc = await db.portfolio.find_one({"_id": ObjectId(item_id)})
+        if not doc:
             raise HTTPException(status_code=404, detail="Item not found")
+        return _doc_to_portfolio_out(doc)
 
-    doc = await db.portfolio.find_one({"_id": ObjectId(item_id)})
+    updates["updated_at"] = datetime.now(timezone.utc)
+    before = await db.portfolio.find_one_and_update(
+        {"_id": ObjectId(item_id)},
+        {"$set": updates},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if not before:
+        raise HTTPException(status_code=404, detail="Item not found")
+    doc = {**before, **updates}
+    await record_portfolio_change(db, before, doc)
+    _track_change(before, doc)
+    invalidate_item("portfolio", item_id)
+    if filename:
+        background_tasks.add_task(
+            _attach_variants, db, ObjectId(item_id), updates["image_url"], filename
+        )
     return _doc_to_portfolio_out(doc)
 
 
@@ -161,8 +350,11 @@ async def delete_portfolio_item(item_id: str, _admin=Depends(get_current_admin),
     if not ObjectId.is_valid(item_id):
         raise HTTPException(status_code=404, detail="Item not found")
 
-    result = await db.portfolio.delete_one({"_id": ObjectId(item_id)})
-    if result.deleted_count == 0:
+    deleted = await db.portfolio.find_one_and_delete({"_id": ObjectId(item_id)})
+    if not deleted:
         raise HTTPException(status_code=404, detail="Item not found")
+    await record_portfolio_change(db, before=deleted)
+    _track_change(before=deleted)
+    invalidate_item("portfolio", item_id)
 
     return {"message": "Portfolio item deleted successfully"}
@@ -1,19 +1,72 @@
 #projects.py
-from fastapi import APIRouter, Depends
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from backend.cache import cache_response, cached_response, list_tag, request_cache_key
 from backend.database import get_db
+from backend.serialization import PROJECT_PROJECTION, project_doc_to_json
 from bson import ObjectId
 
 router = APIRouter(tags=["projects"])
 
-@router.get("/")
-async def list_projects(db=Depends(get_db)):
-    projects = []
-    cursor = db.projects.find({})
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _after(cursor: Optional[str]) -> Dict[str, Any]:
+    """Projects page by _id; the cursor is the last _id of the previous page"""
+    if not cursor:
+        return {}
+    if not ObjectId.is_valid(cursor):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"_id": {"$gt": ObjectId(cursor)}}
+
+
+async def _ndjson_lines(db, q: Dict[str, Any], limit: Optional[int], batch_size: int) -> AsyncIterator[bytes]:
+    """Yield one chunk per Mongo batch so the export never sits in memory"""
+    cursor = db.projects.find(q, PROJECT_PROJECTION).sort("_id", 1).batch_size(batch_size)
+    if limit:
+        cursor = cursor.limit(limit)
+    lines = []
     async for doc in cursor:
-        projects.append({
-            "_id": str(doc["_id"]),
-            "name": doc["name"],
-            "description": doc.get("description")
-        })
-    return projects
+        lines.append(json.dumps(project_doc_to_json(doc), ensure_ascii=False, separators=(",", ":")))
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+@router.get("/")
+async def list_projects(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description=f"Page size (default {DEFAULT_PAGE_SIZE}, max {MAX_PAGE_SIZE}); unlimited for ndjson"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from a previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    batch_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_db)
+):
+    q = _after(cursor)
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson_lines(db, q, limit, batch_size),
+            media_type="application/x-ndjson",
+        )
+
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
+
+    page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    docs = await db.projects.find(q, PROJECT_PROJECTION).sort("_id", 1).limit(page_size).to_list(length=page_size)
+    headers = {"X-Next-Cursor": str(docs[-1]["_id"])} if len(docs) == page_size else None
 
+    # No API writes projects; entries simply expire after the cache TTL
+    return cache_response(
+        request, key, [project_doc_to_json(doc) for doc in docs],
+        tags=[list_tag("projects")], headers=headers,
+    )
@@ -1,12 +1,27 @@
-﻿from fastapi import APIRouter, HTTPException, Query, Depends
+﻿from fastapi import APIRouter, HTTPException, Query, Depends, Request
 from bson import ObjectId
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
-
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+from pymongo import ReturnDocument
+
+from backend.bulk import bulk_insert, bulk_modify
+from backend.cache import (
+    cache_response, cached_response, invalidate_item, invalidate_items,
+    item_tag, list_tag, request_cache_key
+)
+from backend.config import settings
 from backend.database import get_db
+from backend.pagination import next_cursor
+from backend.repository import get_read_repository
 from backend.schemas import ReviewSchema
+from backend.serialization import review_doc_to_json
+from backend.stats import (
+    REVIEWS_ID, apply_increments, flag, record_review_change,
+    review_change, review_stats
+)
 from backend.deps import get_current_admin
+from backend.writebehind import WriteBehindQueue
 
 router = APIRouter(tags=["reviews"])
 
@@ -25,6 +40,15 @@ class ReviewUpdate(BaseModel):
     comment: Optional[str] = None
     published: Optional[bool] = None
 
+class ReviewBulkAction(BaseModel):
+    action: Literal["publish", "unpublish", "delete"]
+    ids: List[str] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ordered: bool = False  # stop at the first failure, like bulk_write(ordered=True)
+
+class ReviewImport(BaseModel):
+    reviews: List[ReviewCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ordered: bool = False
+
 # ----------------------------
 # Helpers
 # ----------------------------
@@ -34,53 +58,135 @@ def _doc_to_review_out(doc: Dict[str, Any]) -> ReviewSchema:
         name=doc["name"],
         rating=doc["rating"],
         comment=doc["comment"],
-        published=bool(doc.get("published", True)),
+        published=flag(doc, "published"),
         created_at=doc.get("created_at", datetime.now(timezone.utc)),
     )
 
+async def _reviews_written(db, docs: List[Dict[str, Any]]) -> None:
+    # One stats update and one invalidation per write-behind batch
+    await apply_increments(db, REVIEWS_ID, *(review_change(None, doc) for doc in docs))
+    invalidate_item("reviews")
+
+review_queue = WriteBehindQueue(
+    "reviews",
+    batch_size=settings.REVIEW_BATCH_SIZE,
+    max_delay=settings.REVIEW_BATCH_MAX_DELAY_MS / 1000,
+    max_pending=settings.REVIEW_QUEUE_MAX_PENDING,
+    spill_path=settings.REVIEW_QUEUE_SPILL_PATH,
+    on_flush=_reviews_written,
+)
+
 # ----------------------------
 # Routes
 # ----------------------------
 @router.get("/", response_model=List[ReviewSchema])
 async def list_reviews(
+    request: Request,
     published: Optional[bool] = None,
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db=Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor from a previous page"),
+    repo=Depends(get_read_repository)
 ):
-    """Get a list of reviews, optionally filtered by published status"""
+    """Get a list of reviews, optionally filtered by published status.
+
+    The body stays a plain list for existing clients; the cursor for the
+    next page is returned in the ``X-Next-Cursor`` header.
+    """
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
+
     q: Dict[str, Any] = {}
     if published is not None:
         q["published"] = published
 
-    cursor = db.reviews.find(q).sort("created_at", -1).skip(offset).limit(limit)
-    reviews: List[ReviewSchema] = []
-    async for doc in cursor:
-        reviews.append(_doc_to_review_out(doc))
-    
-    return reviews
+    docs = await repo.find_reviews(q, cursor, limit, offset)
+    following = next_cursor(docs, limit)
+    headers = {"X-Next-Cursor": following} if following else None
+
+    return cache_response(
+        request, key, [review_doc_to_json(doc) for doc in docs],
+        tags=[list_tag("reviews")], headers=headers, docs=docs, collection="reviews",
+    )
 
 @router.post("/", response_model=ReviewSchema)
 async def create_review(review: ReviewCreate, db=Depends(get_db)):
     """Create a new review"""
     data = review.dict()
+    # Assigned here so the response needs no read-back, queued or not
+    data["_id"] = ObjectId()
     data["created_at"] = datetime.now(timezone.utc)
 
-    result = await db.reviews.insert_one(data)
-    new_review = await db.reviews.find_one({"_id": result.inserted_id})
-    return _doc_to_review_out(new_review)
+    if review_queue.running:
+        review_queue.submit(data)
+    else:
+        await db.reviews.insert_one(data)
+        await record_review_change(db, after=data)
+        invalidate_item("reviews")
+    return _doc_to_review_out(data)
+
+@router.post("/bulk")
+async def bulk_review_action(
+    body: ReviewBulkAction,
+    db=Depends(get_db),
+    _admin=Depends(get_current_admin)
+):
+    """Publish, unpublish or delete many reviews in one bulk_write (admin only)"""
+    updates = None
+    if body.action != "delete":
+        updates = {"published": body.action == "publish", "updated_at": datetime.now(timezone.utc)}
+
+    outcome, changes = await bulk_modify(db.reviews, body.ids, updates, body.ordered)
+    await apply_increments(db, REVIEWS_ID, *(review_change(b, a) for b, a in changes))
+    invalidate_items("reviews", [str(before["_id"]) for before, _ in changes])
+    return outcome
+
+@router.post("/import")
+async def import_reviews(
+    body: ReviewImport,
+    db=Depends(get_db),
+    _admin=Depends(get_current_admin)
+):
+    """Create many reviews in one bulk_write (admin only)"""
+    now = datetime.now(timezone.utc)
+    docs = [{**review.dict(), "created_at": now} for review in body.reviews]
+
+    outcome, changes = await bulk_insert(db.reviews, docs, body.ordered, _doc_to_review_out)
+    await apply_increments(db, REVIEWS_ID, *(review_change(b, a) for b, a in changes))
+    invalidate_items("reviews")
+    return outcome
+
+@router.get("/stats")
+async def get_review_stats(request: Request, db=Depends(get_db)):
+    """Review counts, average rating and star histogram per published state"""
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
+
+    return cache_response(request, key, await review_stats(db), tags=[list_tag("reviews")])
 
 @router.get("/{review_id}", response_model=ReviewSchema)
-async def get_review(review_id: str, db=Depends(get_db)):
+async def get_review(review_id: str, request: Request, repo=Depends(get_read_repository)):
     """Get a single review by ID"""
     if not ObjectId.is_valid(review_id):
         raise HTTPException(status_code=404, detail="Review not found")
 
-    review = await db.reviews.find_one({"_id": ObjectId(review_id)})
+    key = request_cache_key(request)
+    hit = cached_response(request, key)
+    if hit is not None:
+        return hit
+
+    review = await repo.get_review(ObjectId(review_id))
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
-    
-    return _doc_to_review_out(review)
+
+    return cache_response(
+        request, key, review_doc_to_json(review),
+        tags=[item_tag("reviews", review_id)], docs=[review],
+    )
 
 @router.put("/{review_id}", response_model=ReviewSchema)
 async def update_review(
@@ -93,16 +199,25 @@ async def update_review(
     if not ObjectId.is_valid(review_id):
         raise HTTPException(status_code=404, detail="Review not found")
 
-    updates = review.dict(exclude_unset=True)
-    if updates:
-        result = await db.reviews.update_one(
-            {"_id": ObjectId(review_id)},
-            {"$set": updates}
-        )
-        if result.matched_count == 0:
+    updates = {k: v for k, v in review.dict(exclude_unset=True).items() if v is not None}
+    if not updates:
+        current = await db.reviews.find_one({"_id": ObjectId(review_id)})
+        if not current:
             raise HTTPException(status_code=404, detail="Review not found")
-
-    updated = await db.reviews.find_one({"_id": ObjectId(review_id)})
+        return _doc_to_review_out(current)
+
+    updates["updated_at"] = datetime.now(timezone.utc)
+    # The previous version feeds the stats delta; the new one is derived locally
+    before = await db.reviews.find_one_and_update(
+        {"_id": ObjectId(review_id)},
+        {"$set": updates},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if not before:
+        raise HTTPException(status_code=404, detail="Review not found")
+    updated = {**before, **updates}
+    await record_review_change(db, before, updated)
+    invalidate_item("reviews", review_id)
     return _doc_to_review_out(updated)
 
 @router.delete("/{review_id}")
@@ -115,8 +230,10 @@ async def delete_review(
     if not ObjectId.is_valid(review_id):
         raise HTTPException(status_code=404, detail="Review not found")
 
-    result = await db.reviews.delete_one({"_id": ObjectId(review_id)})
-    if result.deleted_count == 0:
+    deleted = await db.reviews.find_one_and_delete({"_id": ObjectId(review_id)})
+    if not deleted:
         raise HTTPException(status_code=404, detail="Review not found")
+    await record_review_change(db, before=deleted)
+    invalidate_item("reviews", review_id)
 
     return {"message": "Review deleted successfully"}
@@ -0,0 +1,68 @@
+# backend/routers/system.py
+from fastapi import APIRouter, Depends
+
+from backend.admission import admission, public_write_buckets
+from backend.cache import response_cache
+from backend.coherence import invalidation_bus
+from backend.config import settings
+from backend.deps import admin_principal_cache, get_current_admin
+from backend.hashing import password_hasher
+from backend.repository import read_snapshot
+from backend.routers.reviews import review_queue
+from backend.search import portfolio_search
+from backend.startup import phase_timings
+
+# Internal state of this worker (queues, caches, versions, the snapshot):
+# admins only. The counters are also scraped from /metrics.
+router = APIRouter(tags=["system"], dependencies=[Depends(get_current_admin)])
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters of the in-process response cache"""
+    return {"responses": response_cache.stats(), "admins": admin_principal_cache.stats()}
+
+
+@router.get("/hashing/stats")
+async def hashing_stats():
+    """Queue depth, rejections and latency of the bcrypt worker pool"""
+    return password_hasher.stats()
+
+
+@router.get("/search/stats")
+async def search_stats():
+    """Size of the in-memory portfolio search index"""
+    return portfolio_search.stats()
+
+
+@router.get("/invalidation/stats")
+async def invalidation_stats():
+    """Versions seen and published by this worker's invalidation bus"""
+    return invalidation_bus.stats()
+
+
+@router.get("/startup/stats")
+async def startup_stats():
+    """Milliseconds spent in each start-up phase of this worker"""
+    return phase_timings
+
+
+@router.get("/reviews/queue/stats")
+async def review_queue_stats():
+    """Depth, batching and rejections of the review write-behind queue"""
+    return review_queue.stats()
+
+
+@router.get("/admission/stats")
+async def admission_stats():
+    """Live slots, queue depths and rejections per route group"""
+    return {**admission.stats(), "public_write_rate_limit": public_write_buckets.stats()}
+
+
+@router.get("/storage/stats")
+async def storage_stats():
+    """Which backend public reads use, and the state of the SQLite snapshot"""
+    return {
+        "read_backend": settings.READ_BACKEND,
+        "snapshot": read_snapshot.stats() if read_snapshot is not None else None,
+    }
@@ -1,10 +1,12 @@
 ﻿# backend/schemas.py
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 from bson import ObjectId
 from pydantic_core import core_schema
 
+from backend.config import settings
+
 # ----------------------------
 # ObjectId Handling
 # ----------------------------
@@ -14,7 +16,7 @@ class PyObjectId(ObjectId):
         yield cls.validate
 
     @classmethod
-    def validate(cls, v):
+    def validate(cls, v, _handler=None):
         if not ObjectId.is_valid(v):
             raise ValueError("Invalid objectid")
         return ObjectId(v)
@@ -83,7 +85,7 @@ class PortfolioBase(BaseModel):
 
 class PortfolioCreate(PortfolioBase):
     """Schema for creating a portfolio item"""
-    pass
+    category: Optional[str] = None  # the create form's category field
 
 
 class PortfolioUpdate(BaseModel):
@@ -100,9 +102,21 @@ class PortfolioUpdate(BaseModel):
     )
 
 
+class PortfolioBulkAction(BaseModel):
+    action: Literal["activate", "deactivate", "feature", "unfeature", "delete"]
+    ids: List[str] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ordered: bool = False  # stop at the first failure, like bulk_write(ordered=True)
+
+
+class PortfolioImport(BaseModel):
+    items: List[PortfolioCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ordered: bool = False
+
+
 class PortfolioOut(PortfolioBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     created_at: datetime
+    image_variants: Dict[str, str] = {}  # width in px -> URL of a smaller WebP copy
 
     model_config = ConfigDict(
         json_encoders={ObjectId: str},
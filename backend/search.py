@@ -0,0 +1,273 @@
+# backend/search.py
+import asyncio
+import logging
+import math
+import re
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure, PyMongoError
+
+from backend.config import settings
+from backend.stats import flag, flag_query
+
+logger = logging.getLogger(__name__)
+
+# Field weights, shared by the Mongo text index (backend/indexes.py) and the
+# in-memory index so both engines rank alike
+SEARCH_WEIGHTS: Dict[str, int] = {"title": 10, "tags": 5, "category": 3, "description": 1}
+SEARCH_PROJECTION = {field: 1 for field in (*SEARCH_WEIGHTS, "is_active", "is_featured", "created_at")}
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to with".split()
+)
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: Any) -> List[str]:
+    if not text:
+        return []
+    if isinstance(text, (list, tuple)):
+        return [token for part in text for token in tokenize(part)]
+    return [t for t in _TOKEN.findall(str(text).lower()) if t not in STOP_WORDS]
+
+
+# ----------------------------
+# In-memory inverted index
+# ----------------------------
+class InvertedIndex:
+    """Term -> {item id: weighted term frequency}, kept in step with writes.
+
+    Terms are also held in a sorted list so prefix queries are a bisect plus
+    a short scan. Scoring is weighted tf * idf summed over the query terms;
+    for a prefix, the best matching completion of each term counts.
+    Everything runs on the event loop, so no locking is needed.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms: List[str] = []
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        # item id -> (created_at timestamp, is_active, is_featured)
+        self._meta: Dict[str, Tuple[float, bool, bool]] = {}
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def add(self, doc: Mapping[str, Any]) -> None:
+        item_id = str(doc["_id"])
+        self.remove(item_id)
+        weights: Dict[str, float] = {}
+        for field, weight in SEARCH_WEIGHTS.items():
+            for term in tokenize(doc.get(field)):
+                weights[term] = weights.get(term, 0.0) + weight
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[item_id] = weight
+        created_at = doc.get("created_at")
+        self._doc_terms[item_id] = tuple(weights)
+        self._meta[item_id] = (
+            created_at.timestamp() if isinstance(created_at, datetime) else 0.0,
+            flag(doc, "is_active"),
+            flag(doc, "is_featured"),
+        )
+
+    def remove(self, item_id: str) -> None:
+        for term in self._doc_terms.pop(item_id, ()):
+            postings = self._postings[term]
+            postings.pop(item_id, None)
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+        self._meta.pop(item_id, None)
+
+    def _expand(self, term: str, prefix: bool) -> Iterable[str]:
+        if not prefix:
+            return (term,) if term in self._postings else ()
+        start = bisect_left(self._terms, term)
+        matches = []
+        for candidate in self._terms[start:]:
+            if not candidate.startswith(term):
+                break
+            matches.append(candidate)
+        return matches
+
+    def search(self, query: str, prefix: bool = False,
+               filters: Optional[Mapping[str, bool]] = None) -> List[Tuple[str, float]]:
+        """(item id, score) pairs, best first, newest first among equal scores"""
+        n = len(self._meta) or 1
+        scores: Dict[str, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            best: Dict[str, float] = {}
+            for candidate in self._expand(term, prefix):
+                postings = self._postings[candidate]
+                idf = math.log(1 + n / len(postings))
+                for item_id, weight in postings.items():
+                    score = weight * idf
+                    if score > best.get(item_id, 0.0):
+                        best[item_id] = score
+            for item_id, score in best.items():
+                scores[item_id] = scores.get(item_id, 0.0) + score
+
+        filters = filters or {}
+        wanted = [
+            item_id for item_id in scores
+            if filters.get("is_active", self._meta[item_id][1]) == self._meta[item_id][1]
+            and filters.get("is_featured", self._meta[item_id][2]) == self._meta[item_id][2]
+        ]
+        wanted.sort(key=lambda item_id: (scores[item_id], self._meta[item_id][0], item_id), reverse=True)
+        return [(item_id, round(scores[item_id], 4)) for item_id in wanted]
+
+
+class PortfolioSearchIndex:
+    """Lazily built InvertedIndex over the portfolio collection.
+
+    It is built on the first query that needs it; routers report every
+    write through ``apply`` so it never has to be rebuilt. Writes seen
+    while a build is running are replayed once it finishes.
+    """
+
+    def __init__(self):
+        self.index: Optional[InvertedIndex] = None
+        self.built_at: Optional[float] = None
+        self._building: Optional[asyncio.Future] = None
+        self._pending: List[Tuple[Optional[Mapping[str, Any]], Optional[Mapping[str, Any]]]] = []
+        # Bumped by reset(), so a build that started before it is not kept
+        self._generation = 0
+
+    async def get(self, db) -> InvertedIndex:
+        if self.index is not None:
+            return self.index
+        if self._building is None:
+            self._building = asyncio.ensure_future(self._build(db))
+        try:
+            return await asyncio.shield(self._building)
+        finally:
+            if self._building is not None and self._building.done():
+                self._building = None
+
+    async def _build(self, db) -> InvertedIndex:
+        started = time.perf_counter()
+        generation = self._generation
+        index = InvertedIndex()
+        async for doc in db.portfolio.find({}, SEARCH_PROJECTION).batch_size(1000):
+            index.add(doc)
+        for before, after in self._pending:
+            self._apply(index, before, after)
+        self._pending = []
+        if generation != self._generation:
+            return index
+        self.index = index
+        self.built_at = time.time()
+        logger.info("Built portfolio search index: %d items in %.2fs", len(index), time.perf_counter() - started)
+        return index
+
+    @staticmethod
+    def _apply(index: InvertedIndex, before, after) -> None:
+        if after is not None:
+            index.add(after)
+        elif before is not None:
+            index.remove(str(before["_id"]))
+
+    def apply(self, before: Optional[Mapping[str, Any]] = None, after: Optional[Mapping[str, Any]] = None) -> None:
+        """Reflect one created, updated or deleted item"""
+        if self.index is not None:
+            self._apply(self.index, before, after)
+        elif self._building is not None:
+            self._pending.append((before, after))
+
+    def reset(self) -> None:
+        """Drop the index; the next memory search rebuilds it"""
+        self._generation += 1
+        self.index = None
+        self.built_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built": self.index is not None,
+            "items": len(self.index) if self.index is not None else 0,
+            "terms": len(self.index._terms) if self.index is not None else 0,
+            "built_at": self.built_at,
+        }
+
+
+portfolio_search = PortfolioSearchIndex()
+
+
+# ----------------------------
+# Engine selection
+# ----------------------------
+_TEXT_INDEX_CHECK_SECONDS = 60.0
+_text_index: Dict[str, Any] = {"available": None, "checked_at": 0.0}
+
+
+async def text_index_available(db) -> bool:
+    """Whether portfolio has a text index; re-checked once a minute"""
+    if time.monotonic() - _text_index["checked_at"] < _TEXT_INDEX_CHECK_SECONDS:
+        return bool(_text_index["available"])
+    try:
+        info = await db.portfolio.index_information()
+        available = any(
+            any(value == "text" for _field, value in spec["key"]) for spec in info.values()
+        )
+    except PyMongoError:
+        available = False
+    _text_index.update(available=available, checked_at=time.monotonic())
+    return available
+
+
+def _forget_text_index() -> None:
+    _text_index.update(available=False, checked_at=time.monotonic())
+
+
+async def _text_search(db, query: str, q: Dict[str, Any], limit: int, offset: int):
+    text_q = {"$text": {"$search": query}, **flag_query(q)}
+    total = await db.portfolio.count_documents(text_q)
+    docs = await (
+        db.portfolio.find(text_q, {"score": {"$meta": "textScore"}})
+        .sort([("score", {"$meta": "textScore"}), ("created_at", -1), ("_id", -1)])
+        .skip(offset)
+        .limit(limit)
+        .to_list(length=limit)
+    )
+    return total, [(doc, round(float(doc.pop("score")), 4)) for doc in docs]
+
+
+async def _memory_search(db, query: str, q: Dict[str, Any], prefix: bool, limit: int, offset: int):
+    index = await portfolio_search.get(db)
+    ranked = index.search(query, prefix=prefix, filters=q)
+    page = ranked[offset:offset + limit]
+    if not page:
+        return len(ranked), []
+    docs = await db.portfolio.find({"_id": {"$in": [ObjectId(item_id) for item_id, _ in page]}}).to_list(length=limit)
+    by_id = {str(doc["_id"]): doc for doc in docs}
+    # An item deleted by another worker may still be indexed here; skip it
+    return len(ranked), [(by_id[item_id], score) for item_id, score in page if item_id in by_id]
+
+
+async def search_portfolio(db, query: str, q: Dict[str, Any], prefix: bool,
+                           limit: int, offset: int) -> Tuple[str, int, List[Tuple[Dict[str, Any], float]]]:
+    """(engine, total, [(doc, score)]) for one page of ranked matches.
+
+    Mongo's text index is used when present, except for prefix queries,
+    which $text cannot answer. SEARCH_ENGINE=memory|text forces one engine.
+    """
+    engine = settings.SEARCH_ENGINE
+    if engine == "auto":
+        engine = "memory" if prefix or not await text_index_available(db) else "text"
+    if engine == "text":
+        try:
+            return ("text", *await _text_search(db, query, q, limit, offset))
+        except OperationFailure as e:
+            if settings.SEARCH_ENGINE == "text":
+                raise
+            # The index was dropped since we last looked
+            logger.warning("Text search failed, using the in-memory index: %s", e)
+            _forget_text_index()
+    return ("memory", *await _memory_search(db, query, q, prefix, limit, offset))
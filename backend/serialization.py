@@ -0,0 +1,97 @@
+# backend/serialization.py
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from backend.stats import flag
+
+# ----------------------------
+# Fast path for read endpoints
+# ----------------------------
+# The builders below produce exactly what PortfolioOut / ReviewSchema dump to
+# with by_alias=True (same keys, order and value formats) straight from the
+# Mongo document, skipping model construction and PyObjectId re-validation.
+# Write endpoints keep returning the models through response_model.
+
+
+def isoformat(value: datetime) -> str:
+    """datetime in pydantic's JSON format: ISO 8601 with "Z" for UTC"""
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _created_at(doc: Mapping[str, Any]) -> str:
+    value = doc.get("created_at")
+    if not isinstance(value, datetime):
+        value = datetime.now(timezone.utc)
+    return isoformat(value)
+
+
+# Fields the builders below read, as Mongo projections
+PORTFOLIO_PROJECTION = {field: 1 for field in (
+    "title", "description", "image_url", "link", "tags", "is_featured", "is_active", "created_at", "image_variants",
+)}
+REVIEW_PROJECTION = {field: 1 for field in ("name", "rating", "comment", "published", "created_at")}
+PROJECT_PROJECTION = {"name": 1, "description": 1}
+
+
+def portfolio_doc_to_json(doc: Mapping[str, Any]) -> Dict[str, Any]:
+    """JSON-ready twin of routers.portfolio._doc_to_portfolio_out"""
+    return {
+        "title": doc["title"],
+        "description": doc.get("description"),
+        "image": doc.get("image_url"),
+        "link": doc.get("link"),
+        "tags": list(doc.get("tags") or []),
+        "is_featured": flag(doc, "is_featured"),
+        "is_active": flag(doc, "is_active"),
+        "_id": str(doc["_id"]),
+        "created_at": _created_at(doc),
+        "image_variants": dict(doc.get("image_variants") or {}),
+    }
+
+
+def review_doc_to_json(doc: Mapping[str, Any]) -> Dict[str, Any]:
+    """JSON-ready twin of routers.reviews._doc_to_review_out"""
+    return {
+        "_id": str(doc["_id"]),
+        "name": doc["name"],
+        "rating": float(doc["rating"]),
+        "message": doc["comment"],
+        "published": flag(doc, "published"),
+        "created_at": _created_at(doc),
+    }
+
+
+def project_doc_to_json(doc: Mapping[str, Any]) -> Dict[str, Any]:
+    return {
+        "_id": str(doc["_id"]),
+        "name": doc["name"],
+        "description": doc.get("description")
+    }
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return isoformat(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(
+    ensure_ascii=False,
+    allow_nan=False,
+    separators=(",", ":"),
+    default=_default,
+)
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode to the same bytes FastAPI's JSONResponse would produce"""
+    return _encoder.encode(payload).encode("utf-8")
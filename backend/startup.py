@@ -0,0 +1,109 @@
+# backend/startup.py
+"""Where worker start-up time goes.
+
+    python -m backend.startup [--top 20] [--lifespan]
+
+Imports backend.main in a fresh interpreter with ``python -X importtime``
+and reports import time per backend module and per third-party package.
+It then reports the timed start-up phases: create_app() and, with
+--lifespan, each lifespan step against the configured database. A running
+worker reports its own phases at /api/v1/startup/stats.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Dict, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# phase -> milliseconds, in the order the phases finished
+phase_timings: Dict[str, float] = {}
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase_timings[phase] = round((time.perf_counter() - started) * 1000, 3)
+
+
+async def timed_step(phase: str, step: Awaitable[T]) -> T:
+    with timed(phase):
+        return await step
+
+
+# ----------------------------
+# Import profile
+# ----------------------------
+def import_profile(module: str = "backend.main") -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every import ``module`` triggers"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            rows.append((name, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def summarize_imports(rows: List[Tuple[str, int, int]]) -> Tuple[int, Dict[str, Tuple[int, int]], Dict[str, int]]:
+    """Total µs, {backend module: (self, cumulative)} and {package: self µs summed}"""
+    total = sum(self_us for _name, self_us, _cumulative in rows)
+    modules: Dict[str, Tuple[int, int]] = {}
+    packages: Dict[str, int] = {}
+    for name, self_us, cumulative_us in rows:
+        if name.startswith("backend"):
+            modules[name] = (self_us, cumulative_us)
+        else:
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0) + self_us
+    return total, modules, packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    parser.add_argument("--lifespan", action="store_true", help="also run the lifespan (connects to MongoDB)")
+    args = parser.parse_args()
+
+    total, modules, packages = summarize_imports(import_profile())
+    print(f"import backend.main: {total / 1000:.1f} ms\n")
+    print(f"{'backend module':<32} {'self ms':>9} {'cumulative ms':>14}")
+    for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"{name:<32} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+    print(f"\n{'package':<32} {'self ms':>9}")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<32} {self_us / 1000:>9.1f}")
+
+    from backend.main import app
+    # Run as __main__, this file is a separate module from the backend.startup
+    # that main.py records into
+    from backend.startup import phase_timings as timings
+
+    if args.lifespan:
+        async def run_lifespan():
+            async with app.router.lifespan_context(app):
+                pass
+        asyncio.run(run_lifespan())
+
+    print(f"\n{'phase':<32} {'ms':>9}")
+    for phase, ms in timings.items():
+        print(f"{phase:<32} {ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
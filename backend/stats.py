@@ -0,0 +1,270 @@
+# backend/stats.py
+import asyncio
+import logging
+import math
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Layout of the "stats" collection
+# ----------------------------
+# {_id: "reviews", published: {count, rating_sum, histogram: {"1".."5": n}},
+#                  unpublished: {...same...}}
+# {_id: "portfolio", flags: {active_featured, active_regular,
+#                            inactive_featured, inactive_regular}}
+#
+# Mutators $inc the difference between a document's before and after
+# state, so reads are a single find_one by _id.
+REVIEWS_ID = "reviews"
+PORTFOLIO_ID = "portfolio"
+STARS = ("1", "2", "3", "4", "5")
+
+REBUILD_RETRY_SECONDS = 5.0
+MAX_REBUILD_RETRY_SECONDS = 300.0
+
+# Failed $inc updates and the rebuilds they scheduled, exported on /metrics
+stats_repair: Dict[str, int] = {"failed_increments": 0, "rebuilds": 0, "rebuild_failures": 0, "pending": 0}
+_rebuild_task: Optional[asyncio.Future] = None
+
+
+def star_bucket(rating: Any) -> str:
+    """Whole-star histogram bucket; half stars round down, clamped to 1..5"""
+    return str(min(5, max(1, int(math.floor(float(rating))))))
+
+
+# ----------------------------
+# Flags
+# ----------------------------
+# The boolean flags and what a missing or null value stands for. Legacy
+# documents predate the fields, so only the explicit opposite of the
+# default counts; the stats, facets, listings and the read snapshot all
+# read flags through flag() and flag_query() so they agree on such items.
+FLAG_DEFAULTS: Dict[str, bool] = {"published": True, "is_active": True, "is_featured": False}
+
+
+def flag(doc: Mapping[str, Any], field: str) -> bool:
+    if FLAG_DEFAULTS[field]:
+        return doc.get(field) is not False
+    return doc.get(field) is True
+
+
+def flag_expr(field: str) -> Dict[str, Any]:
+    """flag() as an aggregation expression"""
+    default = FLAG_DEFAULTS[field]
+    value = {"$ifNull": [f"${field}", default]}
+    if default:
+        return {"$ne": [value, False]}
+    return {"$eq": [value, True]}
+
+
+def flag_query(q: Mapping[str, Any]) -> Dict[str, Any]:
+    """``q`` as a MongoDB filter, with each flag condition matching like flag()"""
+    return {
+        field: {"$ne": not value} if field in FLAG_DEFAULTS and value is FLAG_DEFAULTS[field] else value
+        for field, value in q.items()
+    }
+
+
+def review_state(doc: Mapping[str, Any]) -> str:
+    return "published" if flag(doc, "published") else "unpublished"
+
+
+def flags_key(is_active: bool, is_featured: bool) -> str:
+    return f"{'active' if is_active else 'inactive'}_{'featured' if is_featured else 'regular'}"
+
+
+def _review_delta(doc: Mapping[str, Any], sign: int) -> Dict[str, float]:
+    state = review_state(doc)
+    return {
+        f"{state}.count": sign,
+        f"{state}.rating_sum": sign * float(doc["rating"]),
+        f"{state}.histogram.{star_bucket(doc['rating'])}": sign,
+    }
+
+
+def _portfolio_delta(doc: Mapping[str, Any], sign: int) -> Dict[str, float]:
+    key = flags_key(flag(doc, "is_active"), flag(doc, "is_featured"))
+    return {f"flags.{key}": sign}
+
+
+def _merge(deltas: Iterable[Dict[str, float]]) -> Dict[str, float]:
+    merged: Dict[str, float] = {}
+    for delta in deltas:
+        for field, amount in delta.items():
+            merged[field] = merged.get(field, 0) + amount
+    return {field: amount for field, amount in merged.items() if amount}
+
+
+# ----------------------------
+# Incremental maintenance
+# ----------------------------
+def review_change(before: Optional[Mapping[str, Any]], after: Optional[Mapping[str, Any]]) -> Dict[str, float]:
+    """$inc document moving the review stats from ``before`` to ``after``"""
+    deltas = []
+    if before is not None:
+        deltas.append(_review_delta(before, -1))
+    if after is not None:
+        deltas.append(_review_delta(after, 1))
+    return _merge(deltas)
+
+
+def portfolio_change(before: Optional[Mapping[str, Any]], after: Optional[Mapping[str, Any]]) -> Dict[str, float]:
+    deltas = []
+    if before is not None:
+        deltas.append(_portfolio_delta(before, -1))
+    if after is not None:
+        deltas.append(_portfolio_delta(after, 1))
+    return _merge(deltas)
+
+
+async def apply_increments(db, stats_id: str, *increments: Dict[str, float]) -> None:
+    """Apply one or more change sets in a single update.
+
+    Callers have already written the documents, so a failure here is not
+    the request's failure: it is logged and the counts are rebuilt in the
+    background, instead of staying off until someone rebuilds them by hand.
+    """
+    inc = _merge(increments)
+    if not inc:
+        return
+    try:
+        await db.stats.update_one({"_id": stats_id}, {"$inc": inc}, upsert=True)
+    except PyMongoError as e:
+        stats_repair["failed_increments"] += 1
+        logger.error("Could not update %s stats, scheduling a rebuild: %s", stats_id, e)
+        schedule_rebuild(db)
+
+
+def schedule_rebuild(db) -> None:
+    """Rebuild both stats documents in the background, retrying until it works"""
+    global _rebuild_task
+    if _rebuild_task is None or _rebuild_task.done():
+        _rebuild_task = asyncio.ensure_future(_rebuild_until_done(db))
+
+
+async def _rebuild_until_done(db) -> None:
+    stats_repair["pending"] = 1
+    delay = REBUILD_RETRY_SECONDS
+    while True:
+        try:
+            await rebuild_stats(db)
+            break
+        except PyMongoError as e:
+            stats_repair["rebuild_failures"] += 1
+            logger.error("Stats rebuild failed, retrying in %.0fs: %s", delay, e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_REBUILD_RETRY_SECONDS)
+    stats_repair["rebuilds"] += 1
+    stats_repair["pending"] = 0
+    logger.info("Stats rebuilt after a failed update")
+
+
+async def record_review_change(db, before=None, after=None) -> None:
+    await apply_increments(db, REVIEWS_ID, review_change(before, after))
+
+
+async def record_portfolio_change(db, before=None, after=None) -> None:
+    await apply_increments(db, PORTFOLIO_ID, portfolio_change(before, after))
+
+
+# ----------------------------
+# Reads
+# ----------------------------
+def _state_summary(state: Mapping[str, Any]) -> Dict[str, Any]:
+    count = int(state.get("count", 0))
+    rating_sum = float(state.get("rating_sum", 0))
+    histogram = state.get("histogram", {})
+    return {
+        "count": count,
+        "average_rating": round(rating_sum / count, 2) if count else None,
+        "histogram": {star: int(histogram.get(star, 0)) for star in STARS},
+    }
+
+
+async def review_stats(db) -> Dict[str, Any]:
+    doc = await db.stats.find_one({"_id": REVIEWS_ID}) or {}
+    published = _state_summary(doc.get("published", {}))
+    unpublished = _state_summary(doc.get("unpublished", {}))
+    return {
+        "total": published["count"] + unpublished["count"],
+        "published": published,
+        "unpublished": unpublished,
+    }
+
+
+async def portfolio_total(db, q: Dict[str, Any]) -> int:
+    """Number of portfolio items matching ``q``.
+
+    Filters on is_active/is_featured only are answered from the stats
+    document; anything else, or a missing document, falls back to counting.
+    """
+    if set(q) <= {"is_active", "is_featured"}:
+        doc = await db.stats.find_one({"_id": PORTFOLIO_ID})
+        if doc is not None:
+            flags = doc.get("flags", {})
+            return sum(
+                int(flags.get(flags_key(active, featured), 0))
+                for active in (True, False)
+                for featured in (True, False)
+                if q.get("is_active", active) == active and q.get("is_featured", featured) == featured
+            )
+    return await db.portfolio.count_documents(flag_query(q))
+
+
+# ----------------------------
+# Full rebuild
+# ----------------------------
+async def rebuild_stats(db) -> None:
+    """Recompute both stats documents from scratch with aggregations"""
+    reviews: Dict[str, Any] = {"_id": REVIEWS_ID}
+    async for row in db.reviews.aggregate([
+        {"$group": {
+            "_id": {"published": flag_expr("published"), "stars": {"$floor": "$rating"}},
+            "count": {"$sum": 1},
+            "rating_sum": {"$sum": "$rating"},
+        }},
+    ]):
+        state = reviews.setdefault(
+            "published" if row["_id"]["published"] else "unpublished",
+            {"count": 0, "rating_sum": 0.0, "histogram": {}},
+        )
+        bucket = star_bucket(row["_id"]["stars"])
+        state["count"] += row["count"]
+        state["rating_sum"] += float(row["rating_sum"])
+        state["histogram"][bucket] = state["histogram"].get(bucket, 0) + row["count"]
+
+    portfolio: Dict[str, Any] = {"_id": PORTFOLIO_ID, "flags": {}}
+    async for row in db.portfolio.aggregate([
+        {"$group": {
+            "_id": {
+                "active": flag_expr("is_active"),
+                "featured": flag_expr("is_featured"),
+            },
+            "count": {"$sum": 1},
+        }},
+    ]):
+        portfolio["flags"][flags_key(row["_id"]["active"], row["_id"]["featured"])] = row["count"]
+
+    await db.stats.replace_one({"_id": REVIEWS_ID}, reviews, upsert=True)
+    await db.stats.replace_one({"_id": PORTFOLIO_ID}, portfolio, upsert=True)
+
+
+async def ensure_stats(db) -> None:
+    """Lifespan hook: build the stats documents the first time they are needed"""
+    try:
+        existing = await db.stats.count_documents({"_id": {"$in": [REVIEWS_ID, PORTFOLIO_ID]}})
+        if existing < 2:
+            logger.info("Building review and portfolio stats")
+            await rebuild_stats(db)
+    except PyMongoError as e:
+        logger.error("Could not build stats: %s", e)
+
+
+if __name__ == "__main__":
+    from backend.database import get_db
+
+    asyncio.run(rebuild_stats(get_db()))
+    print("✅ Stats rebuilt")
@@ -0,0 +1,241 @@
+# backend/uploads.py
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+import tempfile
+from typing import BinaryIO, List, Optional, Tuple
+
+import anyio
+from fastapi import HTTPException, UploadFile
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: gzip sidecars only
+    brotli = None
+
+from backend.config import settings
+
+CHUNK_SIZE = 1024 * 1024
+# Multipart framing and the other form fields on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+_SAFE_EXTENSION = re.compile(r"^\.[a-z0-9]{1,8}$")
+# <sha256>.<ext> from save_upload and <sha256>_w<width>.webp from backend.images:
+# the name changes whenever the bytes do, so these can be cached forever
+_CONTENT_ADDRESSED = re.compile(r"^[0-9a-f]{64}(_w\d+)?\.[a-z0-9]{1,8}$")
+# Types worth compressing; JPEG/PNG/WebP are compressed already
+COMPRESSIBLE = frozenset({".svg", ".txt", ".json", ".csv", ".xml"})
+# (Content-Encoding, sidecar suffix) in order of preference
+SIDECARS: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+
+def asset_url(filename: str) -> str:
+    """Public URL of an uploaded file, on ASSET_BASE_URL (e.g. a CDN origin)"""
+    return f"{settings.ASSET_BASE_URL.rstrip('/')}/uploads/{filename}"
+
+
+def _extension(upload: UploadFile) -> str:
+    """File extension from the client filename, else the content type.
+
+    Only the extension of the client-supplied name is kept, so it can never
+    pick the path or overwrite another upload.
+    """
+    ext = os.path.splitext(upload.filename or "")[1].lower()
+    if not _SAFE_EXTENSION.match(ext):
+        ext = mimetypes.guess_extension(upload.content_type or "") or ""
+    if ext == ".jpe":
+        ext = ".jpg"
+    return ext if _SAFE_EXTENSION.match(ext) else ""
+
+
+def _write_chunk(out: BinaryIO, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def _commit(tmp_path: str, final_path: str) -> None:
+    if os.path.exists(final_path):
+        # Same bytes already stored: keep the existing file
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, final_path)
+
+
+def write_sidecars(path: str) -> List[str]:
+    """Write .br/.gz copies of ``path`` next to it, where they save bytes"""
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE:
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    encoders = {"gzip": lambda raw: gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoders["br"] = lambda raw: brotli.compress(raw, quality=11)
+    written = []
+    for encoding, suffix in SIDECARS:
+        if encoding not in encoders or os.path.exists(path + suffix):
+            continue
+        compressed = encoders[encoding](data)
+        if len(compressed) < len(data):
+            tmp_path = f"{path}{suffix}.part"
+            with open(tmp_path, "wb") as out:
+                out.write(compressed)
+            os.replace(tmp_path, path + suffix)
+            written.append(path + suffix)
+    return written
+
+
+def _discard(tmp_path: str) -> None:
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(upload: UploadFile, max_bytes: Optional[int] = None) -> str:
+    """Stream ``upload`` into UPLOAD_DIR under its content hash.
+
+    Chunks are hashed and written in the threadpool so the event loop never
+    blocks on disk I/O, and the size limit is enforced as the bytes arrive.
+    Returns the stored filename, ``<sha256><ext>``.
+    """
+    max_bytes = settings.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    fd, tmp_path = await run_in_threadpool(
+        tempfile.mkstemp, dir=settings.UPLOAD_DIR, suffix=".part"
+    )
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Image exceeds the {max_bytes} byte upload limit",
+                    )
+                await run_in_threadpool(_write_chunk, out, digest, chunk)
+
+        filename = digest.hexdigest() + _extension(upload)
+        final_path = os.path.join(settings.UPLOAD_DIR, filename)
+        await run_in_threadpool(_commit, tmp_path, final_path)
+        await run_in_threadpool(write_sidecars, final_path)
+        return filename
+    except BaseException:
+        await run_in_threadpool(_discard, tmp_path)
+        raise
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized upload requests from their Content-Length.
+
+    The multipart parser spools the body before the route runs, so this
+    turns obviously oversized requests away before any of it is read;
+    save_upload still enforces the exact per-file limit.
+    """
+
+    def __init__(self, app, max_bytes: Optional[int] = None):
+        self.app = app
+        self.max_bytes = settings.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] in ("POST", "PUT"):
+            headers = dict(scope["headers"])
+            content_type = headers.get(b"content-type", b"")
+            length = headers.get(b"content-length")
+            if (
+                content_type.startswith(b"multipart/form-data")
+                and length is not None
+                and length.isdigit()
+                and int(length) > self.max_bytes + MULTIPART_OVERHEAD
+            ):
+                await send({
+                    "type": "http.response.start",
+                    "status": 413,
+                    "headers": [(b"content-type", b"application/json"), (b"connection", b"close")],
+                })
+                await send({
+                    "type": "http.response.body",
+                    "body": b'{"detail":"Request body too large"}',
+                })
+                return
+        await self.app(scope, receive, send)
+
+
+# ----------------------------
+# Serving
+# ----------------------------
+def _accepted_encodings(scope) -> List[str]:
+    header = Headers(scope=scope).get("accept-encoding", "")
+    accepted = []
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        try:
+            q = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            q = 1.0
+        if q > 0:
+            accepted.append(coding.strip().lower())
+    return accepted
+
+
+class UploadFiles(StaticFiles):
+    """StaticFiles for UPLOAD_DIR with CDN-friendly caching.
+
+    Content-addressed names get a far-future ``immutable`` Cache-Control;
+    anything else (files stored before uploads were hashed) must be
+    revalidated. A .br or .gz sidecar is sent instead of the file when the
+    client accepts that encoding.
+    """
+
+    async def get_response(self, path: str, scope) -> Response:
+        name = os.path.basename(path)
+        if name.endswith(".part"):
+            raise HTTPException(status_code=404)   # upload still being written
+
+        response = None
+        compressible = os.path.splitext(name)[1].lower() in COMPRESSIBLE
+        if compressible and scope["method"] in ("GET", "HEAD"):
+            accepted = _accepted_encodings(scope)
+            for encoding, suffix in SIDECARS:
+                if encoding not in accepted:
+                    continue
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+                if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                    response = self.file_response(full_path, stat_result, scope)
+                    response.headers["content-type"] = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                    response.headers["content-encoding"] = encoding
+                    break
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if compressible:
+            response.headers["vary"] = "Accept-Encoding"
+        if _CONTENT_ADDRESSED.match(name):
+            response.headers["cache-control"] = f"public, max-age={settings.ASSET_MAX_AGE_SECONDS}, immutable"
+        else:
+            response.headers["cache-control"] = "public, no-cache"
+        return response
+
+
+def precompress_directory(directory: str) -> int:
+    """Write missing sidecars for every compressible file in ``directory``"""
+    written = 0
+    for entry in os.scandir(directory):
+        if entry.is_file() and not entry.name.endswith((".part", ".br", ".gz")):
+            written += len(write_sidecars(entry.path))
+    return written
+
+
+if __name__ == "__main__":
+    print(f"✅ {precompress_directory(settings.UPLOAD_DIR)} sidecars written")
@@ -0,0 +1,237 @@
+# backend/writebehind.py
+import asyncio
+import glob
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bson import json_util
+from fastapi import HTTPException, status
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+MIN_RETRY_SECONDS = 0.5
+MAX_RETRY_SECONDS = 30.0
+
+OnFlush = Callable[[Any, List[Dict[str, Any]]], Awaitable[None]]
+
+
+class WriteBehindQueue:
+    """Accept documents now, insert them later in insert_many batches.
+
+    Callers build complete documents (including ``_id``) and get control back
+    immediately. A single writer task drains the queue in batches of up to
+    ``batch_size`` or whatever arrived within ``max_delay`` seconds of the
+    first document. When ``max_pending`` documents are waiting, ``submit``
+    fails fast with a 503 instead of buffering without limit.
+
+    Failed batches are retried with backoff. On shutdown everything left is
+    written, or, if the database is unreachable, spilled to ``spill_path`` as
+    Extended JSON lines and inserted on the next start.
+
+    A document may be inserted more than once (a retried batch, a spill
+    replayed twice); its ``_id`` turns the repeats into duplicate key
+    errors, and ``on_flush`` only ever sees the first, real insert.
+    """
+
+    def __init__(self, collection: str, batch_size: int, max_delay: float, max_pending: int,
+                 spill_path: str, on_flush: Optional[OnFlush] = None):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.spill_path = spill_path
+        self.on_flush = on_flush
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Future] = None
+        self.accepted = 0
+        self.rejected = 0
+        self.written = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.failures = 0
+        self.spilled = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def submit(self, doc: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(doc)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many submissions waiting, try again shortly",
+                headers={"Retry-After": str(max(1, round(self.max_delay * 10)))},
+            )
+        self.accepted += 1
+
+    # ----- writing -----
+    async def _insert(self, db, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """insert_many; returns the documents this call inserted.
+
+        Documents a previous attempt already stored come back as duplicate
+        key errors and are left out, so ``on_flush`` sees every document once.
+        """
+        inserted = docs
+        try:
+            await db[self.collection].insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            for err in errors:
+                if err.get("code") == DUPLICATE_KEY:
+                    self.duplicates += 1
+                else:
+                    logger.error("Dropping queued %s document: %s", self.collection, err.get("errmsg"))
+            failed = {err["index"] for err in errors}
+            inserted = [doc for i, doc in enumerate(docs) if i not in failed]
+        self.written += len(inserted)
+        self.batches += 1
+        if self.on_flush is not None and inserted:
+            await self.on_flush(db, inserted)
+        return inserted
+
+    async def _flush(self, db, batch: List[Dict[str, Any]]) -> None:
+        await self._insert(db, batch)
+        if self._batch is batch:
+            self._batch = []
+
+    async def _next_batch(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_delay
+        while len(self._batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _writer(self, db) -> None:
+        backoff = MIN_RETRY_SECONDS
+        while True:
+            if not self._batch:
+                await self._next_batch()
+            try:
+                # Shielded: once insert_many is sent, on_flush runs for its
+                # result even if the writer is cancelled; stop() waits for it
+                self._flushing = asyncio.ensure_future(self._flush(db, self._batch))
+                await asyncio.shield(self._flushing)
+                backoff = MIN_RETRY_SECONDS
+            except Exception as e:
+                # Keep the batch and retry; new submissions queue up behind it
+                self.failures += 1
+                if isinstance(e, PyMongoError):
+                    logger.warning("Write-behind insert of %d %s failed, retrying in %.1fs: %s",
+                                   len(self._batch), self.collection, backoff, e)
+                else:
+                    logger.exception("Write-behind flush of %d %s failed, retrying in %.1fs",
+                                     len(self._batch), self.collection, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_RETRY_SECONDS)
+
+    # ----- spill file -----
+    def _claim_spilled(self) -> List[str]:
+        """Rename spill files to names only this process uses.
+
+        Several workers may share ``spill_path``; a rename is atomic, so each
+        file is replayed by whichever worker claims it. Claims left behind
+        by a worker that died mid-replay are picked up again.
+        """
+        claimed = []
+        for n, path in enumerate([self.spill_path, *sorted(glob.glob(glob.escape(self.spill_path) + ".replay-*"))]):
+            claim = f"{self.spill_path}.replay-{os.getpid()}-{n}"
+            try:
+                os.rename(path, claim)
+            except FileNotFoundError:
+                continue
+            claimed.append(claim)
+        return claimed
+
+    def _spill(self, docs: List[Dict[str, Any]]) -> None:
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            # One write, so lines from workers spilling at once do not interleave
+            f.write("".join(json_util.dumps(doc) + "\n" for doc in docs))
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _replay(self, db) -> None:
+        claimed = self._claim_spilled()
+        if not claimed:
+            return
+        docs = []
+        for path in claimed:
+            with open(path, encoding="utf-8") as f:
+                docs.extend(json_util.loads(line) for line in f if line.strip())
+        try:
+            for start in range(0, len(docs), self.batch_size):
+                await self._insert(db, docs[start:start + self.batch_size])
+            logger.info("Inserted %d spilled %s documents", len(docs), self.collection)
+        except PyMongoError as e:
+            logger.error("Could not insert spilled %s documents, keeping them in %s: %s",
+                         self.collection, self.spill_path, e)
+            self._spill(docs)
+        for path in claimed:
+            os.remove(path)
+
+    # ----- lifecycle -----
+    async def start(self, db) -> None:
+        """Lifespan hook: insert anything spilled last shutdown, then start writing"""
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        await self._replay(db)
+        self._task = asyncio.create_task(self._writer(db))
+
+    async def stop(self, db) -> None:
+        """Lifespan hook: write or spill everything still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._flushing is not None:
+            # Lets an insert in flight finish its on_flush, and drops its batch
+            await asyncio.gather(self._flushing, return_exceptions=True)
+            self._flushing = None
+
+        remaining = self._batch
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        self._batch = []
+        if not remaining:
+            return
+        written = 0
+        try:
+            while written < len(remaining):
+                await self._insert(db, remaining[written:written + self.batch_size])
+                written += self.batch_size
+        except PyMongoError as e:
+            unwritten = remaining[written:]
+            logger.error("Spilling %d queued %s documents to %s: %s",
+                         len(unwritten), self.collection, self.spill_path, e)
+            self._spill(unwritten)
+            self.spilled += len(unwritten)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending": (self._queue.qsize() if self._queue is not None else 0) + len(self._batch),
+            "max_pending": self.max_pending,
+            "batch_size": self.batch_size,
+            "max_delay_ms": round(self.max_delay * 1000, 1),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "written": self.written,
+            "duplicates": self.duplicates,
+            "batches": self.batches,
+            "avg_batch": round(self.written / self.batches, 1) if self.batches else None,
+            "failures": self.failures,
+            "spilled": self.spilled,
+        }
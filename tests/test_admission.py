@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from backend import admission
+from backend.admission import AdmissionController, Group, Rejected, TokenBuckets
+
+
+def controller(capacity=1, max_wait=1.0, max_queue=10):
+    return AdmissionController(capacity, [
+        Group("read", capacity, max_queue, max_wait),
+        Group("write", capacity, max_queue, max_wait),
+    ])
+
+
+def test_waiting_reads_are_admitted_before_earlier_writes():
+    async def scenario():
+        ctl = controller()
+        order = []
+
+        async def request(group, name):
+            await ctl.acquire(group)
+            order.append(name)
+            await asyncio.sleep(0)
+            ctl.release(group, 0.0)
+
+        await ctl.acquire("write")  # hold the only slot
+        queued = [asyncio.create_task(request("write", "w1")),
+                  asyncio.create_task(request("write", "w2"))]
+        await asyncio.sleep(0)
+        queued.append(asyncio.create_task(request("read", "r1")))
+        await asyncio.sleep(0)
+        assert ctl.stats()["groups"]["write"]["waiting"] == 2
+        assert ctl.stats()["groups"]["read"]["waiting"] == 1
+
+        ctl.release("write", 0.0)
+        await asyncio.gather(*queued)
+        return order, ctl
+
+    order, ctl = asyncio.run(scenario())
+    assert order == ["r1", "w1", "w2"]
+    assert ctl.active == 0
+
+
+def test_request_is_rejected_once_its_wait_budget_runs_out():
+    async def scenario():
+        ctl = controller(max_wait=0.05)
+        await ctl.acquire("read")
+        with pytest.raises(Rejected) as excinfo:
+            await ctl.acquire("read")
+        return ctl, excinfo.value
+
+    ctl, rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert rejected.retry_after >= 1
+    group = ctl.stats()["groups"]["read"]
+    assert group["timed_out"] == 1
+    assert group["waiting"] == 0
+    assert group["active"] == 1
+
+
+def test_full_queue_rejects_immediately():
+    async def scenario():
+        ctl = controller(max_queue=1)
+        await ctl.acquire("read")
+        waiting = asyncio.create_task(ctl.acquire("read"))
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected):
+            await ctl.acquire("read")
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        return ctl
+
+    ctl = asyncio.run(scenario())
+    assert ctl.stats()["groups"]["read"]["rejected"] == 1
+
+
+def test_cancelled_waiter_leaves_the_queue_and_takes_no_slot():
+    async def scenario():
+        ctl = controller()
+        await ctl.acquire("read")
+        waiting = asyncio.create_task(ctl.acquire("read"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert ctl.stats()["groups"]["read"]["waiting"] == 0
+
+        ctl.release("read", 0.0)
+        # The slot is free again: the next request runs at once
+        await asyncio.wait_for(ctl.acquire("read"), 0.1)
+        ctl.release("read", 0.0)
+        return ctl
+
+    ctl = asyncio.run(scenario())
+    assert ctl.active == 0
+    assert ctl.stats()["groups"]["read"]["active"] == 0
+
+
+def test_waiter_cancelled_right_after_admission_gives_its_slot_back():
+    async def scenario():
+        ctl = controller()
+        await ctl.acquire("read")
+
+        async def request():
+            await ctl.acquire("read")
+            ctl.release("read", 0.0)
+
+        waiting = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        ctl.release("read", 0.0)  # hands the slot to the waiter...
+        waiting.cancel()          # ...which is cancelled before it resumes
+        await asyncio.gather(waiting, return_exceptions=True)
+        return ctl
+
+    ctl = asyncio.run(scenario())
+    assert ctl.active == 0
+    assert ctl.stats()["groups"]["read"]["active"] == 0
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_token_bucket_refills_at_its_rate(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission, "time", clock)
+    buckets = TokenBuckets(rate=1.0, burst=2)
+
+    assert buckets.take("client") == 0
+    assert buckets.take("client") == 0
+    assert buckets.take("client") == pytest.approx(1.0)
+    assert buckets.take("other") == 0  # buckets are per client
+
+    clock.now += 0.5
+    assert buckets.take("client") == pytest.approx(0.5)
+    clock.now += 0.5
+    assert buckets.take("client") == 0
+    assert buckets.limited == 2
+
+
+def test_token_bucket_forgets_least_recent_clients(monkeypatch):
+    monkeypatch.setattr(admission, "time", Clock())
+    buckets = TokenBuckets(rate=1.0, burst=1, max_clients=2)
+    for client in ("a", "b", "c"):
+        buckets.take(client)
+
+    assert buckets.stats()["clients"] == 2
+    assert buckets.take("a") == 0  # "a" was forgotten and starts full
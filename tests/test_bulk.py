@@ -0,0 +1,97 @@
+import asyncio
+
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from backend import stats
+from backend.bulk import bulk_insert, bulk_modify
+
+UNPUBLISH = {"published": False}
+
+
+async def seeded(n=4):
+    db = AsyncMongoMockClient()["bulk_test"]
+    docs = [{"_id": ObjectId(), "name": f"r{i}", "rating": 1 + i % 5, "comment": "c", "published": True}
+            for i in range(n)]
+    await db.reviews.insert_many(docs)
+    return db, [str(doc["_id"]) for doc in docs]
+
+
+def statuses(outcome):
+    return [result["status"] for result in outcome["results"]]
+
+
+def test_unordered_modify_reports_every_item():
+    async def scenario():
+        db, ids = await seeded()
+        await db.reviews.update_one({"_id": ObjectId(ids[3])}, {"$set": UNPUBLISH})
+        body = [ids[0], "not-an-id", str(ObjectId()), ids[0], ids[3], ids[1]]
+        outcome, changes = await bulk_modify(db.reviews, body, UNPUBLISH, ordered=False)
+        published = await db.reviews.count_documents({"published": True})
+        return outcome, changes, published
+
+    outcome, changes, published = asyncio.run(scenario())
+    assert statuses(outcome) == ["updated", "invalid_id", "not_found", "unchanged", "unchanged", "updated"]
+    assert outcome["summary"] == {"updated": 2, "invalid_id": 1, "not_found": 1, "unchanged": 2}
+    assert len(changes) == 2
+    assert published == 1
+
+
+def test_ordered_modify_stops_at_the_first_invalid_id():
+    async def scenario():
+        db, ids = await seeded()
+        outcome, changes = await bulk_modify(db.reviews, [ids[0], "bad", ids[1]], None, ordered=True)
+        return outcome, changes, await db.reviews.count_documents({})
+
+    outcome, changes, remaining = asyncio.run(scenario())
+    assert statuses(outcome) == ["deleted", "invalid_id", "skipped"]
+    assert [before["name"] for before, _after in changes] == ["r0"]
+    assert remaining == 3
+
+
+def test_insert_reports_duplicates_and_honours_ordered():
+    async def scenario(ordered):
+        db, ids = await seeded(1)
+        docs = [{"name": "new"}, {"_id": ObjectId(ids[0]), "name": "dup"}, {"name": "after"}]
+        outcome, changes = await bulk_insert(db.reviews, docs, ordered, lambda doc: doc["name"])
+        return outcome, changes, await db.reviews.count_documents({})
+
+    outcome, changes, stored = asyncio.run(scenario(ordered=False))
+    assert statuses(outcome) == ["created", "error", "created"]
+    assert [result.get("item") for result in outcome["results"]] == ["new", None, "after"]
+    assert len(changes) == 2 and stored == 3
+
+    outcome, changes, stored = asyncio.run(scenario(ordered=True))
+    assert statuses(outcome) == ["created", "error", "skipped"]
+    assert len(changes) == 1 and stored == 2
+
+
+def test_bulk_changes_keep_the_stats_in_step():
+    async def scenario():
+        db, ids = await seeded(6)
+        # A legacy review without the flag counts as published
+        legacy = {"_id": ObjectId(), "name": "old", "rating": 4.5, "comment": "c"}
+        await db.reviews.insert_one(legacy)
+        await stats.rebuild_stats(db)
+
+        for body, updates in (([ids[0], ids[1], str(legacy["_id"])], UNPUBLISH),
+                              ([ids[2], ids[3], ids[0]], None),
+                              ([ids[1]], {"published": True})):
+            _outcome, changes = await bulk_modify(db.reviews, body, updates, ordered=False)
+            await stats.apply_increments(db, stats.REVIEWS_ID, *(stats.review_change(b, a) for b, a in changes))
+
+        incremental = await db.stats.find_one({"_id": stats.REVIEWS_ID})
+        await stats.rebuild_stats(db)
+        return incremental, await db.stats.find_one({"_id": stats.REVIEWS_ID})
+
+    incremental, rebuilt = asyncio.run(scenario())
+
+    def nonzero(state):
+        return {
+            "count": state.get("count", 0),
+            "rating_sum": state.get("rating_sum", 0),
+            "histogram": {star: n for star, n in state.get("histogram", {}).items() if n},
+        }
+
+    for state in ("published", "unpublished"):
+        assert nonzero(incremental.get(state, {})) == nonzero(rebuilt.get(state, {})), state
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from starlette.requests import Request
+
+from backend.cache import (
+    CachedResponse, TTLCache, cache_response, cached_response, invalidate_item, list_tag, response_cache
+)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_their_ttl():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("fresh", 1)
+    cache.set("stale", 2, ttl=0)
+
+    assert cache.get("fresh") == 1
+    assert cache.get("stale") is None
+    assert cache.expirations == 1
+    assert len(cache) == 1
+
+
+def test_tag_invalidation_drops_every_tagged_entry():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("list", 1, tags=["portfolio:list"])
+    cache.set("item", 2, tags=["portfolio:42", "portfolio:list"])
+    cache.set("review", 3, tags=["reviews:list"])
+
+    cache.invalidate_tags("portfolio:list")
+
+    assert cache.get("list") is None
+    assert cache.get("item") is None
+    assert cache.get("review") == 3
+    assert cache.invalidations == 2
+
+
+def test_tag_prefix_invalidation():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("list", 1, tags=["portfolio:list"])
+    cache.set("item", 2, tags=["portfolio:42"])
+    cache.set("review", 3, tags=["reviews:list"])
+
+    cache.invalidate_tag_prefix("portfolio:")
+
+    assert cache.get("list") is None
+    assert cache.get("item") is None
+    assert cache.get("review") == 3
+
+
+def test_replacing_a_key_forgets_its_old_tags():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("key", 1, tags=["old"])
+    cache.set("key", 2, tags=["new"])
+
+    cache.invalidate_tags("old")
+    assert cache.get("key") == 2
+    cache.invalidate_tags("new")
+    assert cache.get("key") is None
+
+
+def request(path="/api/v1/portfolio/", **headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+MODIFIED = datetime(2024, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+
+def test_matching_etag_is_a_304():
+    entry = CachedResponse(body=b'{"a":1}', last_modified=MODIFIED)
+
+    assert entry.to_response(request(if_none_match=entry.etag)).status_code == 304
+    assert entry.to_response(request(if_none_match=f'"other", {entry.etag}')).status_code == 304
+    assert entry.to_response(request(if_none_match="*")).status_code == 304
+    changed = entry.to_response(request(if_none_match='"other"'))
+    assert changed.status_code == 200
+    assert changed.body == b'{"a":1}'
+    assert changed.headers["etag"] == entry.etag
+
+
+def test_weak_etag_from_a_proxy_still_matches():
+    entry = CachedResponse(body=b"[]")
+    assert entry.to_response(request(if_none_match=f"W/{entry.etag}")).status_code == 304
+
+
+def test_if_modified_since_is_a_304_up_to_the_second():
+    entry = CachedResponse(body=b"[]", last_modified=MODIFIED)
+    # HTTP dates have no fractions of a second
+    since = format_datetime(MODIFIED.replace(microsecond=0), usegmt=True)
+    earlier = format_datetime(MODIFIED - timedelta(seconds=1), usegmt=True)
+
+    assert entry.to_response(request(if_modified_since=since)).status_code == 304
+    assert entry.to_response(request(if_modified_since=earlier)).status_code == 200
+    assert entry.to_response(request(if_modified_since="garbage")).status_code == 200
+    # If-None-Match wins when both are sent
+    assert entry.to_response(request(if_none_match='"other"', if_modified_since=since)).status_code == 200
+
+
+def test_write_invalidates_the_listing_and_serves_a_new_body():
+    response_cache.clear()
+    key = "/api/v1/portfolio/?"
+    first = cache_response(request(), key, [{"title": "old"}], tags=[list_tag("portfolio")])
+    assert cached_response(request(if_none_match=first.headers["etag"]), key).status_code == 304
+
+    invalidate_item("portfolio", "some-id")
+    assert cached_response(request(), key) is None
+
+    second = cache_response(request(if_none_match=first.headers["etag"]), key, [{"title": "new"}],
+                            tags=[list_tag("portfolio")], collection="portfolio")
+    assert second.status_code == 200
+    assert second.body == b'[{"title":"new"}]'
+    assert second.headers["etag"] != first.headers["etag"]
+    # The write moved Last-Modified even though no document carries a newer stamp
+    assert "last-modified" in second.headers
+    response_cache.clear()
@@ -0,0 +1,98 @@
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+
+from backend.coherence import VERSIONS, InvalidationBus, admin_changed, invalidation_bus
+from backend.deps import admin_principal_cache, admin_tag
+
+
+def bus(worker_id, mode="poll"):
+    """A bus posing as its own worker, recording what it was told to drop"""
+    b = InvalidationBus(poll_seconds=0.01, mode=mode)
+    b.worker_id = worker_id
+    b.received = []
+    for collection in ("portfolio", "reviews", "admins"):
+        b.subscribe(collection, lambda updated_at, c=collection: b.received.append((c, updated_at)))
+    return b
+
+
+def test_workers_apply_each_others_versions_and_skip_their_own():
+    async def scenario():
+        db = AsyncMongoMockClient()["coherence_test"]
+        a, b = bus("a:1"), bus("b:2")
+
+        assert await a.publish(db, "portfolio") == 1
+        await a._sync(db)
+        await b._sync(db)
+        first = list(a.received), list(b.received)
+
+        # Interleaved: each worker sees the other's bump among its own
+        await a.publish(db, "portfolio")
+        await b.publish(db, "portfolio")
+        await a._sync(db)
+        await b._sync(db)
+        await a._sync(db)
+        return db, a, b, first
+
+    db, a, b, (a_first, b_first) = asyncio.run(scenario())
+    assert a_first == []
+    assert [c for c, _ in b_first] == ["portfolio"]
+    assert b_first[0][1] is not None  # handlers get the write's timestamp
+    assert [c for c, _ in a.received] == ["portfolio"]
+    assert [c for c, _ in b.received] == ["portfolio", "portfolio"]
+    assert a._seen == b._seen == {"portfolio": 3}
+    assert a._own == b._own == {"portfolio": set()}
+    assert (a.published, a.applied, b.published, b.applied) == (2, 1, 1, 2)
+
+
+def test_notified_writes_reach_a_polling_worker():
+    async def scenario():
+        db = AsyncMongoMockClient()["coherence_test"]
+        await db[VERSIONS].insert_one({"_id": "reviews", "version": 7})
+        a, b = bus("a:1"), bus("b:2")
+        await a.start(db)
+        await b.start(db)
+        try:
+            # Consecutive writes coalesce into one bump
+            for _ in range(3):
+                a.notify("reviews")
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                if b.received:
+                    break
+            await asyncio.sleep(0.05)
+            return a, b, a.stats(), await db[VERSIONS].find_one({"_id": "reviews"})
+        finally:
+            await a.stop(db)
+            await b.stop(db)
+
+    a, b, stats, version = asyncio.run(scenario())
+    assert version["version"] == 8 and version["by"] == "a:1"
+    assert a.received == []
+    assert [c for c, _ in b.received] == ["reviews"]  # not the versions from before start()
+    assert stats["transport"] == "poll"
+    assert stats["published"] == 1 and stats["pending"] == []
+    assert stats["versions"] == {"reviews": 8}
+
+
+def test_admin_changed_reaches_other_workers():
+    async def scenario():
+        db = AsyncMongoMockClient()["coherence_admin_test"]
+        other = bus("b:2")
+        admin_principal_cache.set("alice-token", {"username": "alice"}, tags=[admin_tag("alice")])
+        admin_principal_cache.set("bob-token", {"username": "bob"}, tags=[admin_tag("bob")])
+
+        await admin_changed(db, "alice")
+        local = admin_principal_cache.get("alice-token"), admin_principal_cache.get("bob-token")
+        await other._sync(db)
+        # The publishing worker does not clear its cache again
+        await invalidation_bus._sync(db)
+        return local, admin_principal_cache.get("bob-token"), other.received
+
+    try:
+        (alice, bob), bob_after_sync, received = asyncio.run(scenario())
+    finally:
+        admin_principal_cache.clear()
+    assert alice is None and bob == {"username": "bob"}
+    assert [c for c, _ in received] == ["admins"]
+    assert bob_after_sync == {"username": "bob"}
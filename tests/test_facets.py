@@ -0,0 +1,48 @@
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+
+from backend.facets import FacetCache, compute_facets
+
+ITEMS = [
+    {"title": "a", "tags": ["tiles", "paint"], "category": "kitchen", "is_active": True, "is_featured": True},
+    {"title": "b", "tags": ["tiles"], "category": "kitchen", "is_active": False},
+    {"title": "c", "tags": ["roof"], "category": "outside", "is_active": None, "is_featured": None},
+    {"title": "d", "tags": ["paint", "paint"], "category": "bathroom"},
+    {"title": "e", "tags": [], "category": "", "is_featured": True},
+]
+
+
+def drop_empty(counts):
+    """Bumping down to zero leaves empty buckets an aggregation never creates"""
+    return {key: bucket for key, bucket in counts.items() if any(bucket.values())}
+
+
+def test_rebuild_agrees_with_incremental_bumps():
+    async def scenario():
+        db = AsyncMongoMockClient()["facets_test"]
+        cache = FacetCache()
+        await cache.get(db)  # aggregated while the collection is empty
+
+        docs = [dict(item) for item in ITEMS]
+        for doc in docs:
+            await db.portfolio.insert_one(doc)
+            cache.apply(after=doc)
+        # Edits and a delete move the counts between flag buckets
+        before, after = docs[2], {**docs[2], "is_active": False, "tags": ["roof", "gutter"]}
+        await db.portfolio.replace_one({"_id": before["_id"]}, after)
+        cache.apply(before, after)
+        await db.portfolio.delete_one({"_id": docs[0]["_id"]})
+        cache.apply(before=docs[0])
+
+        bumped = await cache.facets(db, {"is_active": True})
+        everything = await cache.facets(db, {})
+        return cache.counts, await compute_facets(db), bumped, everything
+
+    incremental, rebuilt, active, everything = asyncio.run(scenario())
+
+    assert drop_empty(incremental) == drop_empty(rebuilt)
+    # "d" has no is_active at all and counts as active
+    assert active["categories"] == [{"value": "bathroom", "count": 1}]
+    assert {"value": "tiles", "count": 1} in everything["tags"]
+    assert {"value": "paint", "count": 1} in everything["tags"]
@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from mongomock_motor import AsyncMongoMockClient
+
+from backend.pagination import SORT_ORDER, decode_cursor, encode_cursor, next_cursor
+from backend.repository import MongoReadRepository
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def reviews():
+    docs = [{"_id": ObjectId(), "published": True, "created_at": START + timedelta(minutes=n // 3)}
+            for n in range(12)]
+    docs += [{"_id": ObjectId(), "published": True, "created_at": None} for _ in range(3)]
+    docs += [{"_id": ObjectId(), "published": True} for _ in range(2)]
+    docs.append({"_id": ObjectId(), "published": False, "created_at": START})
+    return docs
+
+
+async def walk(repo, q, limit):
+    seen, cursor = [], None
+    while True:
+        page = await repo.find_reviews(q, cursor, limit, 0)
+        seen.extend(doc["_id"] for doc in page)
+        cursor = next_cursor(page, limit)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 7, 100])
+def test_cursor_walk_returns_every_document_once_in_order(limit):
+    async def scenario():
+        db = AsyncMongoMockClient()["pagination_test"]
+        await db.reviews.insert_many(reviews())
+        repo = MongoReadRepository(db)
+        expected = [doc["_id"] async for doc in db.reviews.find({"published": True}).sort(SORT_ORDER)]
+        return expected, await walk(repo, {"published": True}, limit)
+
+    expected, walked = asyncio.run(scenario())
+    assert len(expected) == 17  # timestamp ties, null and missing created_at
+    assert walked == expected
+
+
+def test_cursor_round_trip():
+    doc = {"_id": ObjectId(), "created_at": START}
+    assert decode_cursor(encode_cursor(doc)) == (START, doc["_id"])
+    missing = {"_id": ObjectId()}
+    assert decode_cursor(encode_cursor(missing)) == (None, missing["_id"])
+
+
+def test_malformed_cursor_is_a_400():
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor("not-a-cursor")
+    assert excinfo.value.status_code == 400
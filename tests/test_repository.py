@@ -0,0 +1,239 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from backend.pagination import next_cursor
+from backend.repository import MongoReadRepository, ReadSnapshot, SQLiteReadRepository
+from backend.stats import rebuild_stats
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def portfolio_item(n, **fields):
+    return {
+        "_id": ObjectId(),
+        "title": f"item {n}",
+        "category": "kitchen" if n % 2 else "bathroom",
+        "tags": ["tiles"] if n % 3 else ["paint", "tiles"],
+        "is_featured": n % 4 == 0,
+        "is_active": True,
+        "created_at": START + timedelta(minutes=n),
+        **fields,
+    }
+
+
+def review(n, **fields):
+    return {
+        "_id": ObjectId(),
+        "name": f"reviewer {n}",
+        "rating": 1 + n % 5,
+        "comment": "fine",
+        "published": n % 3 != 0,
+        # Pairs share a timestamp, so _id has to break the tie
+        "created_at": START + timedelta(minutes=n // 2),
+        **fields,
+    }
+
+
+async def seed(db):
+    reviews = [review(n) for n in range(23)]
+    reviews.append(review(23, created_at=None))
+    reviews.append(review(24, published=None))
+    items = [portfolio_item(n, created_at=START + timedelta(minutes=n // 3)) for n in range(30)]
+    items[5]["is_active"] = False
+    items[6].pop("created_at")
+    # Legacy items from before is_active existed
+    items.append(portfolio_item(30, is_active=None))
+    legacy = portfolio_item(31)
+    legacy.pop("is_active")
+    items.append(legacy)
+    await db.reviews.insert_many(reviews)
+    await db.portfolio.insert_many(items)
+    return reviews, items
+
+
+async def walk(find, q, limit):
+    """Every page of a cursor walk"""
+    pages, cursor = [], None
+    while True:
+        page = await find(q, cursor, limit, 0)
+        pages.append(page)
+        cursor = next_cursor(page, limit)
+        if cursor is None:
+            return pages
+
+
+async def answers(repo, reviews, items):
+    """The same reads through ``repo``, as comparable data"""
+    result = {}
+    review_q = {"published": True}
+    result["reviews", "offset"] = [await repo.find_reviews(review_q, None, 7, offset) for offset in range(0, 28, 7)]
+    result["reviews", "cursor"] = await walk(repo.find_reviews, review_q, 7)
+    for name, q in {
+        "active": {"is_active": True},
+        "featured": {"is_active": True, "is_featured": True},
+        "category": {"is_active": True, "category": "kitchen"},
+        "tag": {"is_active": True, "tags": "paint"},
+        "tag and category": {"is_active": True, "tags": "paint", "category": "bathroom"},
+    }.items():
+        result[name, "offset"] = [await repo.find_portfolio(q, None, 8, offset) for offset in range(0, 40, 8)]
+        result[name, "cursor"] = await walk(repo.find_portfolio, q, 8)
+        result[name, "count"] = await repo.count_portfolio(q)
+    result["get"] = [await repo.get_review(doc["_id"]) for doc in reviews]
+    result["get"] += [await repo.get_portfolio_item(doc["_id"]) for doc in items]
+    return result
+
+
+def assert_same(expected, actual):
+    assert expected.keys() == actual.keys()
+    for key in expected:
+        assert actual[key] == expected[key], key
+
+
+def test_sqlite_answers_like_mongo(tmp_path):
+    async def scenario():
+        db = AsyncMongoMockClient()["repository_test"]
+        reviews, items = await seed(db)
+        snapshot = ReadSnapshot(str(tmp_path / "snapshot.db"))
+        await snapshot.open()
+        try:
+            await snapshot.sync(db)
+            # MongoDB answers the flag-only counts from the stats document
+            await rebuild_stats(db)
+            mongo = MongoReadRepository(db)
+            sqlite = SQLiteReadRepository(snapshot, mongo)
+            before = await answers(mongo, reviews, items), await answers(sqlite, reviews, items)
+
+            # The same after an incremental sync
+            now = datetime.now(timezone.utc)
+            await db.portfolio.update_one({"_id": items[0]["_id"]}, {"$set": {"is_active": False, "updated_at": now}})
+            await db.portfolio.update_one({"_id": items[5]["_id"]}, {"$set": {"is_active": True, "updated_at": now}})
+            await db.portfolio.update_one({"_id": items[7]["_id"]}, {"$set": {"tags": ["paint"], "updated_at": now}})
+            await db.portfolio.delete_one({"_id": items[8]["_id"]})
+            await db.reviews.update_one({"_id": reviews[0]["_id"]}, {"$set": {"published": True, "updated_at": now}})
+            await db.reviews.delete_one({"_id": reviews[1]["_id"]})
+            await snapshot.sync(db)
+            await rebuild_stats(db)
+            after = await answers(mongo, reviews, items), await answers(sqlite, reviews, items)
+            return before, after, snapshot.stats()
+        finally:
+            await snapshot.stop()
+
+    before, after, stats = asyncio.run(scenario())
+    assert_same(*before)
+    assert_same(*after)
+    assert stats["updates"] == 2
+
+    mongo, _sqlite = before
+    assert mongo["active", "count"] == 31  # legacy items count as active
+    assert sum(map(len, mongo["active", "cursor"])) == 31
+    assert sum(map(len, mongo["reviews", "cursor"])) == 17
+    # Items tie on created_at, so paging relies on the _id tie-break
+    stamps = [doc.get("created_at") for page in mongo["active", "cursor"] for doc in page]
+    assert len(set(stamps)) < len(stamps)
+    assert stamps[-1] is None
+
+
+def test_estimated_count_is_only_used_unfiltered():
+    async def scenario():
+        db = AsyncMongoMockClient()["repository_test"]
+        await db.portfolio.insert_many([portfolio_item(n, is_active=n % 2 == 0) for n in range(6)])
+        repo = MongoReadRepository(db)
+        return (
+            await repo.count_portfolio({}, estimated=True),
+            await repo.count_portfolio({"is_active": True}, estimated=True),
+        )
+
+    assert asyncio.run(scenario()) == (6, 3)
+
+
+async def held_ids(snapshot, collection):
+    return {row[0] for row in await snapshot.query(f"SELECT id FROM snapshot_{collection}")}
+
+
+async def active_ids(db):
+    return {str(doc["_id"]) async for doc in db.portfolio.find({"is_active": {"$ne": False}}, {"_id": 1})}
+
+
+def test_sync_applies_changes_incrementally(tmp_path):
+    async def scenario():
+        db = AsyncMongoMockClient()["repository_test"]
+        items = [portfolio_item(n) for n in range(10)]
+        await db.portfolio.insert_many(items)
+        snapshot = ReadSnapshot(str(tmp_path / "snapshot.db"))
+        await snapshot.open()
+        try:
+            await snapshot.sync(db)
+            assert await held_ids(snapshot, "portfolio") == await active_ids(db)
+
+            now = datetime.now(timezone.utc)
+            await db.portfolio.update_one({"_id": items[0]["_id"]}, {"$set": {"is_active": False, "updated_at": now}})
+            await db.portfolio.update_one({"_id": items[1]["_id"]}, {"$set": {"tags": ["roof"], "updated_at": now}})
+            await db.portfolio.delete_one({"_id": items[2]["_id"]})
+            await db.portfolio.insert_one(portfolio_item(10, created_at=now))
+            # Restored from a backup: matches, but stamped before the watermark
+            await db.portfolio.insert_one(portfolio_item(11, created_at=START - timedelta(days=1)))
+            await db.cache_versions.insert_one({"_id": "portfolio", "version": 1})
+
+            synced = await snapshot.sync(db)
+            tags = await snapshot.query(
+                "SELECT tag FROM snapshot_portfolio_tags WHERE item_id = ?", (str(items[1]["_id"]),)
+            )
+            return synced, snapshot.stats(), await held_ids(snapshot, "portfolio"), await active_ids(db), tags
+        finally:
+            await snapshot.stop()
+
+    synced, stats, held, active, tags = asyncio.run(scenario())
+    assert held == active
+    # Five changes, plus the newest item re-read within the overlap
+    assert synced == {"portfolio": 6}
+    assert stats["rebuilds"] == 2  # once per collection, on the first sync
+    assert stats["updates"] == 1
+    assert tags == [("roof",)]
+
+
+def test_sync_without_versions_skips_unchanged_collections(tmp_path):
+    async def scenario():
+        db = AsyncMongoMockClient()["repository_test"]
+        await db.portfolio.insert_many([portfolio_item(n) for n in range(3)])
+        snapshot = ReadSnapshot(str(tmp_path / "snapshot.db"))
+        await snapshot.open()
+        try:
+            first = await snapshot.sync(db)
+            unchanged = await snapshot.sync(db)
+            await db.portfolio.insert_one(portfolio_item(3, created_at=datetime.now(timezone.utc)))
+            changed = await snapshot.sync(db)
+            return first, unchanged, changed, await held_ids(snapshot, "portfolio"), await active_ids(db)
+        finally:
+            await snapshot.stop()
+
+    first, unchanged, changed, held, active = asyncio.run(scenario())
+    assert first == {"reviews": 0, "portfolio": 3}
+    assert unchanged == {}
+    assert changed == {"portfolio": 2}  # the new item and the overlap re-read
+    assert held == active
+
+
+def test_snapshot_survives_a_restart(tmp_path):
+    async def scenario():
+        db = AsyncMongoMockClient()["repository_test"]
+        await db.portfolio.insert_many([portfolio_item(n) for n in range(3)])
+        path = str(tmp_path / "snapshot.db")
+        first = ReadSnapshot(path)
+        await first.open()
+        await first.sync(db)
+        await first.stop()
+
+        second = ReadSnapshot(path)
+        await second.open()
+        try:
+            return await second.sync(db), second.stats()
+        finally:
+            await second.stop()
+
+    synced, stats = asyncio.run(scenario())
+    assert synced == {}
+    assert stats["ready"] == ["portfolio", "reviews"]
+    assert stats["watermarks"]["portfolio"].startswith("2024-01-01T00:02:00")
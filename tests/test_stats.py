@@ -0,0 +1,107 @@
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import AutoReconnect
+
+from backend import stats
+
+
+class FlakyStats:
+    """db.stats whose first $inc fails, delegating everything else"""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.failures = 1
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    async def update_one(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise AutoReconnect("connection reset")
+        return await self._collection.update_one(*args, **kwargs)
+
+
+class Database:
+    def __init__(self, db):
+        self._db = db
+        self.stats = FlakyStats(db.stats)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+def test_failed_increment_schedules_a_rebuild():
+    async def scenario():
+        db = Database(AsyncMongoMockClient()["stats_test"])
+        review = {"name": "a", "rating": 4.5, "comment": "c", "published": True}
+        await db.reviews.insert_one(review)
+
+        # Must not raise: the review itself was written
+        await stats.record_review_change(db, after=review)
+        await stats._rebuild_task
+
+        return await stats.review_stats(db)
+
+    before = dict(stats.stats_repair)
+    summary = asyncio.run(scenario())
+
+    assert summary["published"]["count"] == 1
+    assert summary["published"]["histogram"]["4"] == 1
+    assert stats.stats_repair["failed_increments"] == before["failed_increments"] + 1
+    assert stats.stats_repair["rebuilds"] == before["rebuilds"] + 1
+    assert stats.stats_repair["pending"] == 0
+
+
+REVIEWS = [
+    {"name": "a", "rating": 5, "comment": "c", "published": True},
+    {"name": "b", "rating": 3.5, "comment": "c", "published": False},
+    {"name": "c", "rating": 4, "comment": "c", "published": None},
+    {"name": "d", "rating": 2, "comment": "c"},
+]
+ITEMS = [
+    {"title": "a", "is_active": True, "is_featured": True},
+    {"title": "b", "is_active": False, "is_featured": False},
+    {"title": "c", "is_active": None, "is_featured": None},
+    {"title": "d"},
+    {"title": "e", "is_featured": True},
+]
+
+
+def test_rebuild_agrees_with_increments_and_counts():
+    async def scenario():
+        db = AsyncMongoMockClient()["stats_test"]
+        for review in REVIEWS:
+            review = dict(review)
+            await db.reviews.insert_one(review)
+            await stats.record_review_change(db, after=review)
+        for item in ITEMS:
+            item = dict(item)
+            await db.portfolio.insert_one(item)
+            await stats.record_portfolio_change(db, after=item)
+
+        incremental = await db.stats.find({}).sort("_id", 1).to_list(length=None)
+        await stats.rebuild_stats(db)
+        rebuilt = await db.stats.find({}).sort("_id", 1).to_list(length=None)
+
+        totals = {}
+        for q in ({}, {"is_active": True}, {"is_active": False}, {"is_featured": False},
+                  {"is_active": True, "is_featured": False}):
+            totals[str(q)] = (
+                await stats.portfolio_total(db, q),
+                await db.portfolio.count_documents(stats.flag_query(q)),
+                len(await db.portfolio.find(stats.flag_query(q)).to_list(length=None)),
+            )
+        return incremental, rebuilt, totals, await stats.review_stats(db)
+
+    incremental, rebuilt, totals, summary = asyncio.run(scenario())
+
+    assert incremental == rebuilt
+    for q, (total, counted, listed) in totals.items():
+        assert total == counted == listed, q
+    assert totals[str({"is_active": True})][0] == 4  # null and missing count as active
+    assert summary["published"]["count"] == 3
@@ -0,0 +1,29 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.deps import get_current_admin
+from backend.routers import system
+
+PATHS = [route.path for route in system.router.routes]
+
+
+def client(admin=None):
+    app = FastAPI()
+    app.include_router(system.router, prefix="/api/v1")
+    if admin is not None:
+        app.dependency_overrides[get_current_admin] = lambda: admin
+    return TestClient(app)
+
+
+def test_system_stats_need_an_admin():
+    anonymous = client()
+    assert len(PATHS) == 8
+    for path in PATHS:
+        assert anonymous.get(f"/api/v1{path}").status_code == 401, path
+        assert anonymous.get(f"/api/v1{path}", headers={"Authorization": "Bearer junk"}).status_code == 401, path
+
+
+def test_admins_still_see_system_stats():
+    admin = client({"username": "admin"})
+    for path in PATHS:
+        assert admin.get(f"/api/v1{path}").status_code == 200, path
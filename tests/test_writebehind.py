@@ -0,0 +1,179 @@
+import asyncio
+import os
+
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import AutoReconnect
+
+from backend import writebehind
+from backend.writebehind import WriteBehindQueue
+
+
+class Collection:
+    """A collection whose next ``failures`` insert_many calls raise ``error``"""
+
+    def __init__(self, collection, failures=0, error=AutoReconnect("connection reset")):
+        self._collection = collection
+        self.failures = failures
+        self.error = error
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    async def insert_many(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        return await self._collection.insert_many(*args, **kwargs)
+
+
+class Database:
+    def __init__(self, db, **failing):
+        self._db = db
+        self.reviews = Collection(db.reviews, **failing)
+
+    def __getitem__(self, name):
+        return getattr(self, name) if name == "reviews" else self._db[name]
+
+
+class Flushes:
+    """on_flush callback recording every document it is told about"""
+
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, db, docs):
+        self.batches.append([doc["_id"] for doc in docs])
+
+    @property
+    def ids(self):
+        return [item for batch in self.batches for item in batch]
+
+
+def queue(tmp_path, on_flush, batch_size=3, max_delay=0.01):
+    return WriteBehindQueue("reviews", batch_size=batch_size, max_delay=max_delay, max_pending=100,
+                            spill_path=str(tmp_path / "spill.jsonl"), on_flush=on_flush)
+
+
+def docs(n):
+    return [{"_id": ObjectId(), "name": f"r{i}", "rating": 5} for i in range(n)]
+
+
+async def drain(q):
+    while q.stats()["pending"]:
+        await asyncio.sleep(0.005)
+
+
+def test_documents_are_written_in_batches(tmp_path):
+    async def scenario():
+        db = AsyncMongoMockClient()["writebehind_test"]
+        flushes = Flushes()
+        q = queue(tmp_path, flushes)
+        await q.start(db)
+        for doc in docs(7):
+            q.submit(doc)
+        await drain(q)
+        await q.stop(db)
+        return flushes, q.stats(), await db.reviews.count_documents({})
+
+    flushes, stats, stored = asyncio.run(scenario())
+    assert [len(batch) for batch in flushes.batches] == [3, 3, 1]
+    assert stats["written"] == stored == 7
+    assert stats["batches"] == 3
+
+
+def test_failed_batches_are_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(writebehind, "MIN_RETRY_SECONDS", 0.01)
+
+    async def scenario(error):
+        db = Database(AsyncMongoMockClient()["writebehind_test"], failures=2, error=error)
+        flushes = Flushes()
+        q = queue(tmp_path, flushes)
+        await q.start(db)
+        for doc in docs(2):
+            q.submit(doc)
+        await drain(q)
+        await q.stop(db)
+        return flushes, q.stats()
+
+    # Unexpected errors are retried too instead of ending the writer
+    for error in (AutoReconnect("connection reset"), ValueError("bug")):
+        flushes, stats = asyncio.run(scenario(error))
+        assert len(flushes.ids) == 2
+        assert stats["failures"] == 2
+        assert stats["written"] == 2
+
+
+def test_queue_is_spilled_and_replayed_exactly_once(tmp_path):
+    async def scenario():
+        client = AsyncMongoMockClient()
+        down = Database(client["writebehind_test"], failures=100)
+        flushes = Flushes()
+        q = queue(tmp_path, flushes, max_delay=60)
+        await q.start(down)
+        submitted = docs(4)
+        for doc in submitted:
+            q.submit(doc)
+        await asyncio.sleep(0.01)
+        await q.stop(down)
+        spilled = q.stats()["spilled"]
+
+        # Two workers sharing the spill path start at once
+        up = client["writebehind_test"]
+        workers = [queue(tmp_path, flushes), queue(tmp_path, flushes)]
+        await asyncio.gather(*(worker.start(up) for worker in workers))
+        for worker in workers:
+            await worker.stop(up)
+        return submitted, spilled, flushes, await up.reviews.count_documents({})
+
+    submitted, spilled, flushes, stored = asyncio.run(scenario())
+    assert spilled == 4
+    assert sorted(flushes.ids) == sorted(doc["_id"] for doc in submitted)
+    assert stored == 4
+    assert os.listdir(tmp_path) == []
+
+
+def test_replayed_duplicates_are_not_flushed_again(tmp_path):
+    async def scenario():
+        db = AsyncMongoMockClient()["writebehind_test"]
+        stored = docs(3)
+        await db.reviews.insert_many([dict(doc) for doc in stored[:2]])
+        flushes = Flushes()
+        q = queue(tmp_path, flushes)
+        q._spill(stored)
+        await q.start(db)
+        await q.stop(db)
+        return stored, flushes, q.stats()
+
+    stored, flushes, stats = asyncio.run(scenario())
+    assert flushes.ids == [stored[2]["_id"]]
+    assert stats["duplicates"] == 2
+
+
+def test_stop_during_on_flush_counts_the_batch_once(tmp_path):
+    async def scenario():
+        db = AsyncMongoMockClient()["writebehind_test"]
+        flushes = Flushes()
+        flushing, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_flush(db, docs):
+            flushing.set()
+            await release.wait()
+            await flushes(db, docs)
+
+        q = queue(tmp_path, slow_flush)
+        await q.start(db)
+        for doc in docs(2):
+            q.submit(doc)
+        await flushing.wait()
+        # Shut down after insert_many, while on_flush is still running
+        stopping = asyncio.ensure_future(q.stop(db))
+        await asyncio.sleep(0.01)
+        release.set()
+        await stopping
+        return flushes, q.stats()
+
+    flushes, stats = asyncio.run(scenario())
+    assert len(flushes.ids) == 2
+    assert stats["written"] == 2
+    assert stats["duplicates"] == 0